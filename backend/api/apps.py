@@ -4,3 +4,14 @@ from django.apps import AppConfig
 class ApiConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "api"
+
+    def ready(self):
+        from django.conf import settings
+
+        from backend.processes import is_web_process
+
+        # 서명 키는 웹 프로세스가 시작할 때 한번만 준비 (그 외 프로세스는 처음 쓸 때 준비)
+        if settings.SIGNATURE_ALGORITHM and is_web_process():
+            from api.signing import get_deposit_signer
+
+            get_deposit_signer()
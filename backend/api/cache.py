@@ -0,0 +1,116 @@
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+
+from api.models import User
+from backend.databases import REPLICA_DATABASE
+
+
+def investment_cache_key(user_id):
+    """투자화면 캐시 key"""
+    return f"screen:investment:{user_id}"
+
+
+def investment_detail_cache_key(investment_id):
+    """투자상세화면 캐시 key"""
+    return f"screen:investment-detail:{investment_id}"
+
+
+def user_holdings_cache_key(user_id):
+    """보유종목 화면 캐시 key"""
+    return f"screen:user-holdings:{user_id}"
+
+
+def deposit_confirmed_cache_key(deposit_id):
+    """입금 확인 완료 캐시 key"""
+    return f"deposit:confirmed:{deposit_id}"
+
+
+def screen_cache_timeout():
+    """
+    화면 API 캐시 유지 시간 (초)
+    - replica 가 있으면 화면 데이터를 replica 에서 만들므로 짧게 유지
+      (캐시 삭제 직후 지연된 replica 값으로 다시 만들어도 오래 남지 않음)
+    :return:
+    """
+    if REPLICA_DATABASE in settings.DATABASES:
+        return min(settings.SCREEN_CACHE_TIMEOUT, settings.SCREEN_REPLICA_CACHE_TIMEOUT)
+
+    return settings.SCREEN_CACHE_TIMEOUT
+
+
+def get_screen_data(key, build):
+    """
+    화면 API 응답 데이터 read-through 캐시
+    - 캐시에 없으면 build() 결과를 저장 후 반환
+    :param key: 캐시 key
+    :param build: 응답 데이터를 만드는 함수
+    :return:
+    """
+    return cache.get_or_set(key, build, screen_cache_timeout())
+
+
+async def aget_screen_data(key, build):
+    """
+    get_screen_data 의 async 버전
+    - 캐시 조회 / 저장은 스레드풀에서 실행 (캐시 서버 응답을 기다리는 동안 이벤트 루프를 막지 않음)
+    :param key: 캐시 key
+    :param build: 응답 데이터를 만드는 async 함수
+    :return:
+    """
+    data = await sync_to_async(cache.get, thread_sensitive=False)(key)
+    if data is None:
+        data = await build()
+        await sync_to_async(cache.set, thread_sensitive=False)(
+            key, data, screen_cache_timeout()
+        )
+
+    return data
+
+
+def invalidate_account_screens(account_ids=None):
+    """
+    계좌에 연결된 유저/투자의 화면 캐시 삭제
+    :param account_ids: 계좌 id 목록, None 이면 전체 계좌
+    :return: 삭제한 key 수
+    """
+    users = User.objects.all()
+    if account_ids is not None:
+        users = users.filter(account__in=account_ids)
+
+    keys = []
+    for user_id, investment_id in users.values_list("id", "investment__id"):
+        keys.append(investment_cache_key(user_id))
+        keys.append(user_holdings_cache_key(user_id))
+        if investment_id is not None:
+            keys.append(investment_detail_cache_key(investment_id))
+
+    if keys:
+        cache.delete_many(keys)
+
+    return len(keys)
+
+
+def mark_deposits_confirmed(deposit_ids):
+    """
+    확인이 끝난 입금거래 기록 - 같은 입금거래를 다시 확인하면 서명 검증 / DB 조회 없이 응답
+    :param deposit_ids: 입금거래 id 목록
+    :return:
+    """
+    cache.set_many(
+        {deposit_confirmed_cache_key(deposit_id): True for deposit_id in deposit_ids},
+        settings.DEPOSIT_CONFIRMED_CACHE_TIMEOUT,
+    )
+
+
+def get_confirmed_deposit_ids(deposit_ids):
+    """
+    확인이 끝난 것으로 기록된 입금거래 id
+    :param deposit_ids: 입금거래 id 목록
+    :return: set
+    """
+    keys = {
+        deposit_confirmed_cache_key(deposit_id): deposit_id
+        for deposit_id in deposit_ids
+    }
+    return {keys[key] for key in cache.get_many(keys)}
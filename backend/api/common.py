@@ -1,3 +1,5 @@
+from django.db import connections, router
+
 from api.models import Investment
 
 
@@ -21,3 +23,21 @@ def calculate_proceeds_rate(instance: Investment):
         / (instance.principal * 100),
         4,
     )
+
+
+def upsert_options(model, unique_fields, update_fields):
+    """
+    bulk_create upsert 옵션
+    - MySQL 은 충돌 컬럼을 지정할 수 없어 (ON DUPLICATE KEY UPDATE) unique_fields 를 빼고 전달
+      (모델의 unique 제약조건으로 충돌 판단)
+    :param model: 저장할 모델
+    :param unique_fields: 충돌을 판단할 unique 컬럼
+    :param update_fields: 충돌 시 갱신할 컬럼
+    :return: bulk_create kwargs
+    """
+    options = {"update_conflicts": True, "update_fields": update_fields}
+    connection = connections[router.db_for_write(model)]
+    if connection.features.supports_update_conflicts_with_target:
+        options["unique_fields"] = unique_fields
+
+    return options
@@ -0,0 +1,298 @@
+import json
+import logging
+import datetime
+import math
+import queue
+import threading
+import time
+
+from django.conf import settings
+from django.db import close_old_connections, transaction
+from django.db.models import Q
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+from api.deposits import confirm_deposit_batched, verify_deposit_signature
+from api.models import DepositLog, DepositQueueItem
+
+logger = logging.getLogger(__name__)
+
+
+class LocalDepositQueue:
+    """
+    프로세스 내부 입금 확인 대기열 (테스트 / 로컬 개발용)
+    - 프로세스가 종료되면 대기중인 항목은 사라짐
+    """
+
+    def __init__(self):
+        self._queue = queue.Queue()
+
+    def put(self, deposit_id, signature):
+        self._queue.put((deposit_id, signature))
+
+    def get(self, timeout):
+        """
+        대기열에서 항목 하나 꺼냄
+        :param timeout: 최대 대기 시간 (초)
+        :return: (입금거래 id, 서명) or None
+        """
+        try:
+            return self._queue.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+    def ack(self, item):
+        """처리가 끝난 항목 - 이미 꺼냈으므로 할 일 없음"""
+
+    def retry(self, item):
+        """처리에 실패한 항목을 다시 넣음"""
+        self._queue.put(item)
+
+
+class DatabaseDepositQueue:
+    """
+    DB 테이블 (deposit_queue) 입금 확인 대기열
+    - 여러 프로세스의 worker 가 같은 대기열을 처리
+    - 항목은 select_for_update(skip_locked) 로 잠근 후 claimed_at 을 기록해서 한 worker 만 가져감
+    - 처리가 끝나면 (ack) 삭제, 실패하면 (retry) 다시 대기
+      worker 가 처리 중에 죽으면 visibility_timeout 후 다른 worker 가 다시 꺼냄 (at-least-once)
+    """
+
+    def __init__(self, poll_interval=0.5, visibility_timeout=None):
+        self.poll_interval = poll_interval
+        self.visibility_timeout = (
+            settings.DEPOSIT_QUEUE_VISIBILITY_TIMEOUT
+            if visibility_timeout is None
+            else visibility_timeout
+        )
+
+    def put(self, deposit_id, signature):
+        DepositQueueItem.objects.create(deposit_log_id=deposit_id, signature=signature)
+
+    def _pop(self):
+        now = timezone.now()
+        expired = now - datetime.timedelta(seconds=self.visibility_timeout)
+        with transaction.atomic():
+            item = (
+                DepositQueueItem.objects.select_for_update(skip_locked=True)
+                .filter(Q(claimed_at__isnull=True) | Q(claimed_at__lte=expired))
+                .order_by("id")
+                .first()
+            )
+            if item is None:
+                return None
+
+            item.claimed_at = now
+            item.save(update_fields=["claimed_at"])
+
+        return item.deposit_log_id, item.signature
+
+    def _claimed(self, item):
+        deposit_id, signature = item
+        return DepositQueueItem.objects.filter(
+            deposit_log_id=deposit_id, signature=signature, claimed_at__isnull=False
+        )
+
+    def ack(self, item):
+        """
+        처리가 끝난 항목 삭제
+        :param item: get 으로 꺼낸 (입금거래 id, 서명)
+        :return:
+        """
+        self._claimed(item).delete()
+
+    def retry(self, item):
+        """
+        처리에 실패한 항목을 다시 꺼낼 수 있게 함
+        :param item: get 으로 꺼낸 (입금거래 id, 서명)
+        :return:
+        """
+        self._claimed(item).update(claimed_at=None)
+
+    def get(self, timeout):
+        """
+        대기열에서 항목 하나 꺼냄 - 비어있으면 poll_interval 마다 다시 조회
+        :param timeout: 최대 대기 시간 (초)
+        :return: (입금거래 id, 서명) or None
+        """
+        deadline = time.monotonic() + timeout
+        while True:
+            item = self._pop()
+            if item is not None or time.monotonic() >= deadline:
+                return item
+
+            time.sleep(min(self.poll_interval, max(deadline - time.monotonic(), 0)))
+
+
+class RedisDepositQueue:
+    """
+    redis list 입금 확인 대기열 (REDIS_URL 의 캐시 서버 사용)
+    - LPUSH / BRPOPLPUSH 로 여러 프로세스의 worker 가 같은 대기열을 처리
+    - 꺼낸 항목은 처리가 끝날 때까지 processing list 에 보관
+      처리가 끝나면 (ack) 삭제, 실패하면 (retry) 대기열로 되돌림
+    """
+
+    key = "deposit_confirm_queue"
+    processing_key = "deposit_confirm_queue:processing"
+
+    def __init__(self):
+        from django_redis import get_redis_connection
+
+        self.redis = get_redis_connection("default")
+
+    @staticmethod
+    def _dumps(deposit_id, signature):
+        return json.dumps({"transfer_identifier": deposit_id, "signature": signature})
+
+    def put(self, deposit_id, signature):
+        self.redis.lpush(self.key, self._dumps(deposit_id, signature))
+
+    def get(self, timeout):
+        """
+        대기열에서 항목 하나 꺼냄 - processing list 로 옮김
+        :param timeout: 최대 대기 시간 (초, BRPOPLPUSH 는 1초 단위)
+        :return: (입금거래 id, 서명) or None
+        """
+        item = self.redis.brpoplpush(
+            self.key, self.processing_key, timeout=max(math.ceil(timeout), 1)
+        )
+        if item is None:
+            return None
+
+        data = json.loads(item)
+        return data["transfer_identifier"], data["signature"]
+
+    def ack(self, item):
+        """
+        처리가 끝난 항목을 processing list 에서 삭제
+        :param item: get 으로 꺼낸 (입금거래 id, 서명)
+        :return:
+        """
+        self.redis.lrem(self.processing_key, 1, self._dumps(*item))
+
+    def retry(self, item):
+        """
+        처리에 실패한 항목을 대기열로 되돌림 (대기열 끝에 넣어 다른 항목부터 처리)
+        :param item: get 으로 꺼낸 (입금거래 id, 서명)
+        :return:
+        """
+        payload = self._dumps(*item)
+        with self.redis.pipeline() as pipeline:
+            pipeline.lrem(self.processing_key, 1, payload)
+            pipeline.lpush(self.key, payload)
+            pipeline.execute()
+
+
+def process_queued_deposit(deposit_id, signature):
+    """
+    대기열에서 꺼낸 입금거래 확인
+    - 서명 검증 후 입금 반영 (DEPOSIT_CONFIRM_BATCH_WINDOW 설정 시 micro-batch)
+    - 결과는 DepositLog.status 로 조회
+    :param deposit_id: 입금거래 id
+    :param signature: 입금 확인 요청의 서명
+    :return: 이번에 반영했으면 True, 아니면 False
+    """
+    deposit_log = DepositLog.objects.filter(id=deposit_id).first()
+    if deposit_log is None or deposit_log.status:
+        return False
+
+    if not verify_deposit_signature(deposit_log, signature):
+        logger.warning("deposit signature mismatch.. (%s)", deposit_id)
+        return False
+
+    return confirm_deposit_batched(deposit_log)
+
+
+class DepositWorkerPool:
+    """
+    입금 확인 worker pool
+    - worker 스레드마다 대기열에서 항목을 꺼내 process_queued_deposit 실행
+    - 처리가 끝나면 대기열에서 삭제 (ack), 실패하면 로그를 남기고 대기열로 되돌림 (retry)
+      (입금 반영은 DepositLog.status 로 한번만 되므로 같은 항목을 다시 처리해도 안전)
+    """
+
+    def __init__(self, deposit_queue, workers, poll_timeout=1):
+        self.deposit_queue = deposit_queue
+        self.poll_timeout = poll_timeout
+        self._stopped = threading.Event()
+        self._threads = [
+            threading.Thread(
+                target=self._run, name=f"deposit-worker-{idx}", daemon=True
+            )
+            for idx in range(workers)
+        ]
+
+    def start(self):
+        for thread in self._threads:
+            thread.start()
+
+    def stop(self):
+        self._stopped.set()
+        for thread in self._threads:
+            thread.join()
+
+    def _run(self):
+        while not self._stopped.is_set():
+            close_old_connections()
+            try:
+                item = self.deposit_queue.get(self.poll_timeout)
+            except Exception:
+                logger.exception("deposit queue get failed..")
+                time.sleep(self.poll_timeout)
+                continue
+
+            if item is None:
+                continue
+
+            try:
+                process_queued_deposit(*item)
+            except Exception:
+                logger.exception("deposit confirm failed.. (%s)", item[0])
+                release = self.deposit_queue.retry
+            else:
+                release = self.deposit_queue.ack
+
+            try:
+                release(item)
+            except Exception:
+                logger.exception("deposit queue release failed.. (%s)", item[0])
+
+
+_deposit_queue = None
+_worker_pool = None
+_lock = threading.Lock()
+
+
+def get_deposit_queue():
+    """
+    DEPOSIT_QUEUE_BACKEND 로 지정한 대기열 (프로세스당 하나)
+    :return:
+    """
+    global _deposit_queue
+
+    with _lock:
+        if _deposit_queue is None:
+            _deposit_queue = import_string(settings.DEPOSIT_QUEUE_BACKEND)()
+
+    return _deposit_queue
+
+
+def start_deposit_workers():
+    """
+    DEPOSIT_CONFIRM_ASYNC 가 설정되어 있으면 입금 확인 worker pool 시작 (프로세스당 하나)
+    :return: DepositWorkerPool or None
+    """
+    global _worker_pool
+
+    if not settings.DEPOSIT_CONFIRM_ASYNC:
+        return None
+
+    deposit_queue = get_deposit_queue()
+    with _lock:
+        if _worker_pool is None:
+            _worker_pool = DepositWorkerPool(
+                deposit_queue, settings.DEPOSIT_QUEUE_WORKERS
+            )
+            _worker_pool.start()
+
+    return _worker_pool
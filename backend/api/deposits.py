@@ -0,0 +1,310 @@
+import logging
+import queue
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import Future
+from decimal import Decimal
+
+from django.conf import settings
+from django.db import close_old_connections, transaction
+from django.db.models import F
+
+from api.cache import invalidate_account_screens, mark_deposits_confirmed
+from api.models import Account, DepositLog
+from api.signing import get_deposit_signer
+from api.summary import refresh_portfolio_summaries
+
+logger = logging.getLogger(__name__)
+
+
+def _run_logged(step, func, *args):
+    """
+    커밋 후 처리 한 단계 실행 - 실패하면 로그만 남기고 None 반환
+    :param step: 로그용 단계명
+    :param func:
+    :param args:
+    :return: func 결과
+    """
+    try:
+        return func(*args)
+    except Exception:
+        logger.exception("deposit %s failed.. (%s)", step, args)
+        return None
+
+
+def _after_confirm(account_numbers, deposit_ids):
+    """
+    입금 확인 커밋 후 확인 완료 기록 / 포트폴리오 요약 갱신 / 화면 캐시 삭제
+    - 입금은 이미 커밋됐으므로 실패해도 예외를 올리지 않고 로그만 남김
+    - 단계마다 따로 실행해서 요약 갱신이 실패해도 화면 캐시는 항상 삭제
+      (요약은 다음 갱신 때 맞춰짐)
+    :param account_numbers: 잔액이 바뀐 계좌번호 목록
+    :param deposit_ids: 확인이 끝난 입금거래 id 목록
+    :return:
+    """
+    _run_logged("mark confirmed", mark_deposits_confirmed, deposit_ids)
+    if not account_numbers:
+        return
+
+    account_ids = _run_logged(
+        "account lookup",
+        lambda: list(
+            Account.objects.filter(account_number__in=account_numbers).values_list(
+                "id", flat=True
+            )
+        ),
+    )
+    if account_ids is None:
+        return
+
+    _run_logged("summary refresh", refresh_portfolio_summaries, account_ids)
+    _run_logged("screen invalidation", invalidate_account_screens, account_ids)
+
+
+def confirm_deposit(deposit_log):
+    """
+    입금 확인 - 입금거래 상태 변경 후 계좌 잔액 증가
+    - confirm_deposits 와 같은 순서 (계좌 → 입금거래) 로 락을 잡아 교착상태 방지
+    - 상태는 status=False 조건부 UPDATE 로 바꿔서 중복 확인 시 두번 입금되지 않음
+    - 잔액은 F() 로 DB 에서 바로 더함
+    :param deposit_log: 서명 검증이 끝난 DepositLog
+    :return: 이번에 반영했으면 True, 이미 확인된 입금거래면 False
+    """
+    accounts = Account.objects.filter(account_number=deposit_log.account_number)
+
+    with transaction.atomic():
+        if not list(accounts.select_for_update().values_list("id", flat=True)):
+            raise Account.DoesNotExist("Account matching query does not exist.")
+
+        if not DepositLog.objects.filter(id=deposit_log.id, status=False).update(
+            status=True
+        ):
+            mark_deposits_confirmed([deposit_log.id])
+            return False
+
+        accounts.update(total_assets=F("total_assets") + deposit_log.transfer_amount)
+
+        transaction.on_commit(
+            lambda: _after_confirm([deposit_log.account_number], [deposit_log.id])
+        )
+
+    return True
+
+
+def register_deposits(deposit_logs):
+    """
+    여러 입금거래 등록 (bulk_create)
+    - bulk_create 가 pk 를 돌려주지 않는 DB (MySQL) 는 서명으로 다시 조회해서 pk 지정
+    - 서명이 같은 입금거래는 내용도 같으므로 새로 생긴 id 를 순서대로 지정
+    :param deposit_logs: 저장 전 DepositLog 목록
+    :return: pk 가 지정된 DepositLog 목록
+    """
+    with transaction.atomic():
+        DepositLog.objects.bulk_create(deposit_logs)
+
+        if all(deposit_log.pk for deposit_log in deposit_logs):
+            return deposit_logs
+
+        ids_by_signature = defaultdict(list)
+        for deposit_id, signature in (
+            DepositLog.objects.filter(
+                signature__in={deposit_log.signature for deposit_log in deposit_logs}
+            )
+            .order_by("id")
+            .values_list("id", "signature")
+        ):
+            ids_by_signature[signature].append(deposit_id)
+
+        created_counts = defaultdict(int)
+        for deposit_log in deposit_logs:
+            created_counts[deposit_log.signature] += 1
+
+        for signature, count in created_counts.items():
+            ids_by_signature[signature] = ids_by_signature[signature][-count:]
+
+        for deposit_log in deposit_logs:
+            deposit_log.pk = ids_by_signature[deposit_log.signature].pop(0)
+
+    return deposit_logs
+
+
+def verify_deposit_signature(deposit_log, signature):
+    """
+    입금거래 서명 검증 - 클레임에 담긴 정보가 등록된 입금거래와 일치하는지 확인
+    :param deposit_log: DepositLog
+    :param signature: 입금거래 등록시 발급한 JWT
+    :return: 일치하면 True (디코드 실패 시 jwt 예외)
+    """
+    encoded_data = get_deposit_signer().decode(signature)
+
+    # 클레임에 담긴 정보들
+    account_number = encoded_data.get("account_number", None)
+    user_name = encoded_data.get("user_name", None)
+    transfer_amount = encoded_data.get("transfer_amount", None)
+
+    return (
+        account_number == deposit_log.account_number
+        and user_name == deposit_log.user_name
+        and transfer_amount == deposit_log.transfer_amount
+    )
+
+
+def confirm_deposits(deposit_logs):
+    """
+    여러 입금거래를 한 트랜잭션으로 확인
+    - 관련 계좌를 계좌번호 순서로 한번에 select_for_update (교착상태 방지)
+    - 아직 확인되지 않은 입금거래만 상태 변경 (UPDATE 한번)
+    - 잔액은 계좌별로 합산해서 F() UPDATE 한번
+    :param deposit_logs: 서명 검증이 끝난 DepositLog 목록
+    :return: {입금거래 id: True (반영) / False (이미 확인됨) / 예외}
+    """
+    deposit_logs = {deposit_log.id: deposit_log for deposit_log in deposit_logs}
+    account_numbers = {
+        deposit_log.account_number for deposit_log in deposit_logs.values()
+    }
+
+    with transaction.atomic():
+        existing_account_numbers = set(
+            Account.objects.select_for_update()
+            .filter(account_number__in=account_numbers)
+            .order_by("account_number")
+            .values_list("account_number", flat=True)
+        )
+        results = {
+            deposit_id: Account.DoesNotExist("Account matching query does not exist.")
+            for deposit_id, deposit_log in deposit_logs.items()
+            if deposit_log.account_number not in existing_account_numbers
+        }
+
+        # 아직 확인되지 않은 입금거래만 처리 (다른 요청과 동시에 처리되지 않도록 락)
+        pending_ids = set(
+            DepositLog.objects.select_for_update()
+            .filter(
+                id__in=[
+                    deposit_id
+                    for deposit_id in deposit_logs
+                    if deposit_id not in results
+                ],
+                status=False,
+            )
+            .order_by("id")
+            .values_list("id", flat=True)
+        )
+        if pending_ids:
+            DepositLog.objects.filter(id__in=pending_ids).update(status=True)
+
+        amounts = defaultdict(Decimal)
+        for deposit_id, deposit_log in deposit_logs.items():
+            if deposit_id in results:
+                continue
+            results[deposit_id] = deposit_id in pending_ids
+            if deposit_id in pending_ids:
+                amounts[deposit_log.account_number] += deposit_log.transfer_amount
+
+        for account_number in sorted(amounts):
+            Account.objects.filter(account_number=account_number).update(
+                total_assets=F("total_assets") + amounts[account_number]
+            )
+
+        confirmed_ids = [
+            deposit_id
+            for deposit_id, result in results.items()
+            if not isinstance(result, Exception)
+        ]
+        if confirmed_ids:
+            transaction.on_commit(lambda: _after_confirm(list(amounts), confirmed_ids))
+
+    return results
+
+
+class DepositConfirmBatcher:
+    """
+    입금 확인 micro-batch 처리기
+    - 요청 스레드는 submit() 으로 넘기고 결과를 기다림
+    - 전용 스레드가 window 동안 모인 입금거래를 한 트랜잭션으로 처리
+    - 같은 계좌의 입금은 합산해서 UPDATE 한번, 계좌는 계좌번호 순서로 갱신
+    """
+
+    def __init__(self, window):
+        self.window = window
+        self._queue = queue.Queue()
+        self._thread = threading.Thread(
+            target=self._run, name="deposit-confirm-batcher", daemon=True
+        )
+        self._thread.start()
+
+    def submit(self, deposit_log):
+        """
+        입금 확인 요청
+        :param deposit_log: 서명 검증이 끝난 DepositLog
+        :return: Future - confirm_deposit 과 같은 결과 (True / False / 예외)
+        """
+        future = Future()
+        self._queue.put((deposit_log, future))
+        return future
+
+    def _run(self):
+        while True:
+            items = [self._queue.get()]
+            deadline = time.monotonic() + self.window
+            while True:
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                try:
+                    items.append(self._queue.get(timeout=timeout))
+                except queue.Empty:
+                    break
+
+            close_old_connections()
+            try:
+                results = confirm_deposits([deposit_log for deposit_log, _ in items])
+            except Exception as e:
+                for _, future in items:
+                    future.set_exception(e)
+                continue
+
+            for deposit_log, future in items:
+                result = results[deposit_log.id]
+                if isinstance(result, Exception):
+                    future.set_exception(result)
+                else:
+                    future.set_result(result)
+
+
+_batcher = None
+_batcher_lock = threading.Lock()
+
+
+def get_deposit_batcher():
+    """
+    DEPOSIT_CONFIRM_BATCH_WINDOW 가 설정되어 있으면 프로세스당 하나의 batcher 반환
+    :return: DepositConfirmBatcher or None
+    """
+    global _batcher
+
+    window = settings.DEPOSIT_CONFIRM_BATCH_WINDOW
+    if not window:
+        return None
+
+    with _batcher_lock:
+        if _batcher is None:
+            _batcher = DepositConfirmBatcher(window)
+
+    return _batcher
+
+
+def confirm_deposit_batched(deposit_log):
+    """
+    입금 확인 - micro-batch 모드면 batcher 로, 아니면 바로 처리
+    :param deposit_log: 서명 검증이 끝난 DepositLog
+    :return: 이번에 반영했으면 True, 이미 확인된 입금거래면 False
+    """
+    batcher = get_deposit_batcher()
+    if batcher is None:
+        return confirm_deposit(deposit_log)
+
+    return batcher.submit(deposit_log).result(
+        timeout=settings.DEPOSIT_CONFIRM_BATCH_TIMEOUT
+    )
@@ -0,0 +1,206 @@
+# Generated by Django 4.1.1 on 2026-10-18 17:18
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = []
+
+    operations = [
+        migrations.CreateModel(
+            name="Account",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "account_number",
+                    models.CharField(max_length=30, unique=True, verbose_name="계좌번호"),
+                ),
+                ("account_name", models.CharField(max_length=45, verbose_name="계좌명")),
+                (
+                    "total_assets",
+                    models.DecimalField(
+                        blank=True,
+                        decimal_places=2,
+                        default=0,
+                        max_digits=17,
+                        null=True,
+                        verbose_name="계좌 총 자산",
+                    ),
+                ),
+            ],
+            options={
+                "db_table": "accounts",
+            },
+        ),
+        migrations.CreateModel(
+            name="DepositLog",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("user_name", models.CharField(max_length=45)),
+                (
+                    "account_number",
+                    models.CharField(max_length=30, verbose_name="계좌번호"),
+                ),
+                (
+                    "transfer_amount",
+                    models.DecimalField(decimal_places=2, max_digits=17),
+                ),
+                ("exp", models.DateTimeField()),
+                ("signature", models.CharField(max_length=300)),
+                ("status", models.BooleanField(default=False)),
+            ],
+            options={
+                "db_table": "deposit_logs",
+            },
+        ),
+        migrations.CreateModel(
+            name="Holding",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "name",
+                    models.CharField(max_length=45, unique=True, verbose_name="종목명"),
+                ),
+                (
+                    "isin",
+                    models.CharField(max_length=20, unique=True, verbose_name="ISIN"),
+                ),
+                ("asset_group", models.CharField(max_length=45, verbose_name="자산그룹")),
+            ],
+            options={
+                "db_table": "holdings",
+            },
+        ),
+        migrations.CreateModel(
+            name="User",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("user_name", models.CharField(max_length=45)),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                (
+                    "account",
+                    models.OneToOneField(
+                        default="0",
+                        on_delete=django.db.models.deletion.SET_DEFAULT,
+                        related_name="user",
+                        to="api.account",
+                    ),
+                ),
+            ],
+            options={
+                "db_table": "users",
+            },
+        ),
+        migrations.CreateModel(
+            name="UserHolding",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("quantity", models.IntegerField(default=1, verbose_name="보유 종목 수량")),
+                (
+                    "current_price",
+                    models.FloatField(blank=True, null=True, verbose_name="현재가"),
+                ),
+                (
+                    "holding",
+                    models.ForeignKey(
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        to="api.holding",
+                    ),
+                ),
+                (
+                    "user",
+                    models.ForeignKey(
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        related_name="user_holdings",
+                        to="api.user",
+                    ),
+                ),
+            ],
+            options={
+                "db_table": "users_holdings",
+            },
+        ),
+        migrations.CreateModel(
+            name="Investment",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("brokerage", models.CharField(max_length=45, verbose_name="증권사")),
+                (
+                    "principal",
+                    models.DecimalField(
+                        blank=True,
+                        decimal_places=2,
+                        max_digits=17,
+                        null=True,
+                        verbose_name="투자 원금",
+                    ),
+                ),
+                (
+                    "user",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="investment",
+                        to="api.user",
+                    ),
+                ),
+            ],
+            options={
+                "db_table": "investments",
+            },
+        ),
+    ]
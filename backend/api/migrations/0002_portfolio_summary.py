@@ -0,0 +1,106 @@
+# Generated by Django 4.1.1 on 2026-10-18 17:55
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("api", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="PortfolioSummary",
+            fields=[
+                (
+                    "user",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="portfolio_summary",
+                        serialize=False,
+                        to="api.user",
+                    ),
+                ),
+                ("user_name", models.CharField(max_length=45)),
+                (
+                    "account_number",
+                    models.CharField(max_length=30, verbose_name="계좌번호"),
+                ),
+                ("account_name", models.CharField(max_length=45, verbose_name="계좌명")),
+                (
+                    "brokerage",
+                    models.CharField(
+                        blank=True, max_length=45, null=True, verbose_name="증권사"
+                    ),
+                ),
+                (
+                    "total_assets",
+                    models.DecimalField(
+                        decimal_places=2,
+                        default=0,
+                        max_digits=17,
+                        verbose_name="계좌 총 자산",
+                    ),
+                ),
+                (
+                    "principal",
+                    models.DecimalField(
+                        blank=True,
+                        decimal_places=2,
+                        max_digits=17,
+                        null=True,
+                        verbose_name="투자 원금",
+                    ),
+                ),
+                (
+                    "total_proceeds",
+                    models.DecimalField(
+                        blank=True,
+                        decimal_places=2,
+                        max_digits=17,
+                        null=True,
+                        verbose_name="총 수익금",
+                    ),
+                ),
+                (
+                    "proceeds_rate",
+                    models.DecimalField(
+                        blank=True,
+                        decimal_places=4,
+                        max_digits=17,
+                        null=True,
+                        verbose_name="수익률",
+                    ),
+                ),
+                (
+                    "asset_group_breakdown",
+                    models.JSONField(default=dict, verbose_name="자산그룹별 평가금액"),
+                ),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                (
+                    "account",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="portfolio_summary",
+                        to="api.account",
+                    ),
+                ),
+                (
+                    "investment",
+                    models.OneToOneField(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        related_name="portfolio_summary",
+                        to="api.investment",
+                    ),
+                ),
+            ],
+            options={
+                "db_table": "portfolio_summaries",
+            },
+        ),
+    ]
@@ -0,0 +1,41 @@
+# Generated by Django 4.1.1 on 2026-10-18 17:55
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("api", "0002_portfolio_summary"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="DepositQueueItem",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("signature", models.CharField(max_length=300)),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                (
+                    "deposit_log",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="queue_items",
+                        to="api.depositlog",
+                    ),
+                ),
+            ],
+            options={
+                "db_table": "deposit_queue",
+            },
+        ),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 4.1.1 on 2026-10-18 17:18
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("api", "0003_deposit_queue"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="depositlog",
+            index=models.Index(
+                fields=["account_number", "status"], name="deposit_logs_acct_status_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="holding",
+            index=models.Index(fields=["asset_group"], name="holdings_asset_group_idx"),
+        ),
+        migrations.AddConstraint(
+            model_name="userholding",
+            constraint=models.UniqueConstraint(
+                fields=("user", "holding"), name="users_holdings_user_holding_uq"
+            ),
+        ),
+    ]
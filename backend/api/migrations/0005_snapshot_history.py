@@ -0,0 +1,109 @@
+# Generated by Django 4.1.1 on 2026-10-18 17:24
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("api", "0004_hot_lookup_indexes"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="PositionSnapshot",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("snapshot_date", models.DateField(verbose_name="기준일")),
+                ("isin", models.CharField(max_length=20, verbose_name="ISIN")),
+                (
+                    "current_price",
+                    models.FloatField(blank=True, null=True, verbose_name="현재가"),
+                ),
+                ("quantity", models.IntegerField(verbose_name="보유 종목 수량")),
+                (
+                    "appraisal_amount",
+                    models.DecimalField(
+                        decimal_places=2, max_digits=17, verbose_name="평가금액"
+                    ),
+                ),
+                (
+                    "account",
+                    models.ForeignKey(
+                        db_constraint=False,
+                        on_delete=django.db.models.deletion.DO_NOTHING,
+                        related_name="position_snapshots",
+                        to="api.account",
+                    ),
+                ),
+            ],
+            options={
+                "db_table": "position_snapshots",
+            },
+        ),
+        migrations.CreateModel(
+            name="AccountValueSnapshot",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("snapshot_date", models.DateField(verbose_name="기준일")),
+                (
+                    "total_assets",
+                    models.DecimalField(
+                        decimal_places=2,
+                        default=0,
+                        max_digits=17,
+                        verbose_name="계좌 총 자산",
+                    ),
+                ),
+                (
+                    "account",
+                    models.ForeignKey(
+                        db_constraint=False,
+                        on_delete=django.db.models.deletion.DO_NOTHING,
+                        related_name="value_snapshots",
+                        to="api.account",
+                    ),
+                ),
+            ],
+            options={
+                "db_table": "account_value_snapshots",
+            },
+        ),
+        migrations.AddConstraint(
+            model_name="positionsnapshot",
+            constraint=models.UniqueConstraint(
+                fields=("snapshot_date", "account", "isin"),
+                name="position_snapshots_uq",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="accountvaluesnapshot",
+            index=models.Index(
+                fields=["account", "snapshot_date", "total_assets"],
+                name="account_values_covering_idx",
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="accountvaluesnapshot",
+            constraint=models.UniqueConstraint(
+                fields=("snapshot_date", "account"), name="account_value_snapshots_uq"
+            ),
+        ),
+    ]
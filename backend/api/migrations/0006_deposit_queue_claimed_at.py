@@ -0,0 +1,18 @@
+# Generated by Django 4.1.1 on 2026-10-18 18:14
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("api", "0005_snapshot_history"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="depositqueueitem",
+            name="claimed_at",
+            field=models.DateTimeField(null=True),
+        ),
+    ]
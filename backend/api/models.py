@@ -61,6 +61,10 @@ class Holding(models.Model):
 
     class Meta:
         db_table = "holdings"
+        indexes = [
+            # 자산그룹별 평가금액 집계
+            models.Index(fields=["asset_group"], name="holdings_asset_group_idx"),
+        ]
 
     def __str__(self):
         return self.name
@@ -78,6 +82,12 @@ class UserHolding(models.Model):
 
     class Meta:
         db_table = "users_holdings"
+        constraints = [
+            # 유저당 종목은 하나 - CSV 업로드 시 (user, holding) 으로 조회 / 갱신
+            models.UniqueConstraint(
+                fields=["user", "holding"], name="users_holdings_user_holding_uq"
+            ),
+        ]
 
 
 class DepositLog(models.Model):
@@ -94,3 +104,130 @@ class DepositLog(models.Model):
 
     class Meta:
         db_table = "deposit_logs"
+        indexes = [
+            # 계좌별 (미확인) 입금거래 조회
+            models.Index(
+                fields=["account_number", "status"],
+                name="deposit_logs_acct_status_idx",
+            ),
+        ]
+
+
+class DepositQueueItem(models.Model):
+    """입금 확인 대기열 모델 - DB 대기열 backend 사용 시"""
+
+    deposit_log = models.ForeignKey(
+        DepositLog, on_delete=models.CASCADE, related_name="queue_items"
+    )
+    signature = models.CharField(max_length=300)
+    created_at = models.DateTimeField(auto_now_add=True)
+    # worker 가 꺼낸 시각 - 처리가 끝나면 삭제, 끝나지 않으면 일정 시간 후 다시 꺼냄
+    claimed_at = models.DateTimeField(null=True)
+
+    class Meta:
+        db_table = "deposit_queue"
+
+
+class PortfolioSummary(models.Model):
+    """유저별 포트폴리오 요약 모델 - CSV 업로드 / 입금 확인 시 갱신"""
+
+    user = models.OneToOneField(
+        User,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="portfolio_summary",
+    )
+    account = models.OneToOneField(
+        Account, on_delete=models.CASCADE, related_name="portfolio_summary"
+    )
+    investment = models.OneToOneField(
+        Investment,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="portfolio_summary",
+    )
+    user_name = models.CharField(max_length=45)
+    account_number = models.CharField("계좌번호", max_length=30)
+    account_name = models.CharField("계좌명", max_length=45)
+    brokerage = models.CharField("증권사", max_length=45, null=True, blank=True)
+    total_assets = models.DecimalField(
+        "계좌 총 자산", max_digits=17, decimal_places=2, default=0
+    )
+    principal = models.DecimalField(
+        "투자 원금", max_digits=17, decimal_places=2, null=True, blank=True
+    )
+    total_proceeds = models.DecimalField(
+        "총 수익금", max_digits=17, decimal_places=2, null=True, blank=True
+    )
+    proceeds_rate = models.DecimalField(
+        "수익률", max_digits=17, decimal_places=4, null=True, blank=True
+    )
+    asset_group_breakdown = models.JSONField("자산그룹별 평가금액", default=dict)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = "portfolio_summaries"
+
+
+class PositionSnapshot(models.Model):
+    """
+    일자별 보유종목 스냅샷 모델 (추가만 함)
+    - CSV 업로드 마지막 단계에서 그날의 현재가 / 수량을 기록
+    - 계좌 / 종목이 삭제되어도 이력은 남도록 FK 제약은 두지 않음
+    """
+
+    snapshot_date = models.DateField("기준일")
+    account = models.ForeignKey(
+        Account,
+        on_delete=models.DO_NOTHING,
+        db_constraint=False,
+        related_name="position_snapshots",
+    )
+    isin = models.CharField("ISIN", max_length=20)
+    current_price = models.FloatField("현재가", null=True, blank=True)
+    quantity = models.IntegerField("보유 종목 수량")
+    appraisal_amount = models.DecimalField("평가금액", max_digits=17, decimal_places=2)
+
+    class Meta:
+        db_table = "position_snapshots"
+        constraints = [
+            # 같은 날 다시 실행하면 그날 스냅샷만 갱신
+            models.UniqueConstraint(
+                fields=["snapshot_date", "account", "isin"],
+                name="position_snapshots_uq",
+            ),
+        ]
+
+
+class AccountValueSnapshot(models.Model):
+    """
+    일자별 계좌 총 자산 스냅샷 모델 (추가만 함)
+    - 계좌 / 기간 조회는 (계좌, 기준일, 총 자산) 인덱스만 읽음 (covering index)
+    """
+
+    snapshot_date = models.DateField("기준일")
+    account = models.ForeignKey(
+        Account,
+        on_delete=models.DO_NOTHING,
+        db_constraint=False,
+        related_name="value_snapshots",
+    )
+    total_assets = models.DecimalField(
+        "계좌 총 자산", max_digits=17, decimal_places=2, default=0
+    )
+
+    class Meta:
+        db_table = "account_value_snapshots"
+        constraints = [
+            models.UniqueConstraint(
+                fields=["snapshot_date", "account"],
+                name="account_value_snapshots_uq",
+            ),
+        ]
+        indexes = [
+            models.Index(
+                fields=["account", "snapshot_date", "total_assets"],
+                name="account_values_covering_idx",
+            ),
+        ]
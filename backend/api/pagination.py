@@ -0,0 +1,10 @@
+from rest_framework.pagination import CursorPagination
+
+
+class PortfolioCursorPagination(CursorPagination):
+    """포트폴리오 일괄조회 cursor 페이지네이션 (유저 id 순)"""
+
+    ordering = "id"
+    page_size = 100
+    page_size_query_param = "page_size"
+    max_page_size = 1000
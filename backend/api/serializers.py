@@ -1,11 +1,16 @@
-import jwt
-from django.db import transaction
 from rest_framework import serializers
 from rest_framework.exceptions import ValidationError
 
 from api.common import calculate_total_proceeds, calculate_proceeds_rate
-from api.models import User, Investment, UserHolding, DepositLog, Account
-from backend.settings.base import SECRET_KEY, SIGNATURE_ALGORITHM
+from api.deposits import confirm_deposit_batched, verify_deposit_signature
+from api.models import (
+    User,
+    Investment,
+    UserHolding,
+    DepositLog,
+    PortfolioSummary,
+)
+from api.valuation import appraisal_amount
 
 
 class InvestmentViewSerializer(serializers.ModelSerializer):
@@ -56,6 +61,43 @@ class InvestmentDetailViewSerializer(serializers.ModelSerializer):
         return calculate_proceeds_rate(obj)
 
 
+class InvestmentSummarySerializer(serializers.ModelSerializer):
+    """투자화면 Serializer - 포트폴리오 요약 기준"""
+
+    account_total_assets = serializers.ReadOnlyField(source="total_assets")
+
+    class Meta:
+        model = PortfolioSummary
+        fields = [
+            "user_name",
+            "account_number",
+            "brokerage",
+            "account_total_assets",
+        ]
+
+
+class InvestmentDetailSummarySerializer(serializers.ModelSerializer):
+    """투자상세화면 Serializer - 포트폴리오 요약 기준"""
+
+    account_total_assets = serializers.ReadOnlyField(source="total_assets")
+    total_proceeds = serializers.ReadOnlyField()
+    proceeds_rate = serializers.ReadOnlyField()
+    user = serializers.ReadOnlyField(source="user_id")
+
+    class Meta:
+        model = PortfolioSummary
+        fields = [
+            "account_name",
+            "brokerage",
+            "account_number",
+            "account_total_assets",
+            "principal",
+            "total_proceeds",
+            "proceeds_rate",
+            "user",
+        ]
+
+
 class UserHoldingViewSerializer(serializers.ModelSerializer):
     """보유종목 화면 Serializer"""
 
@@ -68,9 +110,60 @@ class UserHoldingViewSerializer(serializers.ModelSerializer):
         model = UserHolding
         fields = ["holding_name", "asset_group", "isin", "appraisal_amount"]
 
-    #
     def get_appraisal_amount(self, obj):
-        return obj.quantity * obj.current_price
+        # 고정소수점으로 계산 (float 오차 없음)
+        return appraisal_amount(obj.current_price, obj.quantity)
+
+
+class PortfolioBatchSerializer(serializers.ModelSerializer):
+    """포트폴리오 일괄조회 Serializer (투자화면 + 수익 + 보유종목)"""
+
+    user_id = serializers.IntegerField(source="id", read_only=True)
+    account_number = serializers.ReadOnlyField(source="account.account_number")
+    account_name = serializers.ReadOnlyField(source="account.account_name")
+    account_total_assets = serializers.ReadOnlyField(source="account.total_assets")
+    brokerage = serializers.ReadOnlyField(source="investment.brokerage")
+    principal = serializers.ReadOnlyField(source="investment.principal")
+    total_proceeds = serializers.SerializerMethodField()
+    proceeds_rate = serializers.SerializerMethodField()
+    holdings = UserHoldingViewSerializer(
+        source="user_holdings", many=True, read_only=True
+    )
+
+    class Meta:
+        model = User
+        fields = [
+            "user_id",
+            "user_name",
+            "account_number",
+            "account_name",
+            "brokerage",
+            "account_total_assets",
+            "principal",
+            "total_proceeds",
+            "proceeds_rate",
+            "holdings",
+        ]
+
+    @staticmethod
+    def _get_investment(obj):
+        """투자원금이 등록된 투자 정보, 없으면 None"""
+        try:
+            investment = obj.investment
+        except Investment.DoesNotExist:
+            return None
+
+        return investment if investment.principal else None
+
+    def get_total_proceeds(self, obj):
+        """총 수익금"""
+        investment = self._get_investment(obj)
+        return calculate_total_proceeds(investment) if investment else None
+
+    def get_proceeds_rate(self, obj):
+        """수익률"""
+        investment = self._get_investment(obj)
+        return calculate_proceeds_rate(investment) if investment else None
 
 
 class DepositLogSerializer(serializers.ModelSerializer):
@@ -110,42 +203,40 @@ class AssetSerializer(serializers.ModelSerializer):
             "status": {"read_only": True},
         }
 
-    @transaction.atomic
     def update(self, instance, validated_data):
         signature = validated_data.pop("signature")
 
-        try:
-            # signature 디코드
-            encoded_data = jwt.decode(
-                signature, SECRET_KEY, algorithms=[SIGNATURE_ALGORITHM]
-            )
-
-            # 클레임에 담긴 정보들
-            account_number = encoded_data.get("account_number", None)
-            user_name = encoded_data.get("user_name", None)
-            transfer_amount = encoded_data.get("transfer_amount", None)
+        # 이미 확인된 입금거래는 서명 검증 / 트랜잭션 없이 응답
+        if instance.status:
+            return instance
 
+        try:
             # phase1 API에서 등록정보들이 클레임에담긴 정보와 일치하는지 확인
-            if (
-                account_number == instance.account_number
-                and user_name == instance.user_name
-                and transfer_amount == instance.transfer_amount
-            ):
-                instance.status = True
-                instance.save()
-
-                # 트랜잭션이 몰릴경우 동시성 문제를 해결하기 위해 select_for_update 사용
-                # nowait = True : 해당 row 락이 잡혀있으면 풀릴때까지 기다림
-                account = Account.objects.select_for_update(nowait=False).get(
-                    account_number=account_number
-                )
-
+            if verify_deposit_signature(instance, signature):
                 # 유효한 정보면 자산업데이트
-                account.total_assets += transfer_amount
-                account.save()
+                # - 잔액은 F() UPDATE 한번으로 반영, 이미 확인된 입금거래는 다시 반영하지 않음
+                # - DEPOSIT_CONFIRM_BATCH_WINDOW 설정 시 같은 계좌 입금을 모아서 UPDATE
+                confirm_deposit_batched(instance)
+                instance.status = True
 
                 return instance
 
         except Exception as e:
-            transaction.set_rollback(rollback=True)
             raise ValidationError(str(e))
+
+
+class DepositStatusSerializer(serializers.ModelSerializer):
+    """입금거래 확인 상태 Serializer"""
+
+    transfer_identifier = serializers.IntegerField(source="id")
+
+    class Meta:
+        model = DepositLog
+        fields = ["transfer_identifier", "status"]
+
+
+class DepositBulkItemSerializer(serializers.Serializer):
+    """입금거래 일괄 확인 항목 Serializer"""
+
+    transfer_identifier = serializers.IntegerField()
+    signature = serializers.CharField(max_length=300)
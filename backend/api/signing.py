@@ -0,0 +1,63 @@
+import threading
+
+from django.conf import settings
+
+
+class DepositSigner:
+    """
+    입금거래 서명 (JWT) 발급 / 검증
+    - 키는 생성 시 한번만 준비 (HMAC 은 bytes, RSA/EC 는 PEM 을 읽은 키 객체)
+    - 요청마다 PEM 을 다시 읽지 않아서 비대칭 알고리즘에서 특히 빠름
+    """
+
+    def __init__(self, key, algorithm):
+        # jwt 는 서명기를 처음 만들 때 import (URLConf 를 읽는 관리 명령은 사용하지 않음)
+        import jwt
+
+        self.jwt = jwt
+        self.algorithm = algorithm
+        algorithm_obj = jwt.get_algorithm_by_name(algorithm)
+        self.signing_key = algorithm_obj.prepare_key(key)
+
+        # 비대칭 알고리즘은 개인키에서 공개키를 꺼내 검증에 사용
+        public_key = getattr(self.signing_key, "public_key", None)
+        self.verifying_key = public_key() if callable(public_key) else self.signing_key
+
+    def sign(self, payload):
+        """
+        서명 발급
+        :param payload: 클레임 dict
+        :return: JWT
+        """
+        return self.jwt.encode(payload, self.signing_key, algorithm=self.algorithm)
+
+    def decode(self, signature):
+        """
+        서명 검증 후 클레임 반환 (만료 / 위변조 시 jwt 예외)
+        :param signature: JWT
+        :return: 클레임 dict
+        """
+        return self.jwt.decode(
+            signature, self.verifying_key, algorithms=[self.algorithm]
+        )
+
+
+_signer = None
+_signer_lock = threading.Lock()
+
+
+def get_deposit_signer():
+    """
+    SECRET_KEY / SIGNATURE_ALGORITHM 으로 만든 서명기 (프로세스당 하나)
+    :return: DepositSigner
+    """
+    global _signer
+
+    if _signer is None:
+        with _signer_lock:
+            if _signer is None:
+                _signer = DepositSigner(
+                    settings.SECRET_KEY, settings.SIGNATURE_ALGORITHM
+                )
+
+    return _signer
@@ -0,0 +1,101 @@
+from itertools import islice
+
+from django.utils import timezone
+
+from api.common import upsert_options
+from api.models import Account, AccountValueSnapshot, PositionSnapshot, UserHolding
+from api.valuation import appraisal_amount
+
+# 한번에 저장할 스냅샷 row 수
+SNAPSHOT_BATCH_SIZE = 5000
+
+
+def _batched(rows, batch_size):
+    """
+    iterable 을 batch_size 단위 리스트로 나눔
+    :param rows:
+    :param batch_size:
+    :return:
+    """
+    rows = iter(rows)
+    while batch := list(islice(rows, batch_size)):
+        yield batch
+
+
+def write_snapshots(
+    snapshot_date=None, batch_size=SNAPSHOT_BATCH_SIZE, account_filter=None
+):
+    """
+    일자별 보유종목 / 계좌 총 자산 스냅샷 저장
+    - 유저가 있는 전체 계좌를 batch_size 단위 bulk upsert
+    - 이전 날짜 스냅샷은 건드리지 않고, 같은 날 다시 실행하면 그날 값만 갱신
+    :param snapshot_date: 기준일, None 이면 오늘
+    :param batch_size:
+    :param account_filter: 계좌번호를 받아 False 를 반환하는 계좌는 건너뜀 (shard 업로드)
+    :return: {"snapshot_date": 기준일, "positions": 보유종목 수, "accounts": 계좌 수}
+    """
+    snapshot_date = snapshot_date or timezone.localdate()
+    result = {"snapshot_date": str(snapshot_date), "positions": 0, "accounts": 0}
+
+    positions = (
+        UserHolding.objects.filter(user__isnull=False, holding__isnull=False)
+        .order_by("id")
+        .values_list(
+            "user__account__account_number",
+            "user__account_id",
+            "holding__isin",
+            "current_price",
+            "quantity",
+        )
+        .iterator(chunk_size=batch_size)
+    )
+    if account_filter is not None:
+        positions = (row for row in positions if account_filter(row[0]))
+
+    for batch in _batched(positions, batch_size):
+        PositionSnapshot.objects.bulk_create(
+            [
+                PositionSnapshot(
+                    snapshot_date=snapshot_date,
+                    account_id=account_id,
+                    isin=isin,
+                    current_price=current_price,
+                    quantity=quantity,
+                    appraisal_amount=appraisal_amount(current_price, quantity),
+                )
+                for _, account_id, isin, current_price, quantity in batch
+            ],
+            **upsert_options(
+                PositionSnapshot,
+                ["snapshot_date", "account_id", "isin"],
+                ["current_price", "quantity", "appraisal_amount"],
+            ),
+        )
+        result["positions"] += len(batch)
+
+    accounts = (
+        Account.objects.filter(user__isnull=False)
+        .order_by("id")
+        .values_list("account_number", "id", "total_assets")
+        .iterator(chunk_size=batch_size)
+    )
+    if account_filter is not None:
+        accounts = (row for row in accounts if account_filter(row[0]))
+
+    for batch in _batched(accounts, batch_size):
+        AccountValueSnapshot.objects.bulk_create(
+            [
+                AccountValueSnapshot(
+                    snapshot_date=snapshot_date,
+                    account_id=account_id,
+                    total_assets=total_assets or 0,
+                )
+                for _, account_id, total_assets in batch
+            ],
+            **upsert_options(
+                AccountValueSnapshot, ["snapshot_date", "account_id"], ["total_assets"]
+            ),
+        )
+        result["accounts"] += len(batch)
+
+    return result
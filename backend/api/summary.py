@@ -0,0 +1,116 @@
+from django.utils import timezone
+
+from api.common import (
+    calculate_total_proceeds,
+    calculate_proceeds_rate,
+    upsert_options,
+)
+from api.models import PortfolioSummary, User, UserHolding
+from api.valuation import PositionColumns, from_minor_units
+
+# 한번에 갱신할 유저 수
+SUMMARY_BATCH_SIZE = 1000
+
+# bulk_create(update_conflicts=True) 의 필드명은 Django 4.1 에서 그대로 컬럼명으로 쓰이므로
+# FK 는 attname(_id) 으로 지정
+SUMMARY_UPDATE_FIELDS = [
+    "account_id",
+    "investment_id",
+    "user_name",
+    "account_number",
+    "account_name",
+    "brokerage",
+    "total_assets",
+    "principal",
+    "total_proceeds",
+    "proceeds_rate",
+    "asset_group_breakdown",
+    "updated_at",
+]
+
+
+def _asset_group_breakdown(user_ids):
+    """
+    유저별 자산그룹 평가금액 (현재가 * 수량) 합계 - valuation 모듈로 고정소수점 계산
+    :param user_ids:
+    :return: {유저 id: {자산그룹: 평가금액 문자열}}
+    """
+    rows = (
+        UserHolding.objects.filter(user__in=user_ids)
+        .order_by("user_id", "holding__asset_group")
+        .values_list("user_id", "holding__asset_group", "current_price", "quantity")
+    )
+    columns = PositionColumns.from_rows(
+        ((user_id, asset_group), price, quantity)
+        for user_id, asset_group, price, quantity in rows
+    )
+
+    breakdown = {}
+    for (user_id, asset_group), total in columns.totals().items():
+        breakdown.setdefault(user_id, {})[asset_group] = str(from_minor_units(total))
+
+    return breakdown
+
+
+def _build_summary(user, breakdown):
+    """
+    유저 한명의 PortfolioSummary 생성 (저장은 하지 않음)
+    :param user: account / investment 가 select_related 된 User
+    :param breakdown: 자산그룹별 평가금액
+    :return:
+    """
+    try:
+        investment = user.investment
+    except User.investment.RelatedObjectDoesNotExist:
+        investment = None
+
+    summary = PortfolioSummary(
+        user=user,
+        account=user.account,
+        investment=investment,
+        user_name=user.user_name,
+        account_number=user.account.account_number,
+        account_name=user.account.account_name,
+        total_assets=user.account.total_assets or 0,
+        asset_group_breakdown=breakdown,
+        updated_at=timezone.now(),
+    )
+
+    if investment is not None:
+        summary.brokerage = investment.brokerage
+        summary.principal = investment.principal
+
+        # 원금 / 총 자산이 없으면 수익금 / 수익률 계산 불가
+        if investment.principal and user.account.total_assets is not None:
+            summary.total_proceeds = calculate_total_proceeds(investment)
+            summary.proceeds_rate = calculate_proceeds_rate(investment)
+
+    return summary
+
+
+def refresh_portfolio_summaries(account_ids=None, batch_size=SUMMARY_BATCH_SIZE):
+    """
+    포트폴리오 요약 갱신
+    - batch_size 명씩 유저 조회 1번 + 자산그룹 집계 1번 + upsert 1번
+    :param account_ids: 갱신할 계좌 id 목록, None 이면 전체
+    :param batch_size:
+    :return: 갱신된 유저 수
+    """
+    users = User.objects.select_related("account", "investment").order_by("id")
+    if account_ids is None:
+        user_ids = list(users.values_list("id", flat=True))
+    else:
+        user_ids = list(
+            users.filter(account__in=set(account_ids)).values_list("id", flat=True)
+        )
+
+    for idx in range(0, len(user_ids), batch_size):
+        batch = list(users.filter(id__in=user_ids[idx : idx + batch_size]))
+        breakdown = _asset_group_breakdown([user.id for user in batch])
+
+        PortfolioSummary.objects.bulk_create(
+            [_build_summary(user, breakdown.get(user.id, {})) for user in batch],
+            **upsert_options(PortfolioSummary, ["user_id"], SUMMARY_UPDATE_FIELDS),
+        )
+
+    return len(user_ids)
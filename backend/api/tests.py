@@ -1,8 +1,57 @@
+import json
+import threading
+from datetime import date
+from decimal import Decimal
+from unittest import mock
+
+from asgiref.sync import async_to_sync
+from django.core.cache import cache
+from django.db import connection
+from django.test import SimpleTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
 from rest_framework.reverse import reverse
 from rest_framework import status
 from rest_framework.test import APITestCase, APIRequestFactory
 
-from api.models import Account, User, Investment, Holding, UserHolding
+from api.cache import get_screen_data, invalidate_account_screens
+from api.deposit_queue import (
+    DatabaseDepositQueue,
+    DepositWorkerPool,
+    LocalDepositQueue,
+    process_queued_deposit,
+)
+from api.deposits import DepositConfirmBatcher, confirm_deposit, confirm_deposits
+from api.models import (
+    Account,
+    User,
+    Investment,
+    Holding,
+    UserHolding,
+    PortfolioSummary,
+    DepositLog,
+    DepositQueueItem,
+    PositionSnapshot,
+    AccountValueSnapshot,
+)
+from api.snapshots import write_snapshots
+from api.summary import refresh_portfolio_summaries
+from api.valuation import PositionColumns, appraisal_amount, from_minor_units
+from api.views import (
+    AsyncInvestmentDetailView,
+    AsyncInvestmentView,
+    AsyncUserHoldingView,
+)
+from backend import databases
+from backend.databases import (
+    JOBS_DATABASE,
+    REPLICA_DATABASE,
+    DatabaseRouter,
+    database_settings,
+    use_database,
+)
+
+# 화면 API 당 허용 쿼리 수
+SCREEN_API_QUERY_BUDGET = 1
 
 
 class InvestmentAPITest(APITestCase):
@@ -58,6 +107,7 @@ class InvestmentAPITest(APITestCase):
         )
 
     def tearDown(self):
+        cache.clear()
         UserHolding.objects.all().delete()
         Holding.objects.all().delete()
         Investment.objects.all().delete()
@@ -76,3 +126,709 @@ class InvestmentAPITest(APITestCase):
 
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertEqual(response.json(), expected_data)
+
+    def test_get_investment_detail_data(self):
+        """투자상세화면 API Success Case Test"""
+        user = User.objects.get(user_name="홍길동")
+        response = self.client.get(
+            reverse("investment-detail", args=[user.investment.id])
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json()["account_name"], "계좌1")
+        self.assertEqual(response.json()["brokerage"], "국민")
+        self.assertEqual(response.json()["user"], user.id)
+
+    def test_get_user_holdings_data(self):
+        """보유종목 화면 API Success Case Test"""
+        user = User.objects.get(user_name="홍길동")
+        response = self.client.get(reverse("user-holdings", args=[user.id]))
+        expected_data = [
+            {
+                "holding_name": "삼성",
+                "asset_group": "한국주식",
+                "isin": "K11111",
+                "appraisal_amount": 10000.0,
+            },
+            {
+                "holding_name": "LG",
+                "asset_group": "한국주식",
+                "isin": "K11112",
+                "appraisal_amount": 40000.0,
+            },
+            {
+                "holding_name": "애플",
+                "asset_group": "미국주식",
+                "isin": "G11112",
+                "appraisal_amount": 9000.0,
+            },
+        ]
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json(), expected_data)
+
+    def create_holdings(self, user, count):
+        holdings = Holding.objects.bulk_create(
+            [
+                Holding(name=f"종목{idx}", isin=f"T{idx:05}", asset_group="한국주식")
+                for idx in range(count)
+            ]
+        )
+        UserHolding.objects.bulk_create(
+            [
+                UserHolding(holding=holding, user=user, quantity=1, current_price=100)
+                for holding in holdings
+            ]
+        )
+
+    def assert_screen_query_budget(self, user):
+        for url, budget in [
+            (reverse("investment", args=[user.id]), SCREEN_API_QUERY_BUDGET),
+            (
+                reverse("investment-detail", args=[user.investment.id]),
+                SCREEN_API_QUERY_BUDGET,
+            ),
+            (reverse("user-holdings", args=[user.id]), SCREEN_API_QUERY_BUDGET),
+        ]:
+            with self.subTest(url=url), self.assertNumQueries(budget):
+                response = self.client.get(url)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        return response
+
+    def test_screen_api_query_budget(self):
+        """화면 API 쿼리 수 - 보유종목 수와 관계없이 일정"""
+        user = User.objects.get(user_name="홍길동2")
+        self.create_holdings(user, 200)
+
+        response = self.assert_screen_query_budget(user)
+        self.assertEqual(len(response.json()), 200)
+
+    def test_screen_api_query_budget_with_summary(self):
+        """포트폴리오 요약이 있을 때도 화면 API 쿼리 수는 일정"""
+        user = User.objects.get(user_name="홍길동2")
+        self.create_holdings(user, 200)
+        refresh_portfolio_summaries()
+
+        response = self.assert_screen_query_budget(user)
+        self.assertEqual(len(response.json()), 200)
+
+    def test_screen_api_cache(self):
+        """화면 API 캐시 - 두번째 요청은 쿼리 없이 응답, 계좌 캐시 삭제 후 다시 조회"""
+        user = User.objects.get(user_name="홍길동")
+        url = reverse("investment", args=[user.id])
+        self.client.get(url)
+
+        with self.assertNumQueries(0):
+            response = self.client.get(url)
+        self.assertEqual(response.json()["account_total_assets"], 0.0)
+
+        Account.objects.filter(id=user.account_id).update(total_assets=1000)
+        invalidate_account_screens([user.account_id])
+
+        response = self.client.get(url)
+        self.assertEqual(response.json()["account_total_assets"], 1000.0)
+
+    def test_get_portfolio_batch_data(self):
+        """포트폴리오 일괄조회 API - 페이지당 쿼리 수 일정, cursor 페이지네이션"""
+        user_ids = list(User.objects.order_by("id").values_list("id", flat=True))
+        url = reverse("investment-batch")
+
+        with self.assertNumQueries(2):
+            response = self.client.get(
+                url, {"ids": ",".join(map(str, user_ids)), "page_size": 2}
+            )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        results = response.json()["results"]
+        self.assertEqual([result["user_id"] for result in results], user_ids[:2])
+        self.assertEqual(len(results[0]["holdings"]), 3)
+        self.assertEqual(results[0]["total_proceeds"], -1000000.0)
+        self.assertEqual(results[1]["holdings"], [])
+
+        response = self.client.get(response.json()["next"])
+        self.assertEqual(
+            [result["user_id"] for result in response.json()["results"]],
+            user_ids[2:],
+        )
+        self.assertIsNone(response.json()["next"])
+
+        response = self.client.get(
+            url, {"account_number_from": "12345", "account_number_to": "12346"}
+        )
+        self.assertEqual(
+            [result["account_number"] for result in response.json()["results"]],
+            ["12345", "12346"],
+        )
+
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_portfolio_summary_upsert_without_conflict_target(self):
+        """충돌 컬럼을 지정할 수 없는 DB (MySQL) 는 unique_fields 없이 upsert"""
+        features = connection.features
+        with mock.patch.object(
+            features, "supports_update_conflicts_with_target", False
+        ), mock.patch.object(PortfolioSummary.objects, "bulk_create") as bulk_create:
+            refresh_portfolio_summaries()
+
+        kwargs = bulk_create.call_args.kwargs
+        self.assertNotIn("unique_fields", kwargs)
+        self.assertTrue(kwargs["update_conflicts"])
+        self.assertIn("total_assets", kwargs["update_fields"])
+
+        with mock.patch.object(PortfolioSummary.objects, "bulk_create") as bulk_create:
+            refresh_portfolio_summaries()
+        self.assertEqual(bulk_create.call_args.kwargs["unique_fields"], ["user_id"])
+
+    def test_screen_api_from_portfolio_summary(self):
+        """포트폴리오 요약으로 응답해도 기존 조회 결과와 동일"""
+        user = User.objects.get(user_name="홍길동")
+        Account.objects.filter(id=user.account_id).update(total_assets=1200000)
+        urls = [
+            reverse("investment", args=[user.id]),
+            reverse("investment-detail", args=[user.investment.id]),
+        ]
+        expected_data = [self.client.get(url).json() for url in urls]
+        cache.clear()
+
+        refresh_portfolio_summaries([user.account_id])
+
+        summary = PortfolioSummary.objects.get(user=user)
+        self.assertEqual(
+            summary.asset_group_breakdown,
+            {"한국주식": "50000.00", "미국주식": "9000.00"},
+        )
+        for url, expected in zip(urls, expected_data):
+            with self.assertNumQueries(1):
+                response = self.client.get(url)
+            self.assertEqual(response.json(), expected)
+
+    def test_async_screen_api(self):
+        """async 화면 API - sync 화면 API 와 같은 응답, 같은 쿼리 수"""
+        user = User.objects.get(user_name="홍길동")
+        screens = [
+            (reverse("investment", args=[user.id]), AsyncInvestmentView, user.id),
+            (
+                reverse("investment-detail", args=[user.investment.id]),
+                AsyncInvestmentDetailView,
+                user.investment.id,
+            ),
+            (reverse("user-holdings", args=[user.id]), AsyncUserHoldingView, user.id),
+        ]
+
+        for with_summary in (False, True):
+            if with_summary:
+                refresh_portfolio_summaries([user.account_id])
+
+            for url, async_view, pk in screens:
+                cache.clear()
+                with CaptureQueriesContext(connection) as sync_queries:
+                    expected = self.client.get(url).json()
+                cache.clear()
+
+                with self.subTest(url=url, with_summary=with_summary):
+                    with self.assertNumQueries(len(sync_queries)):
+                        response = async_to_sync(async_view.as_view())(
+                            self.factory.get(url), pk=pk
+                        )
+                    self.assertEqual(response.status_code, status.HTTP_200_OK)
+                    self.assertEqual(json.loads(response.content), expected)
+
+                    # 두번째 요청은 캐시에서 응답
+                    with self.assertNumQueries(0):
+                        async_to_sync(async_view.as_view())(
+                            self.factory.get(url), pk=pk
+                        )
+
+    def test_screen_api_reads_from_replica(self):
+        """화면 GET 조회만 replica 로 요청 (sync / async), 그 외 API 는 default"""
+        user = User.objects.get(user_name="홍길동")
+        requested = []
+        db_for_read = DatabaseRouter.db_for_read
+
+        def record(router, model, **hints):
+            requested.append(databases._database.get())
+            return db_for_read(router, model, **hints)
+
+        screens = [
+            (reverse("investment", args=[user.id]), AsyncInvestmentView, user.id),
+            (
+                reverse("investment-detail", args=[user.investment.id]),
+                AsyncInvestmentDetailView,
+                user.investment.id,
+            ),
+            (reverse("user-holdings", args=[user.id]), AsyncUserHoldingView, user.id),
+        ]
+        with mock.patch.object(DatabaseRouter, "db_for_read", record):
+            for url, async_view, pk in screens:
+                with self.subTest(url=url):
+                    cache.clear()
+                    requested.clear()
+                    self.client.get(url)
+                    self.assertTrue(requested)
+                    self.assertEqual(set(requested), {REPLICA_DATABASE})
+
+                    cache.clear()
+                    requested.clear()
+                    async_to_sync(async_view.as_view())(self.factory.get(url), pk=pk)
+                    self.assertTrue(requested)
+                    self.assertEqual(set(requested), {REPLICA_DATABASE})
+
+            requested.clear()
+            self.client.get(reverse("account-values", args=[user.id]))
+            self.assertEqual(set(requested), {None})
+
+    @override_settings(SCREEN_CACHE_TIMEOUT=3600, SCREEN_REPLICA_CACHE_TIMEOUT=5)
+    def test_screen_cache_timeout_with_replica(self):
+        """replica 에서 만든 화면 캐시는 짧게 유지"""
+        with mock.patch("api.cache.cache") as screen_cache:
+            get_screen_data("screen:test", dict)
+            self.assertEqual(screen_cache.get_or_set.call_args.args[2], 3600)
+
+            with mock.patch.dict(
+                "django.conf.settings.DATABASES", {REPLICA_DATABASE: {}}
+            ):
+                get_screen_data("screen:test", dict)
+            self.assertEqual(screen_cache.get_or_set.call_args.args[2], 5)
+
+    def test_snapshot_upsert_without_conflict_target(self):
+        """충돌 컬럼을 지정할 수 없는 DB (MySQL) 는 스냅샷도 unique_fields 없이 upsert"""
+        with mock.patch.object(
+            connection.features, "supports_update_conflicts_with_target", False
+        ), mock.patch.object(
+            PositionSnapshot.objects, "bulk_create"
+        ) as positions, mock.patch.object(
+            AccountValueSnapshot.objects, "bulk_create"
+        ) as accounts:
+            write_snapshots(date(2022, 9, 1))
+
+        for bulk_create in (positions, accounts):
+            self.assertTrue(bulk_create.call_args.kwargs["update_conflicts"])
+            self.assertNotIn("unique_fields", bulk_create.call_args.kwargs)
+
+    def test_account_values_from_snapshots(self):
+        """일자별 스냅샷으로 계좌 총 자산 기간 조회"""
+        user = User.objects.get(user_name="홍길동")
+        for day, total_assets in ((1, 1000), (2, 2000), (3, 3000)):
+            Account.objects.filter(id=user.account_id).update(total_assets=total_assets)
+            result = write_snapshots(date(2022, 9, day))
+        write_snapshots(date(2022, 9, 3))
+
+        self.assertEqual(
+            result, {"snapshot_date": "2022-09-03", "positions": 3, "accounts": 3}
+        )
+        self.assertEqual(PositionSnapshot.objects.count(), 9)
+        self.assertEqual(AccountValueSnapshot.objects.count(), 9)
+
+        url = reverse("account-values", args=[user.id])
+        with self.assertNumQueries(1):
+            response = self.client.get(url, {"from": "2022-09-02", "to": "2022-09-30"})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            response.json(),
+            [
+                {"date": "2022-09-02", "total_assets": 2000.0},
+                {"date": "2022-09-03", "total_assets": 3000.0},
+            ],
+        )
+        response = self.client.get(url, {"from": "2022-9-x"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class ValuationTest(SimpleTestCase):
+    def test_position_columns_totals(self):
+        """고정소수점 평가금액 - float 오차 없이 key 별 합산"""
+        columns = PositionColumns.from_rows(
+            [
+                (1, 0.1, 3),
+                (1, 0.2, 3),
+                (2, None, None),
+                (3, 8585, 21),
+                (3, Decimal("1.25"), 4),
+            ]
+        )
+
+        self.assertEqual(list(columns.appraisal_amounts()), [30, 60, 0, 18028500, 500])
+        self.assertEqual(
+            {key: from_minor_units(total) for key, total in columns.totals().items()},
+            {1: Decimal("0.90"), 2: Decimal("0.00"), 3: Decimal("180290.00")},
+        )
+        self.assertEqual(appraisal_amount(0.1, 3), Decimal("0.30"))
+
+
+class DatabaseRoutingTest(SimpleTestCase):
+    def test_database_settings(self):
+        """커넥션 유지 / health check 설정, jobs / replica alias 는 default 의 mirror"""
+        sqlite = {"ENGINE": "django.db.backends.sqlite3", "NAME": "primary.sqlite3"}
+        result = database_settings(
+            sqlite,
+            {
+                "DB_CONN_MAX_AGE": "300",
+                "DB_JOBS_USER": "batch",
+                "DB_REPLICA_NAME": "replica.sqlite3",
+            },
+        )
+
+        self.assertEqual(set(result), {"default", JOBS_DATABASE, REPLICA_DATABASE})
+        self.assertEqual(result["default"]["CONN_MAX_AGE"], 300)
+        self.assertTrue(result["default"]["CONN_HEALTH_CHECKS"])
+        self.assertEqual(result[JOBS_DATABASE]["USER"], "batch")
+        self.assertEqual(result[JOBS_DATABASE]["NAME"], "primary.sqlite3")
+        self.assertEqual(result[JOBS_DATABASE]["CONN_MAX_AGE"], 0)
+        self.assertEqual(result[REPLICA_DATABASE]["NAME"], "replica.sqlite3")
+        self.assertEqual(result[REPLICA_DATABASE]["TEST"], {"MIRROR": "default"})
+
+        result = database_settings(
+            sqlite, {"DB_CONN_HEALTH_CHECKS": "false"}, separate_jobs=False
+        )
+        self.assertEqual(set(result), {"default"})
+        self.assertFalse(result["default"]["CONN_HEALTH_CHECKS"])
+
+    def test_router(self):
+        """지정한 alias 로 라우팅 - replica 는 조회만, 설정에 없는 alias 는 default"""
+        router = DatabaseRouter(
+            {"default": {}, JOBS_DATABASE: {}, REPLICA_DATABASE: {}}
+        )
+        self.assertIsNone(router.db_for_read(User))
+        self.assertIsNone(router.db_for_write(User))
+
+        with use_database(REPLICA_DATABASE):
+            self.assertEqual(router.db_for_read(User), REPLICA_DATABASE)
+            self.assertIsNone(router.db_for_write(User))
+
+            # 안쪽 블록이 끝나면 바깥 alias 로 복구
+            with use_database(JOBS_DATABASE):
+                self.assertEqual(router.db_for_read(User), JOBS_DATABASE)
+                self.assertEqual(router.db_for_write(User), JOBS_DATABASE)
+            self.assertEqual(router.db_for_read(User), REPLICA_DATABASE)
+
+        with use_database(REPLICA_DATABASE):
+            self.assertIsNone(DatabaseRouter({"default": {}}).db_for_read(User))
+
+        self.assertIsNone(router.allow_migrate("default", "api"))
+        self.assertFalse(router.allow_migrate(JOBS_DATABASE, "api"))
+        self.assertFalse(router.allow_migrate(REPLICA_DATABASE, "api"))
+
+
+class DepositAPITest(APITestCase):
+    def setUp(self):
+        self.account = Account.objects.create(
+            account_number="1234", account_name="계좌1", total_assets=1000
+        )
+        User.objects.create(account=self.account, user_name="홍길동")
+
+    def tearDown(self):
+        cache.clear()
+
+    def register_deposit(self, transfer_amount=10000):
+        response = self.client.post(
+            reverse("investment-deposit"),
+            {
+                "user_name": "홍길동",
+                "account_number": "1234",
+                "transfer_amount": transfer_amount,
+            },
+            format="json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+        return DepositLog.objects.get(id=response.json()["transfer_identifier"])
+
+    def test_confirm_deposit(self):
+        """입금거래 검증 및 자산 업데이트 - 같은 거래를 다시 확인해도 한번만 반영"""
+        deposit_log = self.register_deposit()
+        data = {
+            "transfer_identifier": deposit_log.id,
+            "signature": deposit_log.signature,
+        }
+
+        for _ in range(2):
+            response = self.client.put(
+                reverse("investment-deposit"), data, format="json"
+            )
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertEqual(response.json(), {"status": True})
+
+        self.account.refresh_from_db()
+        self.assertEqual(self.account.total_assets, Decimal("11000"))
+
+    def test_confirm_deposit_lock_order(self):
+        """단건 / 여러건 입금 확인 모두 계좌 → 입금거래 순서로 조회 (락 순서가 같아야 교착상태 없음)"""
+        for confirm in (
+            confirm_deposit,
+            lambda deposit_log: confirm_deposits([deposit_log]),
+        ):
+            deposit_log = self.register_deposit()
+            with self.subTest(confirm=confirm), CaptureQueriesContext(
+                connection
+            ) as queries:
+                confirm(deposit_log)
+
+            tables = [
+                table
+                for query in queries.captured_queries
+                for table in ("accounts", "deposit_logs")
+                if f'"{table}"' in query["sql"]
+            ]
+            self.assertEqual(tables[:2], ["accounts", "deposit_logs"])
+
+    def test_confirmed_deposit_fast_path(self):
+        """확인이 끝난 입금거래는 DB 조회 / 서명 검증 없이 응답"""
+        deposit_log = self.register_deposit()
+        data = {
+            "transfer_identifier": deposit_log.id,
+            "signature": deposit_log.signature,
+        }
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.put(reverse("investment-deposit"), data, format="json")
+
+        with mock.patch("jwt.decode") as decode, self.assertNumQueries(0):
+            response = self.client.put(
+                reverse("investment-deposit"), data, format="json"
+            )
+
+        self.assertEqual(response.json(), {"status": True})
+        decode.assert_not_called()
+
+        with mock.patch("jwt.decode") as decode, self.assertNumQueries(0):
+            response = self.client.put(
+                reverse("investment-deposit-bulk"), [data], format="json"
+            )
+
+        self.assertEqual(response.json()[0]["status"], True)
+        decode.assert_not_called()
+
+    def test_confirm_deposits(self):
+        """여러 입금거래 확인 - 같은 계좌 입금은 합산해서 UPDATE 한번"""
+        deposit_logs = [self.register_deposit(amount) for amount in (100, 200, 300)]
+        DepositLog.objects.filter(id=deposit_logs[0].id).update(status=True)
+
+        with CaptureQueriesContext(connection) as queries:
+            results = confirm_deposits(deposit_logs)
+
+        self.assertEqual(
+            results,
+            {
+                deposit_logs[0].id: False,
+                deposit_logs[1].id: True,
+                deposit_logs[2].id: True,
+            },
+        )
+        account_updates = [
+            query
+            for query in queries.captured_queries
+            if query["sql"].startswith('UPDATE "accounts"')
+        ]
+        self.assertEqual(len(account_updates), 1)
+
+        self.account.refresh_from_db()
+        self.assertEqual(self.account.total_assets, Decimal("1500"))
+
+    def test_confirm_deposit_after_commit_failure(self):
+        """커밋 후 처리 (요약 갱신 등) 가 실패해도 반영된 입금은 성공으로 응답"""
+        deposit_log = self.register_deposit()
+        data = {
+            "transfer_identifier": deposit_log.id,
+            "signature": deposit_log.signature,
+        }
+
+        with mock.patch(
+            "api.deposits.refresh_portfolio_summaries", side_effect=RuntimeError
+        ), mock.patch(
+            "api.deposits.invalidate_account_screens"
+        ) as invalidate, self.assertLogs(
+            "api.deposits", "ERROR"
+        ):
+            with self.captureOnCommitCallbacks(execute=True):
+                response = self.client.put(
+                    reverse("investment-deposit"), data, format="json"
+                )
+
+        # 요약 갱신이 실패해도 화면 캐시는 삭제
+        invalidate.assert_called_once_with([self.account.id])
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json(), {"status": True})
+        self.account.refresh_from_db()
+        self.assertEqual(self.account.total_assets, Decimal("11000"))
+
+    def test_deposit_confirm_batcher(self):
+        """동시에 들어온 요청은 한 batch 로 처리하고, 요청마다 자기 결과 / 예외를 받음"""
+        deposit_logs = [mock.Mock(id=deposit_id) for deposit_id in (1, 2, 3)]
+        error = Account.DoesNotExist("Account matching query does not exist.")
+        batches = []
+
+        def confirm(batch):
+            batches.append(sorted(deposit_log.id for deposit_log in batch))
+            return {1: True, 2: False, 3: error}
+
+        batcher = DepositConfirmBatcher(window=0.5)
+        barrier = threading.Barrier(len(deposit_logs))
+        futures = {}
+
+        def submit(deposit_log):
+            barrier.wait()
+            futures[deposit_log.id] = batcher.submit(deposit_log)
+
+        with mock.patch("api.deposits.confirm_deposits", side_effect=confirm):
+            threads = [
+                threading.Thread(target=submit, args=(deposit_log,))
+                for deposit_log in deposit_logs
+            ]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+            self.assertTrue(futures[1].result(timeout=5))
+            self.assertFalse(futures[2].result(timeout=5))
+            self.assertIs(futures[3].exception(timeout=5), error)
+
+        self.assertEqual(batches, [[1, 2, 3]])
+
+    def test_bulk_deposit(self):
+        """입금거래 일괄 등록 / 확인 - 항목별 결과 반환"""
+        url = reverse("investment-deposit-bulk")
+        response = self.client.post(
+            url,
+            [
+                {"user_name": "홍길동", "account_number": "1234", "transfer_amount": 100},
+                {"user_name": "홍길동", "account_number": "1234"},
+                {"user_name": "홍길동", "account_number": "1234", "transfer_amount": 200},
+            ],
+            format="json",
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        registered = response.json()
+        self.assertIsNone(registered[1]["transfer_identifier"])
+        self.assertIn("transfer_amount", registered[1]["errors"])
+
+        deposit_logs = DepositLog.objects.in_bulk(
+            [registered[0]["transfer_identifier"], registered[2]["transfer_identifier"]]
+        )
+        first, second = [
+            deposit_logs[result["transfer_identifier"]]
+            for result in (registered[0], registered[2])
+        ]
+
+        response = self.client.put(
+            url,
+            [
+                {"transfer_identifier": first.id, "signature": first.signature},
+                {"transfer_identifier": second.id, "signature": first.signature},
+                {"transfer_identifier": 0, "signature": first.signature},
+                {"transfer_identifier": second.id, "signature": second.signature},
+            ],
+            format="json",
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [result["status"] for result in response.json()],
+            [True, False, False, True],
+        )
+        self.account.refresh_from_db()
+        self.assertEqual(self.account.total_assets, Decimal("1300"))
+
+    @override_settings(DEPOSIT_CONFIRM_ASYNC=True)
+    def test_confirm_deposit_async(self):
+        """비동기 입금 확인 - 대기열에 넣고 202 응답, worker 처리 후 상태 API 로 확인"""
+        deposit_log = self.register_deposit()
+        deposit_queue = LocalDepositQueue()
+        status_url = reverse("investment-deposit-status", args=[deposit_log.id])
+
+        with mock.patch("api.views.get_deposit_queue", return_value=deposit_queue):
+            response = self.client.put(
+                reverse("investment-deposit"),
+                {
+                    "transfer_identifier": deposit_log.id,
+                    "signature": deposit_log.signature,
+                },
+                format="json",
+            )
+
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        self.assertEqual(
+            response.json(), {"transfer_identifier": deposit_log.id, "status": False}
+        )
+        self.assertEqual(self.client.get(status_url).json()["status"], False)
+
+        # worker 가 하는 처리를 현재 스레드에서 실행
+        self.assertTrue(process_queued_deposit(*deposit_queue.get(timeout=0)))
+        self.assertIsNone(deposit_queue.get(timeout=0))
+
+        self.assertEqual(self.client.get(status_url).json()["status"], True)
+        self.account.refresh_from_db()
+        self.assertEqual(self.account.total_assets, Decimal("11000"))
+
+    @override_settings(DEPOSIT_CONFIRM_ASYNC=True)
+    def test_confirm_deposit_async_invalid_signature(self):
+        """비동기 입금 확인 - 서명이 맞지 않으면 대기열에 넣지 않고 400"""
+        deposit_log = self.register_deposit()
+        other = self.register_deposit(500)
+        deposit_queue = LocalDepositQueue()
+
+        with mock.patch("api.views.get_deposit_queue", return_value=deposit_queue):
+            for signature in (other.signature, "invalid"):
+                response = self.client.put(
+                    reverse("investment-deposit"),
+                    {"transfer_identifier": deposit_log.id, "signature": signature},
+                    format="json",
+                )
+                self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+        self.assertIsNone(deposit_queue.get(timeout=0))
+
+    def test_database_deposit_queue(self):
+        """DB 대기열 - 넣은 순서대로 한번씩만 꺼냄"""
+        deposit_logs = [self.register_deposit(amount) for amount in (100, 200)]
+        deposit_queue = DatabaseDepositQueue()
+
+        for deposit_log in deposit_logs:
+            deposit_queue.put(deposit_log.id, deposit_log.signature)
+
+        items = [
+            (deposit_log.id, deposit_log.signature) for deposit_log in deposit_logs
+        ]
+        self.assertEqual(
+            [deposit_queue.get(timeout=0) for _ in range(3)], [*items, None]
+        )
+
+        # 실패한 항목은 다시 꺼내고, 처리가 끝난 항목은 삭제
+        deposit_queue.retry(items[0])
+        self.assertEqual(deposit_queue.get(timeout=0), items[0])
+        for item in items:
+            deposit_queue.ack(item)
+        self.assertFalse(DepositQueueItem.objects.exists())
+
+    def test_database_deposit_queue_visibility_timeout(self):
+        """DB 대기열 - 꺼낸 후 처리 완료가 없으면 visibility_timeout 후 다시 꺼냄"""
+        deposit_log = self.register_deposit()
+        item = (deposit_log.id, deposit_log.signature)
+        DatabaseDepositQueue().put(*item)
+
+        self.assertEqual(DatabaseDepositQueue().get(timeout=0), item)
+        self.assertIsNone(DatabaseDepositQueue().get(timeout=0))
+        self.assertEqual(
+            DatabaseDepositQueue(visibility_timeout=0).get(timeout=0), item
+        )
+
+    def test_deposit_worker_retries_failed_item(self):
+        """worker - 처리에 실패한 항목은 대기열로 되돌림"""
+        deposit_queue = mock.Mock()
+        pool = DepositWorkerPool(deposit_queue, workers=0)
+
+        def get(timeout):
+            pool._stopped.set()
+            return 1, "signature"
+
+        deposit_queue.get.side_effect = get
+        with mock.patch("api.deposit_queue.close_old_connections"), mock.patch(
+            "api.deposit_queue.process_queued_deposit", side_effect=RuntimeError
+        ), self.assertLogs("api.deposit_queue", "ERROR"):
+            pool._run()
+
+        deposit_queue.retry.assert_called_once_with((1, "signature"))
+        deposit_queue.ack.assert_not_called()
@@ -1,22 +1,53 @@
+from django.conf import settings
 from django.urls import path
 
 from api import views
 
+# 화면 API 구현 - SCREEN_API_ASYNC 이면 async 버전 (ASGI 배포)
+if settings.SCREEN_API_ASYNC:
+    investment_view = views.AsyncInvestmentView
+    investment_detail_view = views.AsyncInvestmentDetailView
+    user_holding_view = views.AsyncUserHoldingView
+else:
+    investment_view = views.InvestmentView
+    investment_detail_view = views.InvestmentDetailView
+    user_holding_view = views.UserHoldingView
+
 urlpatterns = [
-    path("investments/<int:pk>", views.InvestmentView.as_view(), name="investment"),
+    path("investments/<int:pk>", investment_view.as_view(), name="investment"),
     path(
         "investments/detail/<int:pk>",
-        views.InvestmentDetailView.as_view(),
+        investment_detail_view.as_view(),
         name="investment-detail",
     ),
+    path(
+        "investments/batch",
+        views.PortfolioBatchView.as_view(),
+        name="investment-batch",
+    ),
     path(
         "users/<int:pk>/holdings",
-        views.UserHoldingView.as_view(),
+        user_holding_view.as_view(),
         name="user-holdings",
     ),
+    path(
+        "users/<int:pk>/account-values",
+        views.AccountValueView.as_view(),
+        name="account-values",
+    ),
     path(
         "investments/deposit",
         views.InvestmentDeposit.as_view(),
         name="investment-deposit",
     ),
+    path(
+        "investments/deposit/<int:pk>",
+        views.InvestmentDepositStatus.as_view(),
+        name="investment-deposit-status",
+    ),
+    path(
+        "investments/deposit/bulk",
+        views.InvestmentDepositBulk.as_view(),
+        name="investment-deposit-bulk",
+    ),
 ]
@@ -0,0 +1,129 @@
+"""
+보유종목 평가금액 계산 (고정소수점)
+- 금액은 최소 단위 (0.01) 정수로 계산해서 float 오차 없이 DecimalField (소수점 2자리) 와 일치
+- 여러 종목은 array 컬럼 (가격 / 수량) 으로 모아서 한번에 계산
+"""
+from array import array
+from decimal import Decimal
+from itertools import compress, islice, repeat
+from operator import itemgetter, mul, ne
+
+# 금액 최소 단위 (소수점 2자리)
+MINOR_UNITS = 100
+MINOR_UNITS_EXPONENT = -2
+
+
+def to_minor_units(price):
+    """
+    가격을 최소 단위 정수로 변환
+    - float 현재가는 소수점 2자리까지 정확 (CSV 원본 값 기준)
+    :param price: int / float / Decimal / None
+    :return: int
+    """
+    if price is None:
+        return 0
+
+    if isinstance(price, Decimal):
+        return int(price.scaleb(-MINOR_UNITS_EXPONENT).to_integral_value())
+
+    return round(price * MINOR_UNITS)
+
+
+def from_minor_units(units):
+    """
+    최소 단위 정수를 Decimal 금액으로 변환
+    :param units:
+    :return: Decimal (소수점 2자리)
+    """
+    return Decimal(units).scaleb(MINOR_UNITS_EXPONENT)
+
+
+def appraisal_amount(price, quantity):
+    """
+    종목 하나의 평가금액 (현재가 * 수량)
+    :param price:
+    :param quantity:
+    :return: Decimal
+    """
+    return from_minor_units(to_minor_units(price) * (quantity or 0))
+
+
+class PositionColumns:
+    """
+    보유종목 컬럼 묶음
+    - 가격 (최소 단위) / 수량을 array 로 보관
+    - 같은 key (계좌, 자산그룹 등) 의 종목은 연속 구간으로 저장하고 offsets 로 구간 표시
+    """
+
+    def __init__(self):
+        self.keys = []
+        self.offsets = array("q", [0])
+        self.prices = array("q")
+        self.quantities = array("q")
+
+    def __len__(self):
+        return len(self.prices)
+
+    @classmethod
+    def from_rows(cls, rows):
+        """
+        (key, 가격, 수량) row 로 컬럼 생성
+        - row 는 key 순서로 정렬되어 있어야 함
+        - 가격 / 수량이 None 인 row 는 0 으로 계산 (보유종목 없는 계좌도 key 는 남김)
+        :param rows: iterable
+        :return: PositionColumns
+        """
+        columns = cls()
+        rows = list(rows)
+        if not rows:
+            return columns
+
+        keys = list(map(itemgetter(0), rows))
+        prices = list(map(itemgetter(1), rows))
+        quantities = list(map(itemgetter(2), rows))
+
+        # 행 단위 파이썬 함수 호출 없이 변환하고, None 이 섞여 있으면 행마다 변환
+        try:
+            columns.prices = array(
+                "q", map(round, map(mul, prices, repeat(MINOR_UNITS)))
+            )
+        except TypeError:
+            columns.prices = array("q", map(to_minor_units, prices))
+        try:
+            columns.quantities = array("q", quantities)
+        except TypeError:
+            columns.quantities = array("q", (quantity or 0 for quantity in quantities))
+
+        # key 가 바뀌는 위치가 구간 경계
+        boundaries = list(
+            compress(range(1, len(keys)), map(ne, islice(keys, 1, None), keys))
+        )
+        columns.keys = [keys[0], *map(keys.__getitem__, boundaries)]
+        columns.offsets.extend(boundaries)
+        columns.offsets.append(len(keys))
+
+        return columns
+
+    def appraisal_amounts(self):
+        """
+        종목별 평가금액 (최소 단위)
+        :return: array
+        """
+        return array("q", map(mul, self.prices, self.quantities))
+
+    def totals(self):
+        """
+        key 별 평가금액 합계 (최소 단위)
+        :return: {key: int}
+        """
+        prices, quantities, offsets = self.prices, self.quantities, self.offsets
+        return {
+            key: sum(
+                map(
+                    mul,
+                    prices[offsets[idx] : offsets[idx + 1]],
+                    quantities[offsets[idx] : offsets[idx + 1]],
+                )
+            )
+            for idx, key in enumerate(self.keys)
+        }
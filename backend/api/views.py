@@ -1,50 +1,358 @@
-import jwt
-
+import abc
 from datetime import datetime, timedelta
 
+from django.conf import settings
+from django.db.models import Prefetch
+from django.http import HttpResponse
+from django.shortcuts import get_object_or_404
+from django.utils import timezone
+from django.utils.dateparse import parse_date
+from django.views import View
 from rest_framework import status
+from rest_framework.exceptions import ValidationError
+from rest_framework.renderers import JSONRenderer
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
-from api.models import User, Investment, UserHolding, DepositLog
+from api.cache import (
+    aget_screen_data,
+    get_confirmed_deposit_ids,
+    get_screen_data,
+    investment_cache_key,
+    investment_detail_cache_key,
+    user_holdings_cache_key,
+)
+from api.deposit_queue import get_deposit_queue
+from api.deposits import confirm_deposits, register_deposits, verify_deposit_signature
+from api.models import (
+    User,
+    Investment,
+    UserHolding,
+    DepositLog,
+    PortfolioSummary,
+    AccountValueSnapshot,
+)
+from api.pagination import PortfolioCursorPagination
+from api.signing import get_deposit_signer
 from api.serializers import (
     InvestmentViewSerializer,
     InvestmentDetailViewSerializer,
+    InvestmentSummarySerializer,
+    InvestmentDetailSummarySerializer,
     UserHoldingViewSerializer,
+    PortfolioBatchSerializer,
     DepositLogSerializer,
     AssetSerializer,
+    DepositBulkItemSerializer,
+    DepositStatusSerializer,
+)
+from backend.databases import REPLICA_DATABASE, use_database
+
+# 포트폴리오 일괄조회 시 ids 최대 개수
+PORTFOLIO_BATCH_MAX_IDS = 1000
+
+# 계좌 총 자산 기간 조회 기본 기간 (일)
+ACCOUNT_VALUES_DEFAULT_DAYS = 365
+
+# 입금거래 일괄 등록 / 확인 최대 건수
+DEPOSIT_BULK_MAX_ITEMS = 5000
+
+# 화면 조회 시 함께 읽는 포트폴리오 요약 필드
+INVESTMENT_SUMMARY_FIELDS = ("user_name", "account_number", "brokerage", "total_assets")
+INVESTMENT_DETAIL_SUMMARY_FIELDS = (
+    "account_name",
+    "brokerage",
+    "account_number",
+    "total_assets",
+    "principal",
+    "total_proceeds",
+    "proceeds_rate",
 )
-from backend.settings.base import SECRET_KEY, SIGNATURE_ALGORITHM
+
+
+def investment_queryset():
+    """투자화면 조회 queryset (유저 + 계좌 + 투자 + 포트폴리오 요약)"""
+    return User.objects.select_related(
+        "account", "investment", "portfolio_summary"
+    ).only(
+        "user_name",
+        "account__account_number",
+        "account__total_assets",
+        "investment__brokerage",
+        *(f"portfolio_summary__{field}" for field in INVESTMENT_SUMMARY_FIELDS),
+    )
+
+
+def investment_detail_queryset():
+    """투자상세화면 조회 queryset (투자 + 유저 + 계좌 + 포트폴리오 요약)"""
+    return Investment.objects.select_related("user__account", "portfolio_summary").only(
+        "brokerage",
+        "principal",
+        "user__account__account_number",
+        "user__account__account_name",
+        "user__account__total_assets",
+        *(f"portfolio_summary__{field}" for field in INVESTMENT_DETAIL_SUMMARY_FIELDS),
+    )
+
+
+def portfolio_summary(instance):
+    """
+    select_related 로 함께 조회한 포트폴리오 요약
+    :param instance: User / Investment
+    :return: PortfolioSummary or None
+    """
+    try:
+        return instance.portfolio_summary
+    except PortfolioSummary.DoesNotExist:
+        return None
+
+
+def user_holdings_queryset(pk):
+    """보유종목 화면 조회 queryset (보유종목 + 종목)"""
+    return (
+        UserHolding.objects.filter(user_id=pk)
+        .select_related("holding")
+        .only(
+            "quantity",
+            "current_price",
+            "holding__name",
+            "holding__asset_group",
+            "holding__isin",
+        )
+    )
 
 
 class InvestmentView(APIView):
     """투자화면 상세 API"""
 
     def get(self, request, pk):
-        queryset = User.objects.get(id=pk)
-        serializer = InvestmentViewSerializer(queryset)
+        data = get_screen_data(investment_cache_key(pk), lambda: self.get_data(pk))
 
-        return Response(data=serializer.data, status=status.HTTP_200_OK)
+        return Response(data=data, status=status.HTTP_200_OK)
+
+    @use_database(REPLICA_DATABASE)
+    def get_data(self, pk):
+        # 포트폴리오 요약이 있으면 요약으로, 없으면 계좌 / 투자로 응답 (쿼리는 한번)
+        user = investment_queryset().get(id=pk)
+        summary = portfolio_summary(user)
+        if summary is not None:
+            return InvestmentSummarySerializer(summary).data
+
+        serializer = InvestmentViewSerializer(user)
+
+        return serializer.data
 
 
 class InvestmentDetailView(APIView):
     """투자상세 화면 API"""
 
     def get(self, request, pk):
-        queryset = Investment.objects.get(id=pk)
-        serializer = InvestmentDetailViewSerializer(queryset)
+        data = get_screen_data(
+            investment_detail_cache_key(pk), lambda: self.get_data(pk)
+        )
 
-        return Response(data=serializer.data, status=status.HTTP_200_OK)
+        return Response(data=data, status=status.HTTP_200_OK)
+
+    @use_database(REPLICA_DATABASE)
+    def get_data(self, pk):
+        # 포트폴리오 요약이 있으면 요약으로, 없으면 계좌 / 투자로 응답 (쿼리는 한번)
+        investment = investment_detail_queryset().get(id=pk)
+        summary = portfolio_summary(investment)
+        if summary is not None:
+            return InvestmentDetailSummarySerializer(summary).data
+
+        serializer = InvestmentDetailViewSerializer(investment)
+
+        return serializer.data
 
 
 class UserHoldingView(APIView):
     """보유종목 화면 API"""
 
     def get(self, request, pk):
-        queryset = UserHolding.objects.filter(user=User.objects.get(id=pk))
+        data = get_screen_data(user_holdings_cache_key(pk), lambda: self.get_data(pk))
+
+        return Response(data=data, status=status.HTTP_200_OK)
+
+    @use_database(REPLICA_DATABASE)
+    def get_data(self, pk):
+        queryset = list(user_holdings_queryset(pk))
+
+        # 보유종목이 없을때만 유저 존재여부 확인 (없는 유저면 DoesNotExist)
+        if not queryset:
+            User.objects.only("id").get(id=pk)
+
         serializer = UserHoldingViewSerializer(queryset, many=True)
 
-        return Response(data=serializer.data, status=status.HTTP_200_OK)
+        return serializer.data
+
+
+class AsyncScreenView(View, metaclass=abc.ABCMeta):
+    """
+    화면 API async 버전 기본 클래스
+    - ASGI 에서 요청 처리 중 스레드를 잡지 않고 async ORM / 캐시로 조회
+    - 조회 queryset / 응답 형식은 sync 화면 API 와 같음
+    - replica 가 있으면 replica 에서 조회 (sync_to_async 스레드로 contextvar 전달)
+    """
+
+    cache_key = None
+
+    async def get(self, request, pk):
+        with use_database(REPLICA_DATABASE):
+            data = await aget_screen_data(self.cache_key(pk), lambda: self.get_data(pk))
+
+        return HttpResponse(
+            JSONRenderer().render(data),
+            content_type="application/json",
+            status=status.HTTP_200_OK,
+        )
+
+    @abc.abstractmethod
+    async def get_data(self, pk):
+        """
+        화면 데이터 조회 (캐시가 없을 때만 호출)
+        :param pk:
+        :return: 응답 data
+        """
+
+
+class AsyncInvestmentView(AsyncScreenView):
+    """투자화면 상세 API (async)"""
+
+    cache_key = staticmethod(investment_cache_key)
+
+    async def get_data(self, pk):
+        user = await investment_queryset().aget(id=pk)
+        summary = portfolio_summary(user)
+        if summary is not None:
+            return InvestmentSummarySerializer(summary).data
+
+        return InvestmentViewSerializer(user).data
+
+
+class AsyncInvestmentDetailView(AsyncScreenView):
+    """투자상세 화면 API (async)"""
+
+    cache_key = staticmethod(investment_detail_cache_key)
+
+    async def get_data(self, pk):
+        investment = await investment_detail_queryset().aget(id=pk)
+        summary = portfolio_summary(investment)
+        if summary is not None:
+            return InvestmentDetailSummarySerializer(summary).data
+
+        return InvestmentDetailViewSerializer(investment).data
+
+
+class AsyncUserHoldingView(AsyncScreenView):
+    """보유종목 화면 API (async)"""
+
+    cache_key = staticmethod(user_holdings_cache_key)
+
+    async def get_data(self, pk):
+        queryset = [user_holding async for user_holding in user_holdings_queryset(pk)]
+
+        if not queryset:
+            await User.objects.only("id").aget(id=pk)
+
+        return UserHoldingViewSerializer(queryset, many=True).data
+
+
+class AccountValueView(APIView):
+    """
+    계좌 총 자산 기간 조회 API - 일자별 스냅샷
+    - from / to (YYYY-MM-DD), 기본은 오늘까지 최근 1년
+    - (계좌, 기준일, 총 자산) covering index 만 읽는 쿼리 1번
+    """
+
+    @staticmethod
+    def get_date(request, name, default):
+        value = request.query_params.get(name)
+        if not value:
+            return default
+
+        try:
+            date = parse_date(value)
+        except ValueError:
+            date = None
+        if date is None:
+            raise ValidationError({name: "날짜는 YYYY-MM-DD 형식이어야 합니다."})
+
+        return date
+
+    def get(self, request, pk):
+        date_to = self.get_date(request, "to", timezone.localdate())
+        date_from = self.get_date(
+            request, "from", date_to - timedelta(days=ACCOUNT_VALUES_DEFAULT_DAYS)
+        )
+
+        values = [
+            {"date": snapshot_date, "total_assets": total_assets}
+            for snapshot_date, total_assets in AccountValueSnapshot.objects.filter(
+                account__user=pk, snapshot_date__range=(date_from, date_to)
+            )
+            .order_by("snapshot_date")
+            .values_list("snapshot_date", "total_assets")
+        ]
+
+        # 스냅샷이 없을때만 유저 존재여부 확인 (없는 유저면 DoesNotExist)
+        if not values:
+            User.objects.only("id").get(id=pk)
+
+        return Response(data=values, status=status.HTTP_200_OK)
+
+
+class PortfolioBatchView(APIView):
+    """
+    포트폴리오 일괄조회 API
+    - ids=1,2,3 (유저 id) 또는 account_number_from / account_number_to (계좌번호 범위)
+    - 유저 id 순 cursor 페이지네이션, 페이지당 쿼리 2번 (유저 + 보유종목)
+    """
+
+    def get(self, request):
+        ids = request.query_params.get("ids")
+        account_number_from = request.query_params.get("account_number_from")
+        account_number_to = request.query_params.get("account_number_to")
+
+        queryset = User.objects.select_related(
+            "account", "investment"
+        ).prefetch_related(
+            Prefetch(
+                "user_holdings",
+                queryset=UserHolding.objects.select_related("holding").order_by("id"),
+            )
+        )
+
+        if ids:
+            try:
+                ids = [int(user_id) for user_id in ids.split(",")]
+            except ValueError:
+                raise ValidationError({"ids": "유저 id 는 숫자여야 합니다."})
+
+            if len(ids) > PORTFOLIO_BATCH_MAX_IDS:
+                raise ValidationError(
+                    {"ids": f"한번에 {PORTFOLIO_BATCH_MAX_IDS}개까지 조회할 수 있습니다."}
+                )
+            queryset = queryset.filter(id__in=ids)
+
+        elif account_number_from or account_number_to:
+            if account_number_from:
+                queryset = queryset.filter(
+                    account__account_number__gte=account_number_from
+                )
+            if account_number_to:
+                queryset = queryset.filter(
+                    account__account_number__lte=account_number_to
+                )
+
+        else:
+            raise ValidationError("ids 또는 계좌번호 범위를 입력해주세요.")
+
+        paginator = PortfolioCursorPagination()
+        page = paginator.paginate_queryset(queryset, request, view=self)
+        serializer = PortfolioBatchSerializer(page, many=True)
+
+        return paginator.get_paginated_response(serializer.data)
 
 
 class InvestmentDeposit(APIView):
@@ -52,9 +360,7 @@ class InvestmentDeposit(APIView):
 
     def post(self, request):
         payload = {**request.data, "exp": datetime.utcnow() + timedelta(days=3)}
-        signature = jwt.encode(
-            payload, SECRET_KEY, algorithm=SIGNATURE_ALGORITHM
-        )  # jwt를 이용하여 해싱
+        signature = get_deposit_signer().sign(payload)  # jwt를 이용하여 해싱
         serializer = DepositLogSerializer(data={**payload, "signature": signature})
 
         if serializer.is_valid(raise_exception=True):
@@ -66,9 +372,177 @@ class InvestmentDeposit(APIView):
         )
 
     def put(self, request):
-        deposit_log = DepositLog.objects.get(id=request.data.get("transfer_identifier"))
+        # 확인이 끝난 입금거래는 DB 조회 / 서명 검증 없이 응답
+        transfer_identifier = request.data.get("transfer_identifier")
+        if get_confirmed_deposit_ids([transfer_identifier]):
+            return Response(data={"status": True}, status=status.HTTP_200_OK)
+
+        if settings.DEPOSIT_CONFIRM_ASYNC:
+            return self.put_async(request)
+
+        deposit_log = DepositLog.objects.get(id=transfer_identifier)
         serializer = AssetSerializer(deposit_log, data=request.data)
         if serializer.is_valid(raise_exception=True):
             serializer.save()
 
         return Response(data=serializer.data, status=status.HTTP_200_OK)
+
+    @staticmethod
+    def put_async(request):
+        """
+        비동기 입금 확인 - 서명 검증 후 대기열에 넣고 바로 응답
+        - 서명이 맞지 않으면 대기열에 넣지 않고 400 (동기 입금 확인과 같음)
+        - 자산 업데이트는 worker pool 에서 처리
+        - 처리 결과는 입금거래 상태 API 로 조회
+        :param request:
+        :return: 202 (이미 확인된 입금거래면 200)
+        """
+        serializer = DepositBulkItemSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        deposit_log = get_object_or_404(
+            DepositLog, id=serializer.validated_data["transfer_identifier"]
+        )
+
+        if deposit_log.status:
+            return Response(
+                data=DepositStatusSerializer(deposit_log).data,
+                status=status.HTTP_200_OK,
+            )
+
+        signature = serializer.validated_data["signature"]
+        try:
+            verified = verify_deposit_signature(deposit_log, signature)
+        except Exception as e:
+            raise ValidationError(str(e))
+        if not verified:
+            raise ValidationError("입금거래 정보가 서명과 일치하지 않습니다.")
+
+        get_deposit_queue().put(deposit_log.id, signature)
+
+        return Response(
+            data=DepositStatusSerializer(deposit_log).data,
+            status=status.HTTP_202_ACCEPTED,
+        )
+
+
+class InvestmentDepositStatus(APIView):
+    """입금 거래 확인 상태 API"""
+
+    def get(self, request, pk):
+        deposit_log = get_object_or_404(DepositLog, id=pk)
+
+        return Response(
+            data=DepositStatusSerializer(deposit_log).data, status=status.HTTP_200_OK
+        )
+
+
+class InvestmentDepositBulk(APIView):
+    """
+    입금 거래 일괄 API
+    - 요청 body 는 입금거래 배열, 응답은 항목별 결과 배열 (요청 순서)
+    """
+
+    @staticmethod
+    def get_items(request):
+        if not isinstance(request.data, list):
+            raise ValidationError("입금거래 배열을 입력해주세요.")
+
+        if len(request.data) > DEPOSIT_BULK_MAX_ITEMS:
+            raise ValidationError(f"한번에 {DEPOSIT_BULK_MAX_ITEMS}건까지 처리할 수 있습니다.")
+
+        return request.data
+
+    def post(self, request):
+        exp = datetime.utcnow() + timedelta(days=3)
+        results, deposit_logs = [], []
+
+        for item in self.get_items(request):
+            if not isinstance(item, dict):
+                results.append({"transfer_identifier": None, "errors": "잘못된 입금거래입니다."})
+                continue
+
+            payload = {**item, "exp": exp}
+            signature = get_deposit_signer().sign(payload)
+            serializer = DepositLogSerializer(data={**payload, "signature": signature})
+
+            if not serializer.is_valid():
+                results.append(
+                    {"transfer_identifier": None, "errors": serializer.errors}
+                )
+                continue
+
+            deposit_log = DepositLog(**serializer.validated_data)
+            deposit_logs.append(deposit_log)
+            results.append({"deposit_log": deposit_log, "errors": None})
+
+        register_deposits(deposit_logs)
+
+        for result in results:
+            if "deposit_log" in result:
+                result["transfer_identifier"] = result.pop("deposit_log").id
+
+        return Response(data=results, status=status.HTTP_201_CREATED)
+
+    def put(self, request):
+        items = []
+        for item in self.get_items(request):
+            serializer = DepositBulkItemSerializer(data=item)
+            items.append(
+                (serializer.validated_data, None)
+                if serializer.is_valid()
+                else (None, serializer.errors)
+            )
+
+        transfer_identifiers = {
+            data["transfer_identifier"] for data, _ in items if data
+        }
+        confirmed_ids = get_confirmed_deposit_ids(transfer_identifiers)
+        deposit_logs = DepositLog.objects.in_bulk(transfer_identifiers - confirmed_ids)
+
+        # 서명 검증을 먼저 모두 끝낸 후 검증된 입금거래만 한번에 반영
+        results, verified_results, verified = [], [], {}
+        for data, errors in items:
+            result = {
+                "transfer_identifier": data["transfer_identifier"] if data else None,
+                "status": False,
+                "error": errors,
+            }
+            results.append(result)
+            if errors:
+                continue
+
+            # 이미 확인된 입금거래는 서명 검증 없이 응답
+            if data["transfer_identifier"] in confirmed_ids:
+                result["status"] = True
+                continue
+
+            deposit_log = deposit_logs.get(data["transfer_identifier"])
+            if deposit_log is None:
+                result["error"] = "DepositLog matching query does not exist."
+                continue
+
+            if deposit_log.status:
+                result["status"] = True
+                continue
+
+            try:
+                if not verify_deposit_signature(deposit_log, data["signature"]):
+                    result["error"] = "입금거래 정보가 서명과 일치하지 않습니다."
+                    continue
+            except Exception as e:
+                result["error"] = str(e)
+                continue
+
+            verified[deposit_log.id] = deposit_log
+            verified_results.append(result)
+
+        confirmed = confirm_deposits(verified.values()) if verified else {}
+
+        for result in verified_results:
+            confirm_result = confirmed[result["transfer_identifier"]]
+            if isinstance(confirm_result, Exception):
+                result["error"] = str(confirm_result)
+            else:
+                result["status"] = True
+
+        return Response(data=results, status=status.HTTP_200_OK)
@@ -0,0 +1,132 @@
+"""
+DB 커넥션 설정 / alias 라우팅
+- default : primary (API 조회 / 입금 확인)
+- jobs : 야간 CSV 업로드 전용 커넥션 (같은 primary, 접속 계정 / 커넥션 수를 따로 관리)
+- replica : 읽기 전용 replica (화면 GET 조회만)
+- use_database 로 감싼 코드만 jobs / replica 로 보내고, 설정에 없는 alias 는 default 사용
+"""
+import os
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.db import DEFAULT_DB_ALIAS, connections
+
+JOBS_DATABASE = "jobs"
+REPLICA_DATABASE = "replica"
+
+# DB_{alias}_* 환경변수로 바꿀 수 있는 접속 설정
+CONNECTION_FIELDS = ("NAME", "USER", "PASSWORD", "HOST", "PORT")
+
+# 커넥션 유지 시간 기본값 (초)
+DEFAULT_CONN_MAX_AGE = 60
+
+_database = ContextVar("database", default=None)
+
+
+def _overrides(environ, prefix):
+    return {
+        field: environ[f"{prefix}_{field}"]
+        for field in CONNECTION_FIELDS
+        if environ.get(f"{prefix}_{field}")
+    }
+
+
+def database_settings(default, environ=None, separate_jobs=True):
+    """
+    DATABASES 설정 생성
+    - 요청이 끝나도 커넥션을 DB_CONN_MAX_AGE 초 동안 유지 (0 이면 요청마다 새로 연결)
+    - 유지한 커넥션은 재사용 전 health check (DB_CONN_HEALTH_CHECKS)
+    - jobs : default 설정에 DB_JOBS_* 를 덮어씀, 하루 한번 실행이라 커넥션을 유지하지 않음
+    - replica : DB_REPLICA_HOST 또는 DB_REPLICA_NAME 이 있을 때만 추가
+    - jobs / replica 는 테스트에서 default 의 mirror
+    :param default: default alias 접속 설정
+    :param environ: 기본값 os.environ
+    :param separate_jobs: jobs alias 추가 여부
+    :return:
+    """
+    environ = os.environ if environ is None else environ
+    default = {
+        **default,
+        "CONN_MAX_AGE": int(environ.get("DB_CONN_MAX_AGE", DEFAULT_CONN_MAX_AGE)),
+        "CONN_HEALTH_CHECKS": (
+            environ.get("DB_CONN_HEALTH_CHECKS", "true").lower() == "true"
+        ),
+    }
+    databases = {DEFAULT_DB_ALIAS: default}
+
+    if separate_jobs:
+        databases[JOBS_DATABASE] = {
+            **default,
+            **_overrides(environ, "DB_JOBS"),
+            "CONN_MAX_AGE": 0,
+            "TEST": {"MIRROR": DEFAULT_DB_ALIAS},
+        }
+
+    replica = _overrides(environ, "DB_REPLICA")
+    if "HOST" in replica or "NAME" in replica:
+        databases[REPLICA_DATABASE] = {
+            **default,
+            **replica,
+            "TEST": {"MIRROR": DEFAULT_DB_ALIAS},
+        }
+
+    return databases
+
+
+@contextmanager
+def use_database(alias):
+    """
+    블록 안의 ORM 조회 / 저장을 alias 로 보냄 (DatabaseRouter)
+    - 데코레이터로도 사용 가능
+    - contextvar 라 새로 띄운 스레드에는 전달되지 않음 (스레드 안에서 다시 감싸야 함)
+    :param alias: JOBS_DATABASE / REPLICA_DATABASE
+    :return:
+    """
+    token = _database.set(alias)
+    try:
+        yield
+    finally:
+        _database.reset(token)
+
+
+class DatabaseRouter:
+    """
+    use_database 로 지정한 alias 로 라우팅
+    - 지정하지 않았거나 설정에 없는 alias 면 default
+    - replica 는 조회만, 저장은 default
+    - 모든 alias 가 같은 데이터라 관계는 항상 허용하고, migrate 는 default 에만
+    """
+
+    def __init__(self, databases=None):
+        self._databases = databases
+
+    @property
+    def databases(self):
+        return connections.settings if self._databases is None else self._databases
+
+    def _alias(self):
+        alias = _database.get()
+        return alias if alias in self.databases else None
+
+    def db_for_read(self, model, **hints):
+        return self._alias()
+
+    def db_for_write(self, model, **hints):
+        alias = self._alias()
+        return None if alias == REPLICA_DATABASE else alias
+
+    def allow_relation(self, obj1, obj2, **hints):
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        if db in (JOBS_DATABASE, REPLICA_DATABASE):
+            return False
+        return None
+
+
+def write_database():
+    """
+    현재 블록에서 저장에 쓰는 alias - transaction.atomic(using=...) / 커넥션 지정용
+    :return:
+    """
+    return DatabaseRouter().db_for_write(None) or DEFAULT_DB_ALIAS
@@ -0,0 +1,75 @@
+import os
+import sys
+
+# 웹 요청을 처리하는 서버 프로그램
+WEB_SERVER_PROGRAMS = {"gunicorn", "uwsgi", "daphne", "uvicorn", "hypercorn"}
+
+# 스케쥴러 시작 여부를 강제하는 환경변수 (1 / true : 시작, 0 / false : 시작 안함)
+RUN_SCHEDULER_ENV = "RUN_SCHEDULER"
+
+
+def _program_name(argv, orig_argv):
+    """
+    실행한 프로그램 이름
+    - python -m gunicorn 처럼 모듈로 실행하면 argv[0] 이 .../gunicorn/__main__.py
+    - 모듈을 찾는 중에는 argv[0] 이 "-m" 이므로 원래 명령행에서 모듈 이름 확인
+    :param argv:
+    :param orig_argv: python 실행 명령행 (sys.orig_argv)
+    :return:
+    """
+    if argv[0] == "-m":
+        if "-m" not in orig_argv[:-1]:
+            return ""
+        return orig_argv[orig_argv.index("-m") + 1].split(".")[0]
+
+    program = os.path.basename(argv[0])
+    if program == "__main__.py":
+        return os.path.basename(os.path.dirname(argv[0]))
+
+    return program
+
+
+def is_web_process(argv=None, environ=None, orig_argv=None):
+    """
+    웹 요청을 처리하는 프로세스인지 여부
+    - 웹 서버 프로그램 (python -m 으로 실행한 경우 포함)
+    - runserver 는 autoreload 감시 프로세스를 제외한 실제 서버 프로세스만
+    - 그 외 manage.py 명령 / 테스트 / 쉘은 웹 프로세스가 아님
+    :param argv: 기본값 sys.argv
+    :param environ: 기본값 os.environ
+    :param orig_argv: 기본값 sys.orig_argv
+    :return:
+    """
+    argv = sys.argv if argv is None else argv
+    environ = os.environ if environ is None else environ
+    orig_argv = getattr(sys, "orig_argv", []) if orig_argv is None else orig_argv
+    if not argv:
+        return False
+
+    if _program_name(argv, orig_argv) in WEB_SERVER_PROGRAMS:
+        return True
+
+    if len(argv) > 1 and argv[1] == "runserver":
+        return "--noreload" in argv or environ.get("RUN_MAIN") == "true"
+
+    return False
+
+
+def should_start_scheduler(argv=None, environ=None, orig_argv=None):
+    """
+    스케쥴러를 시작할 프로세스인지 여부
+    - RUN_SCHEDULER 환경변수가 있으면 그 값을 따름 (웹 서버를 직접 띄우는 런처 등)
+    - 없으면 웹 프로세스만
+    :param argv: 기본값 sys.argv
+    :param environ: 기본값 os.environ
+    :param orig_argv: 기본값 sys.orig_argv
+    :return:
+    """
+    environ = os.environ if environ is None else environ
+    value = environ.get(RUN_SCHEDULER_ENV, "").lower()
+    if value in ("1", "true"):
+        return True
+    if value in ("0", "false"):
+        return False
+
+    return is_web_process(argv, environ, orig_argv)
@@ -14,10 +14,14 @@ from pathlib import Path
 
 from dotenv import load_dotenv
 
-load_dotenv(verbose=True)
+from backend.databases import database_settings
+
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve(strict=True).parent.parent
 
+# .env 는 manage.py 옆 - 경로를 지정해서 호출 스택 / 상위 디렉토리 탐색을 하지 않음
+load_dotenv(BASE_DIR.parent / ".env")
+
 
 # Quick-start development settings - unsuitable for production
 # See https://docs.djangoproject.com/en/3.1/howto/deployment/checklist/
@@ -47,9 +51,10 @@ DJANGO_APPS = [
     "django.contrib.staticfiles",
 ]
 
+# 스케쥴러는 메모리 job store 를 사용하므로 django_apscheduler 앱은 등록하지 않음
+# (앱 모델이 apscheduler / pkg_resources 를 import 해서 모든 프로세스의 시작이 느려짐)
 THIRD_PARTY_APPS = [
     "rest_framework",
-    "django_apscheduler",
 ]
 
 INSTALLED_APPS = LOCAL_APPS + DJANGO_APPS + THIRD_PARTY_APPS
@@ -88,12 +93,20 @@ WSGI_APPLICATION = "backend.wsgi.application"
 # Database
 # https://docs.djangoproject.com/en/3.1/ref/settings/#databases
 
-DATABASES = {
-    "default": {
+# 로컬 sqlite 는 jobs alias 없이 default 하나로 실행 (DB_REPLICA_NAME 으로 replica 파일 지정 가능)
+DATABASES = database_settings(
+    {
         "ENGINE": "django.db.backends.sqlite3",
         "NAME": BASE_DIR / "db.sqlite3",
-    }
-}
+    },
+    separate_jobs=False,
+)
+
+# use_database 로 감싼 야간 업로드는 jobs, 화면 조회는 replica 로 (설정에 없으면 default)
+DATABASE_ROUTERS = ["backend.databases.DatabaseRouter"]
+
+# 야간 업로드가 동시에 여는 최대 DB 커넥션 수 - 파이프라인 스레드 수를 이 값에 맞춤
+JOBS_DATABASE_POOL_SIZE = int(os.environ.get("DB_JOBS_POOL_SIZE", 4))
 
 
 # Password validation
@@ -134,8 +147,75 @@ USE_TZ = True
 
 STATIC_URL = "/static/"
 
-# 스케쥴러 자동 시작
-SCHEDULER_DEFAULT = True
+# Cache
+# REDIS_URL 이 있으면 redis, 없으면 (로컬/테스트) local-memory 캐시 사용
+# - local-memory 는 프로세스마다 따로라 다른 프로세스 (야간 업로드 / 입금 확인) 의 캐시 삭제가
+#   전달되지 않으므로 화면 캐시는 짧게만 유지
+
+REDIS_URL = os.environ.get("REDIS_URL")
+
+if REDIS_URL:
+    CACHES = {
+        "default": {
+            "BACKEND": "django_redis.cache.RedisCache",
+            "LOCATION": REDIS_URL,
+            "OPTIONS": {"CLIENT_CLASS": "django_redis.client.DefaultClient"},
+        }
+    }
+else:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        }
+    }
+
+# 화면 API 캐시 유지 시간 (초) - 데이터는 CSV 업로드 / 입금 확인 시 삭제
+# - 공유 캐시 (redis) 가 없으면 캐시 삭제가 다른 프로세스에 전달되지 않으므로 짧게
+SCREEN_CACHE_TIMEOUT = 60 * 60 * 24 if REDIS_URL else 5
+
+# replica 에서 만든 화면 API 캐시 유지 시간 (초)
+# - replica 지연 중에 만들면 캐시 삭제 전 값이 남을 수 있으므로 replica 지연 정도로만 유지
+SCREEN_REPLICA_CACHE_TIMEOUT = 5
+
+# 확인이 끝난 입금거래 기록 유지 시간 (초) - 서명 만료 기간과 같음
+DEPOSIT_CONFIRMED_CACHE_TIMEOUT = 60 * 60 * 24 * 3
+
+# 입금 확인 micro-batch 대기 시간 (초) - 0 이면 요청마다 바로 반영
+DEPOSIT_CONFIRM_BATCH_WINDOW = float(os.environ.get("DEPOSIT_CONFIRM_BATCH_WINDOW", 0))
+
+# 입금 확인 micro-batch 결과 대기 최대 시간 (초)
+DEPOSIT_CONFIRM_BATCH_TIMEOUT = 10
+
+# 입금 확인 비동기 모드 - PUT 은 서명 검증 후 대기열에 넣고 202 응답, worker pool 이 처리
+DEPOSIT_CONFIRM_ASYNC = os.environ.get("DEPOSIT_CONFIRM_ASYNC", "").lower() == "true"
+
+# 입금 확인 대기열 backend - redis 가 없으면 DB 테이블 사용
+DEPOSIT_QUEUE_BACKEND = os.environ.get(
+    "DEPOSIT_QUEUE_BACKEND",
+    "api.deposit_queue.RedisDepositQueue"
+    if REDIS_URL
+    else "api.deposit_queue.DatabaseDepositQueue",
+)
+
+# DB 대기열에서 꺼낸 후 처리 완료가 없으면 다시 꺼낼 수 있게 되는 시간 (초)
+# - worker 가 처리 중에 죽어도 항목이 사라지지 않도록, micro-batch 대기 시간보다 길게
+DEPOSIT_QUEUE_VISIBILITY_TIMEOUT = 60
+
+# 입금 확인 worker 스레드 수
+DEPOSIT_QUEUE_WORKERS = int(os.environ.get("DEPOSIT_QUEUE_WORKERS", 2))
+
+# 화면 API (투자 / 투자상세 / 보유종목) async 버전 사용 - ASGI 로 배포할 때
+SCREEN_API_ASYNC = os.environ.get("SCREEN_API_ASYNC", "").lower() == "true"
+
+# 스케쥴러 자동 시작 (웹 프로세스에서만 시작)
+SCHEDULER_DEFAULT = os.environ.get("SCHEDULER_DEFAULT", "true").lower() == "true"
+
+# 스케쥴러 작업 lease 유지 시간 (초) - 실행이 끝난 후에도 이 시간 동안 다른 프로세스는 건너뜀
+SCHEDULER_LEASE_TTL = 60 * 10
+
+# CSV 업로더 입력 파일 형식 {"asset_group" | "asset_info" | "asset_basic": "csv" | "gzip" | "columnar"}
+# 지정하지 않은 파일은 내용으로 판별
+CSV_UPLOADER_INPUT_FORMATS = {}
 
 # End Slash = False
 APPEND_SLASH = False
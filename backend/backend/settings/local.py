@@ -1,7 +1,8 @@
 from .base import *
 
-DATABASES = {
-    "default": {
+# default + 야간 업로드 전용 jobs (+ DB_REPLICA_HOST 가 있으면 replica)
+DATABASES = database_settings(
+    {
         "ENGINE": "django.db.backends.mysql",
         "NAME": os.environ.get("DB_NAME"),
         "USER": os.environ.get("DB_USER"),
@@ -9,6 +10,6 @@ DATABASES = {
         "HOST": os.environ.get("DB_HOST"),
         "PORT": os.environ.get("DB_PORT"),
     }
-}
+)
 
 DEBUG = True
@@ -0,0 +1,74 @@
+"""
+성능 측정 스크립트 모음
+- backend 디렉토리에서 python -m benchmarks.<모듈명> 으로 실행
+- DJANGO_SETTINGS_MODULE 의 DB 설정으로 측정용 테스트 DB 를 만들고 끝나면 삭제
+"""
+import os
+import statistics
+import tempfile
+from contextlib import contextmanager
+
+
+def setup_django():
+    """
+    Django 설정 로드
+    :return:
+    """
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "backend.settings.local")
+
+    import django
+
+    django.setup()
+
+
+@contextmanager
+def benchmark_database():
+    """
+    측정용 테스트 DB 생성 / 삭제
+    - SQLite 는 여러 스레드에서 동시에 쓸 수 있도록 메모리 DB 대신 임시 파일 사용
+    :return:
+    """
+    from django.db import connection
+
+    test_settings = connection.settings_dict.setdefault("TEST", {})
+    if connection.vendor == "sqlite" and not test_settings.get("NAME"):
+        test_settings["NAME"] = os.path.join(tempfile.mkdtemp(), "benchmark.sqlite3")
+
+    old_name = connection.settings_dict["NAME"]
+    connection.creation.create_test_db(verbosity=0, autoclobber=True)
+    try:
+        yield
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+
+
+def percentile(values, pct):
+    """
+    백분위수 (nearest-rank)
+    :param values:
+    :param pct: 0 ~ 100
+    :return:
+    """
+    ordered = sorted(values)
+    if not ordered:
+        return 0.0
+
+    rank = max(int(round(pct / 100 * len(ordered) + 0.5)) - 1, 0)
+    return ordered[min(rank, len(ordered) - 1)]
+
+
+def latency_summary(latencies):
+    """
+    latency 목록 요약 (밀리초)
+    :param latencies: 초 단위 latency 목록
+    :return: dict
+    """
+    latencies_ms = [latency * 1000 for latency in latencies]
+    return {
+        "count": len(latencies_ms),
+        "mean_ms": round(statistics.fmean(latencies_ms), 3) if latencies_ms else 0.0,
+        "p50_ms": round(percentile(latencies_ms, 50), 3),
+        "p95_ms": round(percentile(latencies_ms, 95), 3),
+        "p99_ms": round(percentile(latencies_ms, 99), 3),
+        "max_ms": round(max(latencies_ms, default=0.0), 3),
+    }
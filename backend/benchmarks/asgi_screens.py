@@ -0,0 +1,297 @@
+"""
+화면 API sync / async 구현 동시 요청 처리량 비교 (ASGI)
+- 같은 프로세스에서 ASGI application 에 요청을 동시에 concurrency 개씩 보냄
+- sync : DRF APIView (ASGI 에서는 요청마다 스레드에서 실행)
+- async : async 뷰 + async ORM
+- --db-delay-ms 로 쿼리마다 지연을 넣어 느린 DB 를 흉내냄
+- 캐시는 끄고 (DummyCache) 매 요청 DB 를 조회
+
+python -m benchmarks.asgi_screens --users 1000 --requests 2000 --concurrency 200 --db-delay-ms 5
+"""
+import argparse
+import asyncio
+import json
+import random
+import threading
+import time
+
+from django.urls import path
+
+from benchmarks import benchmark_database, latency_summary, setup_django
+
+
+def _urlpatterns():
+    from api import views
+
+    return [
+        path("sync/investments/<int:pk>", views.InvestmentView.as_view()),
+        path("sync/investments/detail/<int:pk>", views.InvestmentDetailView.as_view()),
+        path("sync/users/<int:pk>/holdings", views.UserHoldingView.as_view()),
+        path("async/investments/<int:pk>", views.AsyncInvestmentView.as_view()),
+        path(
+            "async/investments/detail/<int:pk>",
+            views.AsyncInvestmentDetailView.as_view(),
+        ),
+        path("async/users/<int:pk>/holdings", views.AsyncUserHoldingView.as_view()),
+    ]
+
+
+class _LazyUrlpatterns:
+    """ROOT_URLCONF 로 이 모듈을 쓸 때 Django 설정 후 뷰를 import"""
+
+    patterns = None
+
+    def __iter__(self):
+        if self.patterns is None:
+            self.patterns = _urlpatterns()
+        return iter(self.patterns)
+
+
+urlpatterns = _LazyUrlpatterns()
+
+SCREENS = {
+    "investment": "investments/{user_id}",
+    "investment_detail": "investments/detail/{investment_id}",
+    "user_holdings": "users/{user_id}/holdings",
+}
+
+
+def seed(users, holdings_per_user, batch_size=5000):
+    """
+    측정용 계좌 / 유저 / 투자 / 보유종목 생성
+    :param users: 유저 수
+    :param holdings_per_user: 유저당 보유종목 수
+    :param batch_size:
+    :return: [(유저 id, 투자 id)]
+    """
+    from api.models import Account, Holding, Investment, User, UserHolding
+
+    Account.objects.bulk_create(
+        [
+            Account(
+                account_number=f"{idx:013d}",
+                account_name=f"계좌{idx}",
+                total_assets=random.randint(0, 10**8),
+            )
+            for idx in range(users)
+        ],
+        batch_size=batch_size,
+    )
+    User.objects.bulk_create(
+        [
+            User(account_id=account_id, user_name=f"유저{account_id}")
+            for account_id in Account.objects.values_list("id", flat=True)
+        ],
+        batch_size=batch_size,
+    )
+    user_ids = list(User.objects.values_list("id", flat=True))
+    Investment.objects.bulk_create(
+        [
+            Investment(user_id=user_id, brokerage="증권사", principal=10**7)
+            for user_id in user_ids
+        ],
+        batch_size=batch_size,
+    )
+    holdings = Holding.objects.bulk_create(
+        [
+            Holding(name=f"종목{idx}", isin=f"KR{idx:010d}", asset_group="주식")
+            for idx in range(max(holdings_per_user * 5, 1))
+        ]
+    )
+    UserHolding.objects.bulk_create(
+        [
+            UserHolding(
+                user_id=user_id,
+                holding=holding,
+                quantity=random.randint(1, 1000),
+                current_price=random.randint(100, 10**6),
+            )
+            for user_id in user_ids
+            for holding in random.sample(holdings, holdings_per_user)
+        ],
+        batch_size=batch_size,
+    )
+
+    return list(Investment.objects.values_list("user_id", "id"))
+
+
+def install_db_delay(delay):
+    """
+    쿼리마다 delay 초 지연 (이후 생성되는 모든 스레드의 DB 커넥션 포함)
+    :param delay:
+    :return:
+    """
+    from django.db import connections
+    from django.db.backends.signals import connection_created
+
+    def slow_execute(execute, sql, params, many, context):
+        time.sleep(delay)
+        return execute(sql, params, many, context)
+
+    def add_wrapper(sender, connection, **kwargs):
+        connection.execute_wrappers.append(slow_execute)
+
+    connection_created.connect(add_wrapper, weak=False)
+    for connection in connections.all():
+        connection.execute_wrappers.append(slow_execute)
+
+
+async def asgi_get(application, path):
+    """
+    ASGI application 에 GET 요청
+    :param application:
+    :param path:
+    :return: 응답 status
+    """
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "query_string": b"",
+        "root_path": "",
+        "headers": [(b"host", b"testserver")],
+        "client": ("127.0.0.1", 0),
+        "server": ("testserver", 80),
+    }
+    request_sent = False
+    response_status = None
+
+    async def receive():
+        nonlocal request_sent
+        if not request_sent:
+            request_sent = True
+            return {"type": "http.request", "body": b"", "more_body": False}
+        await asyncio.Event().wait()
+
+    async def send(message):
+        nonlocal response_status
+        if message["type"] == "http.response.start":
+            response_status = message["status"]
+
+    await application(scope, receive, send)
+    return response_status
+
+
+async def load_test(application, paths, concurrency):
+    """
+    paths 를 concurrency 개씩 동시에 요청
+    :param application:
+    :param paths: 요청 경로 목록
+    :param concurrency: 동시 요청 수
+    :return: dict
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies, statuses = [], {}
+    peak_threads = threading.active_count()
+    done = asyncio.Event()
+
+    async def sample_threads():
+        nonlocal peak_threads
+        while not done.is_set():
+            peak_threads = max(peak_threads, threading.active_count())
+            await asyncio.sleep(0.005)
+
+    async def request(path):
+        async with semaphore:
+            started = time.perf_counter()
+            response_status = await asgi_get(application, path)
+            latencies.append(time.perf_counter() - started)
+            statuses[response_status] = statuses.get(response_status, 0) + 1
+
+    sampler = asyncio.create_task(sample_threads())
+    started = time.perf_counter()
+    await asyncio.gather(*(request(path) for path in paths))
+    elapsed = time.perf_counter() - started
+    done.set()
+    await sampler
+
+    return {
+        "requests_per_sec": round(len(paths) / elapsed, 1),
+        "statuses": statuses,
+        "peak_threads": peak_threads,
+        **latency_summary(latencies),
+    }
+
+
+def run(users, holdings_per_user, requests, concurrency, db_delay_ms):
+    """
+    화면별 sync / async 처리량 비교
+    :param users:
+    :param holdings_per_user:
+    :param requests: 화면 / 구현별 요청 수
+    :param concurrency: 동시 요청 수
+    :param db_delay_ms: 쿼리당 지연 (밀리초)
+    :return: dict
+    """
+    from django.core.asgi import get_asgi_application
+
+    ids = seed(users, holdings_per_user)
+    if db_delay_ms:
+        install_db_delay(db_delay_ms / 1000)
+
+    application = get_asgi_application()
+    result = {
+        "users": users,
+        "holdings_per_user": holdings_per_user,
+        "requests": requests,
+        "concurrency": concurrency,
+        "db_delay_ms": db_delay_ms,
+        "screens": {},
+    }
+
+    for screen, template in SCREENS.items():
+        sample = [random.choice(ids) for _ in range(requests)]
+        result["screens"][screen] = {
+            variant: asyncio.run(
+                load_test(
+                    application,
+                    [
+                        f"/{variant}/"
+                        + template.format(user_id=user_id, investment_id=investment_id)
+                        for user_id, investment_id in sample
+                    ],
+                    concurrency,
+                )
+            )
+            for variant in ("sync", "async")
+        }
+
+    return result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--users", type=int, default=1000)
+    parser.add_argument("--holdings-per-user", type=int, default=10)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=200)
+    parser.add_argument("--db-delay-ms", type=float, default=5)
+    args = parser.parse_args(argv)
+
+    setup_django()
+
+    from django.test.utils import override_settings
+
+    with override_settings(
+        ROOT_URLCONF=__name__,
+        CACHES={"default": {"BACKEND": "django.core.cache.backends.dummy.DummyCache"}},
+        DEBUG=False,
+    ), benchmark_database():
+        result = run(
+            args.users,
+            args.holdings_per_user,
+            args.requests,
+            args.concurrency,
+            args.db_delay_ms,
+        )
+
+    print(json.dumps(result, indent=2, ensure_ascii=False))
+    return result
+
+
+if __name__ == "__main__":
+    main()
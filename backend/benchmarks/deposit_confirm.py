@@ -0,0 +1,107 @@
+"""
+입금 확인 동시성 측정
+- 한 계좌에 여러 스레드가 동시에 입금 확인을 요청할 때의 latency 분포
+- 바로 반영 (confirm_deposit) / micro-batch (DepositConfirmBatcher) 비교
+
+python -m benchmarks.deposit_confirm --threads 16 --deposits 50 --window 0.005
+"""
+import argparse
+import json
+import threading
+import time
+
+from benchmarks import benchmark_database, latency_summary, setup_django
+
+
+def run(mode, threads, deposits, window):
+    """
+    mode 별로 threads 개 스레드가 각각 deposits 건의 입금 확인
+    :param mode: direct / batch
+    :param threads:
+    :param deposits: 스레드당 입금 건수
+    :param window: micro-batch 대기 시간 (초)
+    :return: latency 요약 dict
+    """
+    from django.db import connections
+
+    from api.deposits import DepositConfirmBatcher, confirm_deposit
+    from api.models import Account, DepositLog, User
+
+    account = Account.objects.create(
+        account_number=f"bench-{mode}", account_name="측정계좌", total_assets=0
+    )
+    User.objects.create(account=account, user_name="측정")
+    DepositLog.objects.bulk_create(
+        [
+            DepositLog(
+                user_name="측정",
+                account_number=account.account_number,
+                transfer_amount=1,
+                exp="2099-01-01T00:00:00Z",
+                signature="-",
+            )
+            for _ in range(threads * deposits)
+        ]
+    )
+    deposit_logs = list(
+        DepositLog.objects.filter(account_number=account.account_number)
+    )
+
+    batcher = DepositConfirmBatcher(window) if mode == "batch" else None
+    latencies, lock = [], threading.Lock()
+    start = threading.Barrier(threads)
+
+    def worker(worker_idx):
+        start.wait()
+        own_latencies = []
+        for deposit_log in deposit_logs[worker_idx::threads]:
+            started = time.perf_counter()
+            if batcher is None:
+                confirm_deposit(deposit_log)
+            else:
+                batcher.submit(deposit_log).result(timeout=60)
+            own_latencies.append(time.perf_counter() - started)
+
+        connections.close_all()
+        with lock:
+            latencies.extend(own_latencies)
+
+    started = time.perf_counter()
+    workers = [threading.Thread(target=worker, args=(idx,)) for idx in range(threads)]
+    for thread in workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    account.refresh_from_db()
+    assert account.total_assets == len(deposit_logs), "입금 금액이 맞지 않습니다."
+
+    return {
+        "mode": mode,
+        "threads": threads,
+        "throughput_per_sec": round(len(deposit_logs) / elapsed, 1),
+        **latency_summary(latencies),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--threads", type=int, default=16)
+    parser.add_argument("--deposits", type=int, default=50)
+    parser.add_argument("--window", type=float, default=0.005)
+    args = parser.parse_args(argv)
+
+    setup_django()
+    with benchmark_database():
+        results = [
+            run(mode, args.threads, args.deposits, args.window)
+            for mode in ("direct", "batch")
+        ]
+
+    print(json.dumps(results, indent=2))
+    return results
+
+
+if __name__ == "__main__":
+    main()
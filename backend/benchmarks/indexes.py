@@ -0,0 +1,216 @@
+"""
+조회 경로별 인덱스 효과 측정
+- 유저 N명 x 종목 M개 보유 데이터를 만든 후 api 앱 마이그레이션을
+  인덱스 추가 전 (0003_deposit_queue) / 후 (최신) 로 바꿔가며 쿼리 실행계획과 latency 비교
+
+python -m benchmarks.indexes --users 2000 --holdings 50 --repeat 200
+"""
+import argparse
+import json
+import random
+import time
+
+from benchmarks import benchmark_database, latency_summary, setup_django
+
+ASSET_GROUPS = ("국내주식", "해외주식", "채권", "원자재", "현금")
+
+# 인덱스 추가 전 마이그레이션
+BEFORE_MIGRATION = ("api", "0003_deposit_queue")
+
+
+def seed(users, holdings, batch_size=5000):
+    """
+    측정용 데이터 생성
+    :param users: 유저(계좌) 수
+    :param holdings: 종목 수 (유저마다 모든 종목 보유)
+    :param batch_size:
+    :return:
+    """
+    from api.models import Account, DepositLog, Holding, Investment, User, UserHolding
+
+    Holding.objects.bulk_create(
+        [
+            Holding(
+                name=f"종목{idx}",
+                isin=f"KR{idx:010d}",
+                asset_group=ASSET_GROUPS[idx % len(ASSET_GROUPS)],
+            )
+            for idx in range(holdings)
+        ],
+        batch_size=batch_size,
+    )
+    Account.objects.bulk_create(
+        [
+            Account(account_number=f"{idx:013d}", account_name=f"계좌{idx}")
+            for idx in range(users)
+        ],
+        batch_size=batch_size,
+    )
+    accounts = Account.objects.in_bulk(field_name="account_number")
+    User.objects.bulk_create(
+        [
+            User(account=account, user_name=f"유저{idx}")
+            for idx, account in enumerate(accounts.values())
+        ],
+        batch_size=batch_size,
+    )
+
+    user_ids = list(User.objects.values_list("id", flat=True))
+    holding_ids = list(Holding.objects.values_list("id", flat=True))
+    Investment.objects.bulk_create(
+        [Investment(user_id=user_id, brokerage="증권사") for user_id in user_ids],
+        batch_size=batch_size,
+    )
+
+    # 유저 * 종목 수 만큼 만들어지므로 유저 단위로 나눠서 저장
+    users_per_batch = max(batch_size // max(holdings, 1), 1)
+    for start in range(0, len(user_ids), users_per_batch):
+        UserHolding.objects.bulk_create(
+            [
+                UserHolding(
+                    user_id=user_id,
+                    holding_id=holding_id,
+                    quantity=random.randint(1, 100),
+                    current_price=random.randint(1000, 100000),
+                )
+                for user_id in user_ids[start : start + users_per_batch]
+                for holding_id in holding_ids
+            ]
+        )
+
+    DepositLog.objects.bulk_create(
+        [
+            DepositLog(
+                user_name="측정",
+                account_number=account_number,
+                transfer_amount=1,
+                exp="2099-01-01T00:00:00Z",
+                signature="-",
+                status=bool(idx % 2),
+            )
+            for account_number in accounts
+            for idx in range(4)
+        ],
+        batch_size=batch_size,
+    )
+
+    return user_ids, holding_ids, list(accounts)
+
+
+def hot_queries(user_ids, holding_ids, account_numbers):
+    """
+    측정할 조회 경로
+    - 매 실행마다 다른 값으로 조회하도록 값을 고르는 함수 반환
+    :return: {이름: 값을 받아 queryset 을 만드는 함수, 값 선택 함수}
+    """
+    from django.db.models import F, Sum
+
+    from api.models import DepositLog, Holding, UserHolding
+
+    return {
+        "user_holding_by_user_and_holding": (
+            lambda value: UserHolding.objects.filter(
+                user_id=value[0], holding_id=value[1]
+            ),
+            lambda: (random.choice(user_ids), random.choice(holding_ids)),
+        ),
+        "pending_deposits_by_account": (
+            lambda value: DepositLog.objects.filter(account_number=value, status=False),
+            lambda: random.choice(account_numbers),
+        ),
+        "holdings_by_asset_group": (
+            lambda value: Holding.objects.filter(asset_group=value),
+            lambda: random.choice(ASSET_GROUPS),
+        ),
+        "asset_group_breakdown_by_user": (
+            lambda value: UserHolding.objects.filter(user_id=value)
+            .values("holding__asset_group")
+            .annotate(total=Sum(F("current_price") * F("quantity"))),
+            lambda: random.choice(user_ids),
+        ),
+    }
+
+
+def measure(queries, repeat):
+    """
+    쿼리별 실행계획 / latency
+    :param queries: hot_queries 결과
+    :param repeat: 쿼리별 반복 횟수
+    :return: {이름: {"plan": 실행계획, latency 요약}}
+    """
+    results = {}
+    for name, (build, choose) in queries.items():
+        plan = build(choose()).explain()
+        latencies = []
+        for _ in range(repeat):
+            queryset = build(choose())
+            started = time.perf_counter()
+            list(queryset)
+            latencies.append(time.perf_counter() - started)
+
+        results[name] = {"plan": plan, **latency_summary(latencies)}
+
+    return results
+
+
+def migrate_api(target):
+    """
+    api 앱 마이그레이션을 target 으로 이동
+    :param target: (앱, 마이그레이션명)
+    :return:
+    """
+    from django.db import connection
+    from django.db.migrations.executor import MigrationExecutor
+
+    executor = MigrationExecutor(connection)
+    executor.migrate([target])
+
+
+def run(users, holdings, repeat):
+    """
+    인덱스 추가 전 / 후 측정
+    :param users:
+    :param holdings:
+    :param repeat:
+    :return: {"before": 측정값, "after": 측정값}
+    """
+    from django.db.migrations.loader import MigrationLoader
+    from django.db import connection
+
+    latest = max(
+        key for key in MigrationLoader(connection).graph.leaf_nodes() if key[0] == "api"
+    )
+    queries = hot_queries(*seed(users, holdings))
+
+    migrate_api(BEFORE_MIGRATION)
+    before = measure(queries, repeat)
+    migrate_api(latest)
+    after = measure(queries, repeat)
+
+    return {
+        "users": users,
+        "holdings": holdings,
+        "repeat": repeat,
+        "vendor": connection.vendor,
+        "before": before,
+        "after": after,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--users", type=int, default=2000)
+    parser.add_argument("--holdings", type=int, default=50)
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args(argv)
+
+    setup_django()
+    with benchmark_database():
+        result = run(args.users, args.holdings, args.repeat)
+
+    print(json.dumps(result, indent=2, ensure_ascii=False))
+    return result
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+"""
+입금거래 서명 발급 / 검증 처리량 측정
+- 알고리즘별로 요청마다 키를 넘기는 방식 (jwt.encode / jwt.decode) 과
+  키를 미리 준비한 DepositSigner 비교
+- RSA / EC 알고리즘은 cryptography 패키지가 설치되어 있을 때만 측정
+
+python -m benchmarks.jwt_signing --iterations 20000
+"""
+import argparse
+import json
+import time
+from datetime import datetime, timedelta
+
+from benchmarks import setup_django
+
+HMAC_ALGORITHMS = ("HS256", "HS384", "HS512")
+ASYMMETRIC_ALGORITHMS = ("RS256", "ES256")
+
+
+def _algorithm_keys():
+    """
+    측정할 알고리즘별 키 (PEM / 문자열)
+    :return: {알고리즘: 키}
+    """
+    import jwt.algorithms
+
+    keys = {algorithm: "benchmark-secret-key" for algorithm in HMAC_ALGORITHMS}
+    if not jwt.algorithms.has_crypto:
+        return keys
+
+    from cryptography.hazmat.primitives import serialization
+    from cryptography.hazmat.primitives.asymmetric import ec, rsa
+
+    def to_pem(private_key):
+        return private_key.private_bytes(
+            serialization.Encoding.PEM,
+            serialization.PrivateFormat.PKCS8,
+            serialization.NoEncryption(),
+        )
+
+    keys["RS256"] = to_pem(rsa.generate_private_key(65537, 2048))
+    keys["ES256"] = to_pem(ec.generate_private_key(ec.SECP256R1()))
+    return keys
+
+
+def _ops_per_sec(func, iterations):
+    started = time.perf_counter()
+    for _ in range(iterations):
+        func()
+    return round(iterations / (time.perf_counter() - started), 1)
+
+
+def run(algorithm, key, iterations):
+    """
+    알고리즘 하나의 서명 발급 / 검증 처리량
+    :param algorithm:
+    :param key: 개인키 PEM 또는 HMAC 비밀키
+    :param iterations: 측정 반복 횟수
+    :return: 처리량 dict
+    """
+    import jwt
+
+    from api.signing import DepositSigner
+
+    payload = {
+        "user_name": "측정",
+        "account_number": "1234567890",
+        "transfer_amount": 10000,
+        "exp": datetime.utcnow() + timedelta(days=3),
+    }
+    signer = DepositSigner(key, algorithm)
+    signature = signer.sign(payload)
+
+    # 요청마다 키를 넘기면 비대칭 알고리즘은 매번 PEM 을 다시 읽음
+    verifying_key = key
+    if not isinstance(signer.verifying_key, bytes):
+        from cryptography.hazmat.primitives import serialization
+
+        verifying_key = signer.verifying_key.public_bytes(
+            serialization.Encoding.PEM,
+            serialization.PublicFormat.SubjectPublicKeyInfo,
+        )
+
+    return {
+        "algorithm": algorithm,
+        "iterations": iterations,
+        "sign_per_sec": _ops_per_sec(
+            lambda: jwt.encode(payload, key, algorithm=algorithm), iterations
+        ),
+        "prepared_sign_per_sec": _ops_per_sec(lambda: signer.sign(payload), iterations),
+        "verify_per_sec": _ops_per_sec(
+            lambda: jwt.decode(signature, verifying_key, algorithms=[algorithm]),
+            iterations,
+        ),
+        "prepared_verify_per_sec": _ops_per_sec(
+            lambda: signer.decode(signature), iterations
+        ),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--iterations", type=int, default=20000)
+    args = parser.parse_args(argv)
+
+    setup_django()
+    results = [
+        run(algorithm, key, args.iterations)
+        for algorithm, key in _algorithm_keys().items()
+    ]
+
+    print(json.dumps(results, indent=2))
+    return results
+
+
+if __name__ == "__main__":
+    main()
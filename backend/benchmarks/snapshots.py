@@ -0,0 +1,136 @@
+"""
+계좌 총 자산 기간 조회 측정
+- 계좌 N개 x D일 스냅샷을 만든 후 임의 계좌 / 기간으로 AccountValueView 호출
+- 쿼리 실행계획과 latency 출력
+
+python -m benchmarks.snapshots --accounts 1000 --days 1095 --range-days 365
+"""
+import argparse
+import json
+import random
+import time
+from datetime import date, timedelta
+
+from benchmarks import benchmark_database, latency_summary, setup_django
+
+
+def seed(accounts, days, batch_size=10000):
+    """
+    측정용 계좌 / 유저 / 일자별 스냅샷 생성
+    :param accounts: 계좌 수
+    :param days: 스냅샷 일수
+    :param batch_size:
+    :return: (유저 id 목록, 마지막 기준일)
+    """
+    from api.models import Account, AccountValueSnapshot, User
+
+    Account.objects.bulk_create(
+        [
+            Account(account_number=f"{idx:013d}", account_name=f"계좌{idx}")
+            for idx in range(accounts)
+        ],
+        batch_size=batch_size,
+    )
+    account_ids = list(Account.objects.values_list("id", flat=True))
+    User.objects.bulk_create(
+        [
+            User(account_id=account_id, user_name=f"유저{idx}")
+            for idx, account_id in enumerate(account_ids)
+        ],
+        batch_size=batch_size,
+    )
+
+    last_date = date.today()
+    for day in range(days):
+        snapshot_date = last_date - timedelta(days=day)
+        AccountValueSnapshot.objects.bulk_create(
+            [
+                AccountValueSnapshot(
+                    snapshot_date=snapshot_date,
+                    account_id=account_id,
+                    total_assets=random.randint(0, 10**9),
+                )
+                for account_id in account_ids
+            ],
+            batch_size=batch_size,
+        )
+
+    return list(User.objects.values_list("id", flat=True)), last_date
+
+
+def run(accounts, days, range_days, repeat):
+    """
+    기간 조회 API latency
+    :param accounts:
+    :param days:
+    :param range_days: 조회 기간 (일)
+    :param repeat: 호출 횟수
+    :return: dict
+    """
+    from rest_framework.test import APIRequestFactory
+
+    from api.models import AccountValueSnapshot
+    from api.views import AccountValueView
+
+    user_ids, last_date = seed(accounts, days)
+    view = AccountValueView.as_view()
+    factory = APIRequestFactory()
+
+    def params():
+        date_to = last_date - timedelta(
+            days=random.randrange(max(days - range_days, 1))
+        )
+        return {
+            "from": str(date_to - timedelta(days=range_days)),
+            "to": str(date_to),
+        }
+
+    plan_params = params()
+    plan = (
+        AccountValueSnapshot.objects.filter(
+            account__user=user_ids[0],
+            snapshot_date__range=(plan_params["from"], plan_params["to"]),
+        )
+        .order_by("snapshot_date")
+        .values_list("snapshot_date", "total_assets")
+        .explain()
+    )
+
+    latencies, rows = [], 0
+    for _ in range(repeat):
+        user_id = random.choice(user_ids)
+        request = factory.get(f"/api/v1/users/{user_id}/account-values", params())
+        started = time.perf_counter()
+        response = view(request, pk=user_id)
+        latencies.append(time.perf_counter() - started)
+        rows += len(response.data)
+
+    return {
+        "accounts": accounts,
+        "days": days,
+        "snapshot_rows": accounts * days,
+        "range_days": range_days,
+        "mean_rows_per_response": round(rows / repeat, 1),
+        "plan": plan,
+        **latency_summary(latencies),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--accounts", type=int, default=1000)
+    parser.add_argument("--days", type=int, default=365 * 3)
+    parser.add_argument("--range-days", type=int, default=365)
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args(argv)
+
+    setup_django()
+    with benchmark_database():
+        result = run(args.accounts, args.days, args.range_days, args.repeat)
+
+    print(json.dumps(result, indent=2, ensure_ascii=False))
+    return result
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,534 @@
+"""
+전체 흐름 성능 측정
+- benchmarks.synthetic 으로 만든 데이터를 CSV 업로드 (처음 / 변경 없는 재업로드) 하며 단계별 측정
+- API 엔드포인트별 latency 분포 / 쿼리 수 (화면 API 는 캐시 없음 / 캐시 적중 따로)
+- 입금 확인 API 동시 요청 처리량 / latency
+- 결과는 JSON 파일로 저장하고, --baseline 으로 이전 커밋의 결과와 비교
+
+python -m benchmarks.suite --rows 100000 --output bench.json --baseline bench-main.json
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import shutil
+import subprocess
+import tempfile
+import threading
+import time
+
+from benchmarks import benchmark_database, latency_summary, setup_django
+from benchmarks.synthetic import (
+    DEFAULT_HOLDINGS_PER_ACCOUNT,
+    DEFAULT_STOCKS,
+    SyntheticDataset,
+    write_csvs,
+)
+from jobs.formats import FORMAT_COLUMNAR, FORMAT_CSV, FORMAT_GZIP
+
+# 결과 파일 형식 버전 - 항목 구조가 바뀌면 올림
+RESULT_VERSION = 1
+
+# 비교 시 값이 클수록 좋은 항목 (그 외 시간 / 쿼리 수는 작을수록 좋음)
+HIGHER_IS_BETTER_SUFFIXES = ("_per_sec",)
+COMPARED_SUFFIXES = ("_ms", "_per_sec", "elapsed", "query_count", "query_time")
+
+# 일괄 API 한번에 보내는 입금거래 수
+DEPOSIT_BULK_SIZE = 100
+
+
+def git_revision():
+    """
+    현재 커밋 / 변경 여부 - git 이 없으면 None
+    :return:
+    """
+    from django.conf import settings
+
+    def git(*args):
+        return subprocess.run(
+            ["git", *args],
+            cwd=settings.BASE_DIR,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+
+    try:
+        return {"commit": git("rev-parse", "HEAD"), "dirty": bool(git("status", "-s"))}
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _stage_metric(metric):
+    return {
+        key: round(value, 4) if isinstance(value, float) else value
+        for key, value in metric.items()
+        if key not in ("name", "peak_rss_growth_kb")
+    }
+
+
+def upload(paths, state_dir, workers):
+    """
+    CSV 업로드 파이프라인 실행 후 단계별 측정값 반환 (실행 이력도 저장)
+    :param paths: write_csvs 결과
+    :param state_dir:
+    :param workers: 동시에 실행할 단계 수
+    :return: dict
+    """
+    from jobs.metrics import StageMetricsCollector
+    from jobs.models import CsvUploadRun
+    from jobs.pipeline import run_stages
+    from jobs.upload_csv import build_csv_pipeline
+
+    stages = build_csv_pipeline(
+        paths["asset_group"],
+        paths["asset_info"],
+        paths["asset_basic"],
+        state_dir,
+        partition_count=max(workers, 1),
+    )
+    collector = StageMetricsCollector()
+    started = time.perf_counter()
+    run_stages(collector.instrument(stages), max_workers=workers)
+    collector.save(CsvUploadRun.objects.create())
+
+    return {
+        "elapsed": round(time.perf_counter() - started, 4),
+        "failed_rows": sum(
+            metric.get("failed_rows", 0) for metric in collector.metrics.values()
+        ),
+        "stages": {
+            name: _stage_metric(metric) for name, metric in collector.metrics.items()
+        },
+    }
+
+
+def measure_requests(client, requests, clear_cache=False):
+    """
+    요청을 순서대로 보내며 latency / 쿼리 수 측정
+    :param client: APIClient
+    :param requests: [(method, url, data)]
+    :param clear_cache: 요청마다 캐시 삭제 여부
+    :return: dict
+    """
+    from django.core.cache import cache
+    from django.db import connection
+    from django.test.utils import CaptureQueriesContext
+
+    latencies, query_counts, statuses = [], [], {}
+    for method, url, data in requests:
+        if clear_cache:
+            cache.clear()
+
+        with CaptureQueriesContext(connection) as queries:
+            started = time.perf_counter()
+            response = getattr(client, method)(url, data, format="json")
+            latencies.append(time.perf_counter() - started)
+
+        query_counts.append(len(queries))
+        statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+
+    return {
+        **latency_summary(latencies),
+        "query_count": round(sum(query_counts) / len(query_counts), 2)
+        if query_counts
+        else 0,
+        "max_query_count": max(query_counts, default=0),
+        "statuses": statuses,
+    }
+
+
+def register_deposits(client, accounts, count, rng):
+    """
+    일괄 등록 API 로 입금거래 등록
+    :param client:
+    :param accounts: [(유저명, 계좌번호)]
+    :param count: 등록할 입금거래 수
+    :param rng:
+    :return: [(입금거래 id, 서명, 계좌번호, 금액)]
+    """
+    from django.urls import reverse
+
+    from api.models import DepositLog
+
+    registered = []
+    for start in range(0, count, DEPOSIT_BULK_SIZE):
+        items = []
+        for _ in range(min(DEPOSIT_BULK_SIZE, count - start)):
+            user_name, account_number = rng.choice(accounts)
+            items.append(
+                {
+                    "user_name": user_name,
+                    "account_number": account_number,
+                    "transfer_amount": rng.randint(1, 1000) * 1000,
+                }
+            )
+        response = client.post(reverse("investment-deposit-bulk"), items, format="json")
+        registered.extend(
+            result["transfer_identifier"]
+            for result in response.json()
+            if result["transfer_identifier"]
+        )
+
+    return list(
+        DepositLog.objects.filter(id__in=registered)
+        .order_by("id")
+        .values_list("id", "signature", "account_number", "transfer_amount")
+    )
+
+
+def endpoints(requests_per_endpoint, rng):
+    """
+    API 엔드포인트별 측정
+    - 화면 API : 캐시 없음 (cold) / 캐시 적중 (warm)
+    - 입금 등록 / 일괄 등록 / 상태 조회, 업로드 실행 이력
+    :param requests_per_endpoint: 엔드포인트별 요청 수
+    :param rng:
+    :return: dict
+    """
+    from django.urls import reverse
+    from rest_framework.test import APIClient
+
+    from api.models import Investment
+    from jobs.models import CsvUploadRun
+
+    client = APIClient(raise_request_exception=False)
+    investments = list(
+        Investment.objects.values_list(
+            "id", "user_id", "user__user_name", "user__account__account_number"
+        )
+    )
+    sample = [rng.choice(investments) for _ in range(requests_per_endpoint)]
+    accounts = [(user_name, number) for _, _, user_name, number in investments]
+
+    screens = {
+        "investment": [
+            ("get", reverse("investment", args=[user_id]), None)
+            for _, user_id, _, _ in sample
+        ],
+        "investment_detail": [
+            ("get", reverse("investment-detail", args=[investment_id]), None)
+            for investment_id, _, _, _ in sample
+        ],
+        "user_holdings": [
+            ("get", reverse("user-holdings", args=[user_id]), None)
+            for _, user_id, _, _ in sample
+        ],
+    }
+    result = {}
+    for name, requests in screens.items():
+        result[name] = {
+            "cold": measure_requests(client, requests, clear_cache=True),
+            "warm": measure_requests(client, requests),
+        }
+
+    result["investment_batch"] = measure_requests(
+        client,
+        [
+            (
+                "get",
+                reverse("investment-batch"),
+                {
+                    "ids": ",".join(
+                        str(user_id)
+                        for _, user_id, _, _ in rng.sample(
+                            investments, min(20, len(investments))
+                        )
+                    )
+                },
+            )
+            for _ in range(requests_per_endpoint)
+        ],
+    )
+    result["account_values"] = measure_requests(
+        client,
+        [
+            ("get", reverse("account-values", args=[user_id]), None)
+            for _, user_id, _, _ in sample
+        ],
+    )
+    result["deposit_register"] = measure_requests(
+        client,
+        [
+            (
+                "post",
+                reverse("investment-deposit"),
+                {
+                    "user_name": user_name,
+                    "account_number": account_number,
+                    "transfer_amount": 1000,
+                },
+            )
+            for user_name, account_number in (
+                rng.choice(accounts) for _ in range(requests_per_endpoint)
+            )
+        ],
+    )
+    result["deposit_bulk_register"] = measure_requests(
+        client,
+        [
+            (
+                "post",
+                reverse("investment-deposit-bulk"),
+                [
+                    {
+                        "user_name": user_name,
+                        "account_number": account_number,
+                        "transfer_amount": 1000,
+                    }
+                    for user_name, account_number in rng.sample(
+                        accounts, min(DEPOSIT_BULK_SIZE, len(accounts))
+                    )
+                ],
+            )
+            for _ in range(max(requests_per_endpoint // 10, 1))
+        ],
+    )
+
+    deposits = register_deposits(client, accounts, requests_per_endpoint, rng)
+    result["deposit_status"] = measure_requests(
+        client,
+        [
+            ("get", reverse("investment-deposit-status", args=[deposit_id]), None)
+            for deposit_id, _, _, _ in deposits
+        ],
+    )
+    run_id = CsvUploadRun.objects.values_list("id", flat=True).first()
+    result["csv_upload_runs"] = measure_requests(
+        client,
+        [("get", reverse("csv-upload-runs"), None)] * requests_per_endpoint
+        + [("get", reverse("csv-upload-run", args=[run_id]), None)]
+        * (requests_per_endpoint if run_id else 0),
+    )
+
+    return result
+
+
+def deposit_confirmations(threads, deposits_per_thread, hot_accounts, rng):
+    """
+    입금 확인 API 동시 요청
+    - 스레드마다 APIClient 로 PUT, hot_accounts 개 계좌에 입금이 몰림
+    - 끝난 후 계좌 총 자산 증가분이 확인된 입금 금액 합계와 같은지 확인
+    :param threads:
+    :param deposits_per_thread:
+    :param hot_accounts: 입금 대상 계좌 수
+    :param rng:
+    :return: dict
+    """
+    from django.db import connections
+    from django.db.models import Sum
+    from django.urls import reverse
+    from rest_framework.test import APIClient
+
+    from api.models import Account
+
+    accounts = list(
+        Account.objects.filter(user__isnull=False)
+        .order_by("id")
+        .values_list("user__user_name", "account_number")[:hot_accounts]
+    )
+    numbers = [number for _, number in accounts]
+    deposits = register_deposits(
+        APIClient(), accounts, threads * deposits_per_thread, rng
+    )
+
+    def total_assets():
+        return (
+            Account.objects.filter(account_number__in=numbers).aggregate(
+                total=Sum("total_assets")
+            )["total"]
+            or 0
+        )
+
+    before = total_assets()
+    latencies, statuses, lock = [], {}, threading.Lock()
+    start = threading.Barrier(threads)
+
+    def worker(worker_idx):
+        client = APIClient(raise_request_exception=False)
+        own_latencies, own_statuses = [], {}
+        start.wait()
+        for deposit_id, signature, _, _ in deposits[worker_idx::threads]:
+            started = time.perf_counter()
+            response = client.put(
+                reverse("investment-deposit"),
+                {"transfer_identifier": deposit_id, "signature": signature},
+                format="json",
+            )
+            own_latencies.append(time.perf_counter() - started)
+            own_statuses[response.status_code] = (
+                own_statuses.get(response.status_code, 0) + 1
+            )
+
+        connections.close_all()
+        with lock:
+            latencies.extend(own_latencies)
+            for code, count in own_statuses.items():
+                statuses[code] = statuses.get(code, 0) + count
+
+    started = time.perf_counter()
+    workers = [threading.Thread(target=worker, args=(idx,)) for idx in range(threads)]
+    for thread in workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    return {
+        "threads": threads,
+        "hot_accounts": len(accounts),
+        "throughput_per_sec": round(len(deposits) / elapsed, 1) if elapsed else 0,
+        "statuses": statuses,
+        "consistent": total_assets() - before
+        == sum(amount for _, _, _, amount in deposits),
+        **latency_summary(latencies),
+    }
+
+
+def run(args):
+    """
+    데이터 생성 → 업로드 → API → 입금 확인 순서로 측정
+    :param args: main 의 인자
+    :return: dict
+    """
+    from django.conf import settings
+    from django.db import connection
+    from jobs.upload_csv import stage_workers
+
+    rng = random.Random(args.seed)
+    work_dir = tempfile.mkdtemp()
+    try:
+        dataset = SyntheticDataset(
+            args.rows, args.holdings_per_account, args.stocks, args.seed
+        )
+        started = time.perf_counter()
+        paths = write_csvs(dataset, os.path.join(work_dir, "csv"), args.format)
+        generate_elapsed = time.perf_counter() - started
+
+        # 업로더와 같은 스레드 수 (sqlite 는 1)
+        workers = stage_workers(args.workers)
+        state_dir = os.path.join(work_dir, "state")
+        uploads = {
+            "workers": workers,
+            "initial": upload(paths, state_dir, workers),
+            # 같은 파일 재업로드 - 변경분 (delta) 처리 경로
+            "reupload": upload(paths, state_dir, workers),
+        }
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    return {
+        "version": RESULT_VERSION,
+        "created_at": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "git": git_revision(),
+        "environment": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "database": connection.vendor,
+            "cache": settings.CACHES["default"]["BACKEND"],
+        },
+        "params": {
+            key: value for key, value in vars(args).items() if key != "baseline"
+        },
+        "dataset": {
+            "rows": dataset.rows,
+            "accounts": dataset.account_count,
+            "stocks": dataset.stock_count,
+            "generate_elapsed": round(generate_elapsed, 4),
+        },
+        "upload": uploads,
+        "endpoints": endpoints(args.requests, rng),
+        "deposit_confirm": deposit_confirmations(
+            args.threads, args.deposits, args.hot_accounts, rng
+        ),
+    }
+
+
+def _flatten(value, prefix=""):
+    if isinstance(value, dict):
+        for key, item in value.items():
+            yield from _flatten(item, f"{prefix}.{key}" if prefix else str(key))
+    elif isinstance(value, (int, float)) and not isinstance(value, bool):
+        yield prefix, value
+
+
+def compare(baseline, current, threshold=0.1):
+    """
+    이전 결과와 비교 - 시간 / 쿼리 수 / 처리량 항목만
+    :param baseline: 이전 결과 dict
+    :param current: 현재 결과 dict
+    :param threshold: 변화율 기준 (0.1 = 10%)
+    :return: {"regressions": [...], "improvements": [...]}
+    """
+    previous = dict(_flatten(baseline))
+    result = {"regressions": [], "improvements": []}
+
+    for key, value in _flatten(current):
+        if key.startswith("params.") or not key.endswith(COMPARED_SUFFIXES):
+            continue
+        if not previous.get(key):
+            continue
+
+        change = (value - previous[key]) / previous[key]
+        if key.endswith(HIGHER_IS_BETTER_SUFFIXES):
+            change = -change
+        if abs(change) < threshold:
+            continue
+
+        result["regressions" if change > 0 else "improvements"].append(
+            {
+                "metric": key,
+                "baseline": previous[key],
+                "current": value,
+                "change": round(change, 4),
+            }
+        )
+
+    for items in result.values():
+        items.sort(key=lambda item: -abs(item["change"]))
+    return result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=10000, help="자산 상세 row 수")
+    parser.add_argument(
+        "--holdings-per-account", type=int, default=DEFAULT_HOLDINGS_PER_ACCOUNT
+    )
+    parser.add_argument("--stocks", type=int, default=DEFAULT_STOCKS)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--format",
+        default=FORMAT_CSV,
+        choices=(FORMAT_CSV, FORMAT_GZIP, FORMAT_COLUMNAR),
+    )
+    parser.add_argument("--workers", type=int, default=4, help="업로드 동시 실행 단계 수")
+    parser.add_argument("--requests", type=int, default=200, help="엔드포인트별 요청 수")
+    parser.add_argument("--threads", type=int, default=8, help="입금 확인 동시 요청 수")
+    parser.add_argument("--deposits", type=int, default=50, help="스레드당 입금 확인 건수")
+    parser.add_argument("--hot-accounts", type=int, default=10, help="입금 대상 계좌 수")
+    parser.add_argument("--output", help="결과 JSON 저장 경로")
+    parser.add_argument("--baseline", help="비교할 이전 결과 JSON")
+    parser.add_argument("--threshold", type=float, default=0.1, help="비교 시 변화율 기준")
+    args = parser.parse_args(argv)
+
+    setup_django()
+    with benchmark_database():
+        result = run(args)
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as in_file:
+            result["comparison"] = compare(json.load(in_file), result, args.threshold)
+
+    output = json.dumps(result, indent=2, ensure_ascii=False, default=str)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as out_file:
+            out_file.write(output + "\n")
+
+    print(output)
+    return result
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,331 @@
+"""
+재현 가능한 측정용 데이터 생성 (seed 가 같으면 같은 데이터)
+- jobs/csv/*.csv 와 같은 형식의 자산군 / 자산 상세 / 기본 자산 파일 (1만 ~ 1천만 row)
+- 같은 데이터의 DB fixture (manage.py loaddata 용 JSON)
+- 계좌 단위로 만들어 바로 쓰므로 row 수와 관계없이 메모리 사용량은 일정
+
+python -m benchmarks.synthetic --rows 1000000 --out-dir /tmp/synthetic --format gzip --fixture /tmp/synthetic/fixture.json
+"""
+import argparse
+import csv
+import gzip
+import json
+import math
+import os
+import random
+import time
+from collections import namedtuple
+from decimal import Decimal
+
+from jobs.formats import FORMAT_COLUMNAR, FORMAT_CSV, FORMAT_GZIP, write_columnar
+
+# jobs/csv 샘플 파일과 같은 헤더 / 빈 컬럼
+ASSET_GROUP_HEADER = ["종목명", "ISIN", "자산그룹", "", ""]
+ASSET_INFO_HEADER = ["고객이름", "증권사", "계좌번호", "계좌명", "ISIN", "현재가", "보유수량"]
+ASSET_BASIC_HEADER = ["계좌번호", "투자원금", "", "", ""]
+
+# 파일 이름 - 업로더 기본 파일 이름과 같음
+FILE_NAMES = {
+    "asset_group": "asset_group_info_set.csv",
+    "asset_info": "account_asset_info_set.csv",
+    "asset_basic": "account_basic_info_set.csv",
+}
+FILE_SUFFIXES = {FORMAT_CSV: "", FORMAT_GZIP: ".gz", FORMAT_COLUMNAR: ".col"}
+
+ASSET_GROUPS = (
+    "미국 주식",
+    "미국섹터 주식",
+    "선진국 주식",
+    "신흥국 주식",
+    "전세계 주식",
+    "부동산 / 원자재",
+    "채권 / 현금",
+)
+BROKERAGES = ("디셈버증권", "베스트투자", "핀트투자증권")
+SURNAMES = "김이박최정강조윤장임한오서신권황안송류홍"
+GIVEN_NAME_SYLLABLES = "민서준지현우예도하윤수아건영길진호은재성"
+
+# 샘플 파일의 계좌당 보유종목 수
+DEFAULT_HOLDINGS_PER_ACCOUNT = 14
+DEFAULT_STOCKS = 200
+
+# 계좌번호 13자리 - 10**13 과 서로소인 수를 곱해서 겹치지 않고 흩어진 번호 생성
+ACCOUNT_NUMBER_SPACE = 10**13
+ACCOUNT_NUMBER_STEP = 2654435761
+
+# fixture 의 생성 / 수정 시각
+FIXTURE_TIMESTAMP = "2022-09-16T00:00:00Z"
+
+Stock = namedtuple("Stock", ["name", "isin", "asset_group", "price"])
+SyntheticAccount = namedtuple(
+    "SyntheticAccount",
+    [
+        "number",
+        "user_name",
+        "brokerage",
+        "account_name",
+        "principal",
+        "positions",
+    ],
+)
+
+
+class SyntheticDataset:
+    """
+    seed 고정 데이터셋
+    - rows : 자산 상세 row 수 (계좌 x 보유종목), 마지막 계좌가 나머지 row 를 가짐
+    - 종목 현재가는 종목마다 하나, 투자원금은 평가금액의 70 ~ 130%
+    """
+
+    def __init__(
+        self,
+        rows,
+        holdings_per_account=DEFAULT_HOLDINGS_PER_ACCOUNT,
+        stocks=DEFAULT_STOCKS,
+        seed=0,
+    ):
+        if rows < 1:
+            raise ValueError("row 수는 1 이상이어야 합니다.")
+
+        self.rows = rows
+        self.holdings_per_account = max(min(holdings_per_account, stocks), 1)
+        self.stock_count = max(stocks, 1)
+        self.seed = seed
+        self.account_count = math.ceil(rows / self.holdings_per_account)
+        self._stocks = None
+
+    def stocks(self):
+        """
+        종목 목록
+        :return: [Stock]
+        """
+        if self._stocks is None:
+            rng = random.Random(self.seed * 2)
+            self._stocks = [
+                Stock(
+                    f"{ASSET_GROUPS[idx % len(ASSET_GROUPS)].split()[0]} 종목{idx + 1}",
+                    f"KR7{idx:09d}",
+                    ASSET_GROUPS[idx % len(ASSET_GROUPS)],
+                    rng.randint(1000, 200000),
+                )
+                for idx in range(self.stock_count)
+            ]
+        return self._stocks
+
+    def accounts(self):
+        """
+        계좌 순서대로 계좌 / 보유종목 반환 (호출할 때마다 같은 순서 / 값)
+        :return: SyntheticAccount iterator
+        """
+        stocks = self.stocks()
+        rng = random.Random(self.seed * 2 + 1)
+        number_offset = rng.randrange(ACCOUNT_NUMBER_SPACE)
+
+        for idx in range(self.account_count):
+            holding_count = min(
+                self.holdings_per_account, self.rows - idx * self.holdings_per_account
+            )
+            positions = [
+                (stocks[stock_idx], rng.randint(1, 300))
+                for stock_idx in sorted(rng.sample(range(len(stocks)), holding_count))
+            ]
+            total = sum(stock.price * quantity for stock, quantity in positions)
+
+            yield SyntheticAccount(
+                f"{(idx * ACCOUNT_NUMBER_STEP + number_offset) % ACCOUNT_NUMBER_SPACE:013d}",
+                rng.choice(SURNAMES) + "".join(rng.choices(GIVEN_NAME_SYLLABLES, k=2)),
+                rng.choice(BROKERAGES),
+                f"계좌{idx + 1}",
+                int(total * rng.uniform(0.7, 1.3)),
+                positions,
+            )
+
+
+def _open_text(path, input_format):
+    if input_format == FORMAT_GZIP:
+        return gzip.open(path, "wt", encoding="utf-8", newline="", compresslevel=6)
+    return open(path, "w", encoding="utf-8", newline="")
+
+
+def write_csvs(dataset, out_dir, input_format=FORMAT_CSV):
+    """
+    업로더 입력 파일 3개 생성
+    - columnar 는 CSV 로 쓴 후 write_columnar 로 변환
+    :param dataset: SyntheticDataset
+    :param out_dir: 저장 디렉토리
+    :param input_format: FORMAT_CSV / FORMAT_GZIP / FORMAT_COLUMNAR
+    :return: {"asset_group" | "asset_info" | "asset_basic": 파일 경로}
+    """
+    if input_format not in FILE_SUFFIXES:
+        raise ValueError(f"지원하지 않는 입력 형식입니다. ({input_format})")
+
+    os.makedirs(out_dir, exist_ok=True)
+    text_format = FORMAT_GZIP if input_format == FORMAT_GZIP else FORMAT_CSV
+    paths = {
+        kind: os.path.join(out_dir, name + FILE_SUFFIXES[text_format])
+        for kind, name in FILE_NAMES.items()
+    }
+
+    with _open_text(paths["asset_group"], text_format) as out_file:
+        writer = csv.writer(out_file, lineterminator="\n")
+        writer.writerow(ASSET_GROUP_HEADER)
+        writer.writerows(
+            [stock.name, stock.isin, stock.asset_group, "", ""]
+            for stock in dataset.stocks()
+        )
+
+    with _open_text(paths["asset_info"], text_format) as info_file, _open_text(
+        paths["asset_basic"], text_format
+    ) as basic_file:
+        info_writer = csv.writer(info_file, lineterminator="\n")
+        basic_writer = csv.writer(basic_file, lineterminator="\n")
+        info_writer.writerow(ASSET_INFO_HEADER)
+        basic_writer.writerow(ASSET_BASIC_HEADER)
+
+        for account in dataset.accounts():
+            info_writer.writerows(
+                [
+                    account.user_name,
+                    account.brokerage,
+                    account.number,
+                    account.account_name,
+                    stock.isin,
+                    stock.price,
+                    quantity,
+                ]
+                for stock, quantity in account.positions
+            )
+            basic_writer.writerow([account.number, account.principal, "", "", ""])
+
+    if input_format == FORMAT_COLUMNAR:
+        for kind, path in list(paths.items()):
+            columnar_path = path + FILE_SUFFIXES[FORMAT_COLUMNAR]
+            write_columnar(path, columnar_path, FORMAT_CSV)
+            os.remove(path)
+            paths[kind] = columnar_path
+
+    return paths
+
+
+def write_fixture(dataset, path):
+    """
+    업로드 결과와 같은 데이터의 fixture 생성 (종목 / 계좌 / 유저 / 투자 / 보유종목)
+    - 객체 하나씩 바로 써서 row 수가 많아도 메모리에 모으지 않음
+    :param dataset: SyntheticDataset
+    :param path: 저장할 JSON 파일
+    :return: 저장한 객체 수
+    """
+    count = 0
+
+    with open(path, "w", encoding="utf-8") as out_file:
+
+        def dump(model, pk, fields):
+            nonlocal count
+            out_file.write(",\n" if count else "[\n")
+            out_file.write(
+                json.dumps(
+                    {"model": model, "pk": pk, "fields": fields}, ensure_ascii=False
+                )
+            )
+            count += 1
+
+        holding_pks = {}
+        for pk, stock in enumerate(dataset.stocks(), start=1):
+            holding_pks[stock.isin] = pk
+            dump(
+                "api.holding",
+                pk,
+                {
+                    "name": stock.name,
+                    "isin": stock.isin,
+                    "asset_group": stock.asset_group,
+                },
+            )
+
+        user_holding_pk = 0
+        for pk, account in enumerate(dataset.accounts(), start=1):
+            total = sum(stock.price * quantity for stock, quantity in account.positions)
+            dump(
+                "api.account",
+                pk,
+                {
+                    "account_number": account.number,
+                    "account_name": account.account_name,
+                    "total_assets": str(Decimal(total).quantize(Decimal("0.01"))),
+                },
+            )
+            dump(
+                "api.user",
+                pk,
+                {
+                    "account": pk,
+                    "user_name": account.user_name,
+                    "created_at": FIXTURE_TIMESTAMP,
+                    "updated_at": FIXTURE_TIMESTAMP,
+                },
+            )
+            dump(
+                "api.investment",
+                pk,
+                {
+                    "user": pk,
+                    "brokerage": account.brokerage,
+                    "principal": f"{account.principal}.00",
+                },
+            )
+            for stock, quantity in account.positions:
+                user_holding_pk += 1
+                dump(
+                    "api.userholding",
+                    user_holding_pk,
+                    {
+                        "holding": holding_pks[stock.isin],
+                        "user": pk,
+                        "quantity": quantity,
+                        "current_price": float(stock.price),
+                    },
+                )
+
+        out_file.write("\n]\n" if count else "[]\n")
+
+    return count
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=10000, help="자산 상세 row 수")
+    parser.add_argument(
+        "--holdings-per-account", type=int, default=DEFAULT_HOLDINGS_PER_ACCOUNT
+    )
+    parser.add_argument("--stocks", type=int, default=DEFAULT_STOCKS)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--out-dir", required=True)
+    parser.add_argument(
+        "--format",
+        default=FORMAT_CSV,
+        choices=(FORMAT_CSV, FORMAT_GZIP, FORMAT_COLUMNAR),
+    )
+    parser.add_argument("--fixture", help="같은 데이터의 fixture JSON 경로")
+    args = parser.parse_args(argv)
+
+    dataset = SyntheticDataset(
+        args.rows, args.holdings_per_account, args.stocks, args.seed
+    )
+    started = time.perf_counter()
+    result = {
+        "rows": dataset.rows,
+        "accounts": dataset.account_count,
+        "stocks": dataset.stock_count,
+        "seed": dataset.seed,
+        "files": write_csvs(dataset, args.out_dir, args.format),
+    }
+    if args.fixture:
+        result["fixture_objects"] = write_fixture(dataset, args.fixture)
+    result["elapsed"] = round(time.perf_counter() - started, 3)
+
+    print(json.dumps(result, indent=2, ensure_ascii=False))
+    return result
+
+
+if __name__ == "__main__":
+    main()
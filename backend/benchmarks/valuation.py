@@ -0,0 +1,154 @@
+"""
+계좌 총 자산 계산 방식 비교 (DB 없이 메모리 데이터로 측정)
+- model_loop : 조회한 UserHolding 객체마다 current_price * quantity 를 더하는 기존 방식
+  (ORM 이 row 마다 만드는 모델 객체 생성 포함, float 오차 있음)
+- float_loop : 같은 반복문을 가벼운 객체로 실행 (모델 객체 생성 비용 제외)
+- decimal_loop : 같은 반복문을 Decimal 로 정확하게 계산
+- columns : valuation.PositionColumns 로 컬럼을 만든 후 한번에 합산 (컬럼 생성 포함)
+
+python -m benchmarks.valuation --positions 1000000 --accounts 50000
+"""
+import argparse
+import json
+import random
+import time
+from decimal import Decimal
+
+from benchmarks import setup_django
+
+
+class Position:
+    """보유종목 객체 (UserHolding 의 가격 / 수량 속성만)"""
+
+    __slots__ = ("account_id", "current_price", "quantity")
+
+    def __init__(self, account_id, current_price, quantity):
+        self.account_id = account_id
+        self.current_price = current_price
+        self.quantity = quantity
+
+
+def make_positions(positions, accounts, seed=0):
+    """
+    계좌 순서로 정렬된 보유종목 생성 - 현재가는 소수점 2자리 float
+    :param positions: 보유종목 수
+    :param accounts: 계좌 수
+    :param seed:
+    :return: Position 리스트
+    """
+    rng = random.Random(seed)
+    account_ids = sorted(rng.randrange(accounts) for _ in range(positions))
+    return [
+        Position(account_id, rng.randint(100, 10000000) / 100, rng.randint(1, 1000))
+        for account_id in account_ids
+    ]
+
+
+def float_loop(positions):
+    totals = {}
+    for position in positions:
+        totals[position.account_id] = (
+            totals.get(position.account_id, 0)
+            + position.current_price * position.quantity
+        )
+    return {
+        account_id: Decimal(str(total)).quantize(Decimal("0.01"))
+        for account_id, total in totals.items()
+    }
+
+
+def model_loop(rows):
+    from api.models import UserHolding
+
+    totals = {}
+    for account_id, current_price, quantity in rows:
+        user_holding = UserHolding(
+            user_id=account_id, current_price=current_price, quantity=quantity
+        )
+        totals[user_holding.user_id] = (
+            totals.get(user_holding.user_id, 0)
+            + user_holding.current_price * user_holding.quantity
+        )
+    return {
+        account_id: Decimal(str(total)).quantize(Decimal("0.01"))
+        for account_id, total in totals.items()
+    }
+
+
+def decimal_loop(positions):
+    totals = {}
+    for position in positions:
+        totals[position.account_id] = (
+            totals.get(position.account_id, Decimal(0))
+            + Decimal(str(position.current_price)) * position.quantity
+        )
+    return {
+        account_id: total.quantize(Decimal("0.01"))
+        for account_id, total in totals.items()
+    }
+
+
+def columns(rows):
+    from api.valuation import PositionColumns, from_minor_units
+
+    return {
+        account_id: from_minor_units(total)
+        for account_id, total in PositionColumns.from_rows(rows).totals().items()
+    }
+
+
+def _timed(func, *args):
+    started = time.perf_counter()
+    result = func(*args)
+    return result, round(time.perf_counter() - started, 3)
+
+
+def run(positions, accounts):
+    """
+    방식별 소요 시간 / 결과 비교
+    :param positions: 보유종목 수
+    :param accounts: 계좌 수
+    :return: dict
+    """
+    data = make_positions(positions, accounts)
+    # DB 조회 결과 (values_list) 와 같은 형태
+    rows = [
+        (position.account_id, position.current_price, position.quantity)
+        for position in data
+    ]
+
+    _, model_elapsed = _timed(model_loop, rows)
+    exact, decimal_elapsed = _timed(decimal_loop, data)
+    approximate, float_elapsed = _timed(float_loop, data)
+    fixed, columns_elapsed = _timed(columns, rows)
+
+    assert fixed == exact, "고정소수점 계산 결과가 Decimal 결과와 다릅니다."
+
+    return {
+        "positions": positions,
+        "accounts": len(exact),
+        "model_loop_sec": model_elapsed,
+        "float_loop_sec": float_elapsed,
+        "decimal_loop_sec": decimal_elapsed,
+        "columns_sec": columns_elapsed,
+        "float_mismatched_accounts": sum(
+            1 for account_id, total in exact.items() if approximate[account_id] != total
+        ),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--positions", type=int, default=1000000)
+    parser.add_argument("--accounts", type=int, default=50000)
+    args = parser.parse_args(argv)
+
+    setup_django()
+    result = run(args.positions, args.accounts)
+
+    print(json.dumps(result, indent=2))
+    return result
+
+
+if __name__ == "__main__":
+    main()
@@ -1,3 +1,5 @@
+import threading
+
 from django.apps import AppConfig
 
 
@@ -6,6 +8,24 @@ class JobsConfig(AppConfig):
     name = "jobs"
 
     def ready(self):
+        from django.conf import settings
+
+        from backend.processes import is_web_process, should_start_scheduler
+
+        # manage.py 명령 / 테스트 등 웹 프로세스가 아니면 스케쥴러 / worker 를 띄우지 않고
+        # 관련 모듈도 import 하지 않음 (스케쥴러는 RUN_SCHEDULER 로 강제 가능)
+        # apscheduler import 가 무거우므로 워커 시작을 막지 않도록 백그라운드에서 시작
+        if settings.SCHEDULER_DEFAULT and should_start_scheduler():
+            threading.Thread(
+                target=self.start_scheduler, name="scheduler-start", daemon=True
+            ).start()
+
+        if settings.DEPOSIT_CONFIRM_ASYNC and is_web_process():
+            from api.deposit_queue import start_deposit_workers
+
+            start_deposit_workers()
+
+    def start_scheduler(self):
         from . import upload_csv
 
         upload_csv.start()
@@ -0,0 +1,192 @@
+import json
+import os
+
+from jobs.formats import STDIN_PATH
+
+# 결과 dict 에 보관하는 실패 row 최대 개수 (나머지는 에러 파일에만 기록)
+INVALID_ROWS_LIMIT = 100
+
+# 에러 파일에 기록하는 실패 row 최대 개수
+ERROR_FILE_MAX_ROWS = 100000
+
+
+def file_identity(file_path):
+    """
+    같은 파일인지 비교하기 위한 경로/크기/수정시각
+    :param file_path:
+    :return: dict
+    """
+    stat = os.stat(file_path)
+    return {
+        "csv_path": os.path.realpath(file_path),
+        "size": stat.st_size,
+        "mtime_ns": stat.st_mtime_ns,
+    }
+
+
+class Checkpoint:
+    """
+    CSV 파일별 마지막으로 커밋된 row 번호 저장소
+    - 파일 크기/수정시각이 바뀌면 다른 파일로 보고 처음부터 다시 처리
+    """
+
+    def __init__(self, csv_path, state_dir):
+        self.csv_path = os.path.realpath(csv_path)
+        self.path = os.path.join(
+            state_dir, f"{os.path.basename(csv_path)}.checkpoint.json"
+        )
+
+    def load(self):
+        """
+        저장된 체크포인트 조회
+        :return: dict or None
+        """
+        try:
+            with open(self.path) as in_file:
+                state = json.load(in_file)
+        except (OSError, ValueError):
+            return None
+
+        identity = file_identity(self.csv_path)
+        if any(state.get(key) != value for key, value in identity.items()):
+            return None
+
+        return state
+
+    def save(self, row_number, **extra):
+        """
+        커밋된 row 번호 저장 - 임시파일에 쓴 후 교체해서 중간에 죽어도 깨지지 않음
+        :param row_number: 마지막으로 커밋된 row 번호
+        :param extra: 함께 저장할 값
+        :return:
+        """
+        state = {**file_identity(self.csv_path), **extra, "row_number": row_number}
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w") as out_file:
+            json.dump(state, out_file)
+        os.replace(tmp_path, self.path)
+
+    def clear(self):
+        """
+        파일 처리 완료 시 체크포인트 삭제
+        :return:
+        """
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+
+class UploadProgress:
+    """
+    CSV 업로드 진행상황
+    - 결과 집계 (result dict)
+    - 실패 row 상세는 state_dir 의 에러 파일(JSON lines)로 기록
+    - chunk 커밋마다 체크포인트 저장, 재실행 시 이어서 처리
+    - state_dir 가 없거나 표준입력이면 체크포인트/에러 파일 없이 결과만 집계
+    """
+
+    def __init__(
+        self,
+        csv_path,
+        state_dir=None,
+        invalid_rows_limit=INVALID_ROWS_LIMIT,
+        error_file_max_rows=ERROR_FILE_MAX_ROWS,
+    ):
+        self.result = {
+            "total_csv_rows": 0,
+            "success_rows": 0,
+            "failed_rows": 0,
+            "invalid_rows": [],
+        }
+        self.invalid_rows_limit = invalid_rows_limit
+        self.error_file_max_rows = error_file_max_rows
+        self.start_row = 0
+        self.checkpoint = None
+        self.error_file = None
+        self.error_file_rows = 0
+
+        # 표준입력은 다시 읽을 수 없으므로 이어서 처리할 수 없음
+        if state_dir is None or csv_path == STDIN_PATH:
+            return
+
+        os.makedirs(state_dir, exist_ok=True)
+        self.checkpoint = Checkpoint(csv_path, state_dir)
+        error_path = os.path.join(
+            state_dir, f"{os.path.basename(csv_path)}.errors.jsonl"
+        )
+        state = self.checkpoint.load()
+
+        if state is None or not os.path.exists(error_path):
+            self.error_file = open(error_path, "wb")
+        else:
+            # 마지막 커밋 이후에 기록된 에러는 재실행 시 다시 기록되므로 잘라냄
+            self.start_row = state["row_number"]
+            self.error_file_rows = state.get("error_file_rows", 0)
+            self.error_file = open(error_path, "r+b")
+            self.error_file.truncate(state.get("error_file_offset", 0))
+            self.error_file.seek(0, os.SEEK_END)
+
+        self.result["error_file"] = error_path
+        self.result["resumed_from_row"] = self.start_row
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close(completed=exc_type is None)
+
+    def add_invalid_row(self, row_number, error):
+        """
+        실패한 row 기록
+        :param row_number: CSV 상의 row 번호 (1부터 시작)
+        :param error: 실패 사유
+        :return:
+        """
+        invalid_row = {"error row": row_number, "error detail": str(error)}
+        self.result["failed_rows"] += 1
+
+        if len(self.result["invalid_rows"]) < self.invalid_rows_limit:
+            self.result["invalid_rows"].append(invalid_row)
+
+        if self.error_file and self.error_file_rows < self.error_file_max_rows:
+            self.error_file.write(
+                (json.dumps(invalid_row, ensure_ascii=False) + "\n").encode()
+            )
+            self.error_file_rows += 1
+
+    def add_success_rows(self, count):
+        """
+        성공한 row 수 기록
+        :param count:
+        :return:
+        """
+        self.result["success_rows"] += count
+        self.result["total_csv_rows"] += count
+
+    def commit(self, row_number):
+        """
+        row_number 까지 DB 반영이 끝났음을 체크포인트에 기록
+        :param row_number: 마지막으로 커밋된 row 번호
+        :return:
+        """
+        if self.checkpoint is None:
+            return
+
+        self.error_file.flush()
+        self.checkpoint.save(
+            row_number,
+            error_file_offset=self.error_file.tell(),
+            error_file_rows=self.error_file_rows,
+        )
+
+    def close(self, completed):
+        """
+        에러 파일을 닫고, 끝까지 처리했으면 체크포인트 삭제
+        :param completed: 파일 끝까지 처리했는지 여부
+        :return:
+        """
+        if self.error_file:
+            self.error_file.close()
+            self.error_file = None
+
+        if completed and self.checkpoint:
+            self.checkpoint.clear()
@@ -0,0 +1,100 @@
+import hashlib
+
+from django.db import transaction
+from django.db.models import Q
+
+from api.common import upsert_options
+from backend.databases import write_database
+from jobs.models import AssetFingerprint
+
+# 한번에 조회 / 저장 / 삭제할 fingerprint 수
+FINGERPRINT_BATCH_SIZE = 1000
+
+
+def row_key(record):
+    """
+    자산 상세 row key (계좌번호, ISIN)
+    :param record: AssetInfoRow
+    :return: tuple
+    """
+    return record.account_number, record.isin
+
+
+def row_fingerprint(record):
+    """
+    row 내용의 fingerprint - 값이 하나라도 바뀌면 달라짐
+    :param record: namedtuple row 레코드
+    :return: 16자리 hex 문자열
+    """
+    return hashlib.blake2b(
+        "\x1f".join(map(str, record)).encode(), digest_size=8
+    ).hexdigest()
+
+
+class FingerprintStore:
+    """
+    이전 실행의 자산 상세 row fingerprint 저장소 (asset_fingerprints 테이블)
+    - 어느 호스트가 야간 업로드를 맡아도 같은 fingerprint 와 비교하도록 DB 에 저장
+    - shard 가 있으면 shard 에 속한 계좌의 fingerprint 만 조회 / 저장
+    - 저장은 바뀐 row 만 upsert, 빠진 row 는 삭제 (한 트랜잭션)
+    """
+
+    def __init__(self, shard=None, batch_size=FINGERPRINT_BATCH_SIZE):
+        self.shard = shard
+        self.batch_size = batch_size
+
+    def load(self):
+        """
+        저장된 fingerprint 조회
+        :return: {(계좌번호, ISIN): fingerprint}, 없으면 빈 dict
+        """
+        rows = AssetFingerprint.objects.values_list(
+            "account_number", "isin", "fingerprint"
+        ).iterator(chunk_size=self.batch_size)
+
+        return {
+            (account_number, isin): fingerprint
+            for account_number, isin, fingerprint in rows
+            if self.shard is None or self.shard.contains(account_number)
+        }
+
+    def save(self, fingerprints):
+        """
+        fingerprint 저장 - 이전 값과 비교해서 바뀐 row 만 반영
+        :param fingerprints: {(계좌번호, ISIN): fingerprint}
+        :return:
+        """
+        previous = self.load()
+        changed = [
+            AssetFingerprint(
+                account_number=account_number, isin=isin, fingerprint=fingerprint
+            )
+            for (account_number, isin), fingerprint in fingerprints.items()
+            if previous.get((account_number, isin)) != fingerprint
+        ]
+        removed = list(previous.keys() - fingerprints.keys())
+
+        with transaction.atomic(using=write_database()):
+            self._delete(removed)
+            AssetFingerprint.objects.bulk_create(
+                changed,
+                batch_size=self.batch_size,
+                **upsert_options(
+                    AssetFingerprint, ["account_number", "isin"], ["fingerprint"]
+                ),
+            )
+
+    def clear(self):
+        """
+        저장된 fingerprint 삭제 (다음 실행은 전체 반영)
+        :return:
+        """
+        with transaction.atomic(using=write_database()):
+            self._delete(list(self.load()))
+
+    def _delete(self, keys):
+        for idx in range(0, len(keys), self.batch_size):
+            condition = Q()
+            for account_number, isin in keys[idx : idx + self.batch_size]:
+                condition |= Q(account_number=account_number, isin=isin)
+            AssetFingerprint.objects.filter(condition).delete()
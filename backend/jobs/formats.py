@@ -0,0 +1,289 @@
+"""
+업로드 입력 파일 형식
+- csv : 일반 CSV 파일 (mmap 으로 읽음)
+- gzip : gzip 압축 CSV (디스크에 풀지 않고 스트림으로 읽음)
+- columnar : 컬럼 단위로 저장한 바이너리 파일 (write_columnar 로 미리 변환)
+- 경로가 "-" 이면 표준입력
+- 형식을 지정하지 않으면 파일 앞부분으로 판별
+"""
+import csv
+import gzip
+import io
+import json
+import mmap
+import struct
+import sys
+import zlib
+from array import array
+from contextlib import contextmanager
+
+FORMAT_CSV = "csv"
+FORMAT_GZIP = "gzip"
+FORMAT_COLUMNAR = "columnar"
+
+STDIN_PATH = "-"
+
+GZIP_MAGIC = b"\x1f\x8b"
+COLUMNAR_MAGIC = b"INVCOL1\n"
+
+# columnar 파일의 row group 당 row 수 (읽을 때 한번에 메모리에 올리는 단위)
+COLUMNAR_ROW_GROUP_SIZE = 65536
+
+# 중간 파일을 gzip 으로 쓸 때 압축 레벨 - 압축률보다 속도 우선
+GZIP_WRITE_LEVEL = 1
+
+# columnar 컬럼 인코딩
+_PLAIN = 0
+_DICTIONARY = 1
+
+_UINT32 = struct.Struct("<I")
+_COLUMN_HEADER = struct.Struct("<BI")
+_SEPARATOR = "\x00"
+
+
+def sniff_format(head):
+    """
+    파일 앞부분으로 형식 판별
+    :param head: 파일 앞부분 bytes
+    :return: FORMAT_*
+    """
+    if head.startswith(GZIP_MAGIC):
+        return FORMAT_GZIP
+    if head.startswith(COLUMNAR_MAGIC):
+        return FORMAT_COLUMNAR
+    return FORMAT_CSV
+
+
+def detect_format(path):
+    """
+    파일 앞부분으로 형식 판별 - 표준입력은 읽은 위치를 옮기지 않음
+    :param path: 파일 경로, "-" 이면 표준입력
+    :return: FORMAT_*
+    """
+    if path == STDIN_PATH:
+        return sniff_format(sys.stdin.buffer.peek(len(COLUMNAR_MAGIC)))
+
+    with open(path, "rb") as in_file:
+        return sniff_format(in_file.read(len(COLUMNAR_MAGIC)))
+
+
+def _mmap_lines(in_file):
+    """
+    파일을 mmap 으로 열어 한 줄씩 decode 해서 반환
+    - 빈 파일은 mmap 할 수 없으므로 그대로 반환
+    :param in_file: binary 파일 객체
+    :return:
+    """
+    try:
+        mapped = mmap.mmap(in_file.fileno(), 0, access=mmap.ACCESS_READ)
+    except ValueError:
+        return
+
+    with mapped:
+        for line in iter(mapped.readline, b""):
+            yield line.decode()
+
+
+def _text_lines(binary):
+    return io.TextIOWrapper(binary, encoding="utf-8", newline="")
+
+
+def _read_columnar(binary):
+    """
+    columnar 형식 row (tuple) 반환 - row group 하나씩만 메모리에 올림
+    - 첫 row 는 컬럼명 (CSV 헤더와 같음)
+    :param binary: MAGIC 이후 위치의 binary 파일 객체
+    :return:
+    """
+
+    def read_exact(size):
+        data = binary.read(size)
+        if len(data) != size:
+            raise ValueError("columnar 파일이 손상되었습니다.")
+        return data
+
+    (header_size,) = _UINT32.unpack(read_exact(_UINT32.size))
+    columns = json.loads(read_exact(header_size))
+    yield list(columns)
+
+    while True:
+        (row_count,) = _UINT32.unpack(read_exact(_UINT32.size))
+        if row_count == 0:
+            return
+
+        values = []
+        for _ in columns:
+            encoding, size = _COLUMN_HEADER.unpack(read_exact(_COLUMN_HEADER.size))
+            payload = zlib.decompress(read_exact(size))
+
+            if encoding == _DICTIONARY:
+                (dictionary_size,) = _UINT32.unpack_from(payload)
+                start = _UINT32.size
+                dictionary = payload[start : start + dictionary_size].decode()
+                dictionary = dictionary.split(_SEPARATOR)
+                indices = array("I")
+                indices.frombytes(payload[start + dictionary_size :])
+                values.append(list(map(dictionary.__getitem__, indices)))
+            else:
+                values.append(payload.decode().split(_SEPARATOR))
+
+        yield from zip(*values)
+
+
+@contextmanager
+def open_rows(path, input_format=None):
+    """
+    입력 파일을 열어 row (문자열 리스트) iterator 반환
+    - 첫 row 는 헤더
+    :param path: 파일 경로, "-" 이면 표준입력
+    :param input_format: FORMAT_*, None 이면 파일 앞부분으로 판별
+    :return:
+    """
+    if path == STDIN_PATH:
+        binary = sys.stdin.buffer
+        close = False
+    else:
+        binary = open(path, "rb")
+        close = True
+
+    try:
+        if input_format is None:
+            input_format = sniff_format(binary.peek(len(COLUMNAR_MAGIC)))
+
+        if input_format == FORMAT_GZIP:
+            yield csv.reader(_text_lines(gzip.open(binary)))
+        elif input_format == FORMAT_COLUMNAR:
+            if binary.read(len(COLUMNAR_MAGIC)) != COLUMNAR_MAGIC:
+                raise ValueError("columnar 파일이 아닙니다.")
+            yield _read_columnar(binary)
+        elif input_format == FORMAT_CSV:
+            if close:
+                yield csv.reader(_mmap_lines(binary))
+            else:
+                yield csv.reader(_text_lines(binary))
+        else:
+            raise ValueError(f"지원하지 않는 입력 형식입니다. ({input_format})")
+    finally:
+        if close:
+            binary.close()
+
+
+def _encode_column(values):
+    """
+    컬럼 값 인코딩 - 중복이 많으면 사전 인코딩 후 zlib 압축
+    :param values: 문자열 리스트
+    :return: (인코딩, payload)
+    """
+    if any(_SEPARATOR in value for value in values):
+        raise ValueError("columnar 형식은 NUL 문자를 포함한 값을 저장할 수 없습니다.")
+
+    dictionary = list(dict.fromkeys(values))
+    if len(dictionary) * 2 <= len(values):
+        positions = {value: idx for idx, value in enumerate(dictionary)}
+        dictionary_bytes = _SEPARATOR.join(dictionary).encode()
+        payload = (
+            _UINT32.pack(len(dictionary_bytes))
+            + dictionary_bytes
+            + array("I", map(positions.__getitem__, values)).tobytes()
+        )
+        return _DICTIONARY, zlib.compress(payload)
+
+    return _PLAIN, zlib.compress(_SEPARATOR.join(values).encode())
+
+
+class ColumnarWriter:
+    """
+    row 를 받아 columnar 형식으로 저장 - row group 하나씩만 메모리에 모음
+    - 첫 row 는 컬럼명 (CSV 헤더와 같음)
+    - 헤더보다 컬럼이 적은 row 는 빈 값으로 채움 (업로드 시 파싱 실패로 기록됨)
+    """
+
+    def __init__(self, out_file, row_group_size=COLUMNAR_ROW_GROUP_SIZE):
+        self.out_file = out_file
+        self.row_group_size = row_group_size
+        self.header = None
+        self.row_group = []
+        self.row_count = 0
+
+    def writerow(self, row):
+        if self.header is None:
+            self.header = [str(value) for value in row]
+            header_bytes = json.dumps(self.header, ensure_ascii=False).encode()
+            self.out_file.write(COLUMNAR_MAGIC)
+            self.out_file.write(_UINT32.pack(len(header_bytes)))
+            self.out_file.write(header_bytes)
+            return
+
+        self.row_group.append(row)
+        if len(self.row_group) >= self.row_group_size:
+            self._write_row_group()
+
+    def _write_row_group(self):
+        rows = self.row_group
+        self.out_file.write(_UINT32.pack(len(rows)))
+        for idx in range(len(self.header)):
+            encoding, payload = _encode_column(
+                [str(row[idx]) if idx < len(row) else "" for row in rows]
+            )
+            self.out_file.write(_COLUMN_HEADER.pack(encoding, len(payload)))
+            self.out_file.write(payload)
+        self.row_count += len(rows)
+        self.row_group = []
+
+    def close(self):
+        """
+        남은 row group 과 파일 끝 표시 저장
+        :return:
+        """
+        if self.header is None:
+            self.writerow([])
+        if self.row_group:
+            self._write_row_group()
+        self.out_file.write(_UINT32.pack(0))
+
+
+@contextmanager
+def open_writer(path, output_format):
+    """
+    output_format 형식으로 저장하는 row writer (writerow) 반환
+    - 첫 row 는 헤더
+    :param path: 저장할 파일
+    :param output_format: FORMAT_*
+    :return:
+    """
+    if output_format == FORMAT_CSV:
+        with open(path, "w", encoding="utf-8", newline="") as out_file:
+            yield csv.writer(out_file)
+    elif output_format == FORMAT_GZIP:
+        with gzip.open(
+            path, "wt", encoding="utf-8", newline="", compresslevel=GZIP_WRITE_LEVEL
+        ) as out_file:
+            yield csv.writer(out_file)
+    elif output_format == FORMAT_COLUMNAR:
+        with open(path, "wb") as out_file:
+            writer = ColumnarWriter(out_file)
+            yield writer
+            writer.close()
+    else:
+        raise ValueError(f"지원하지 않는 입력 형식입니다. ({output_format})")
+
+
+def write_columnar(
+    src_path, dst_path, input_format=None, row_group_size=COLUMNAR_ROW_GROUP_SIZE
+):
+    """
+    입력 파일을 columnar 형식으로 변환
+    - 헤더보다 컬럼이 적은 row 는 빈 값으로 채움 (업로드 시 파싱 실패로 기록됨)
+    :param src_path: 입력 파일 (csv / gzip / columnar / "-")
+    :param dst_path: 저장할 columnar 파일
+    :param input_format: 입력 형식, None 이면 판별
+    :param row_group_size: row group 당 row 수
+    :return: 변환한 row 수 (헤더 제외)
+    """
+    with open_rows(src_path, input_format) as rows, open(dst_path, "wb") as out_file:
+        writer = ColumnarWriter(out_file, row_group_size)
+        for row in rows:
+            writer.writerow(row)
+        writer.close()
+
+    return writer.row_count
@@ -0,0 +1,116 @@
+import os
+import statistics
+import subprocess
+import sys
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+# 새 인터프리터에서 실행할 시작 과정 - django.setup() (+ URLConf 로딩)
+STARTUP_SCRIPT = """
+import sys, time
+started = time.perf_counter()
+{argv}
+import django
+django.setup()
+{urls}
+sys.stdout.write(repr(time.perf_counter() - started))
+"""
+WEB_ARGV = "sys.argv = ['gunicorn']"
+URLS_IMPORT = "from django.urls import get_resolver; get_resolver().url_patterns"
+
+IMPORTTIME_PREFIX = "import time:"
+
+
+def parse_importtime(output):
+    """
+    -X importtime 출력 파싱
+    :param output: stderr 문자열
+    :return: [(모듈명, self us, cumulative us, 깊이)]
+    """
+    rows = []
+    for line in output.splitlines():
+        if not line.startswith(IMPORTTIME_PREFIX):
+            continue
+
+        self_us, cumulative_us, name = line[len(IMPORTTIME_PREFIX) :].split("|")
+        if not self_us.strip().isdigit():
+            continue
+
+        depth = (len(name) - len(name.lstrip())) // 2
+        rows.append((name.strip(), int(self_us), int(cumulative_us), depth))
+
+    return rows
+
+
+def package_totals(rows):
+    """
+    최상위 패키지별 import 시간 합계 (self 기준)
+    :param rows: parse_importtime 결과
+    :return: {패키지명: us}
+    """
+    totals = {}
+    for name, self_us, _, _ in rows:
+        package = name.split(".")[0]
+        totals[package] = totals.get(package, 0) + self_us
+    return totals
+
+
+class Command(BaseCommand):
+    help = "새 프로세스의 django.setup() 시간과 모듈별 import 시간(-X importtime)을 측정합니다."
+    requires_system_checks = []
+
+    def add_arguments(self, parser):
+        parser.add_argument("--top", type=int, default=15, help="출력할 모듈/패키지 수")
+        parser.add_argument("--repeat", type=int, default=5, help="시작 시간 측정 횟수")
+        parser.add_argument(
+            "--web",
+            action="store_true",
+            help="웹 워커로 시작 (스케쥴러 / worker 시작 포함) 하고 URLConf 까지 로딩",
+        )
+
+    def _run(self, script, importtime=False):
+        command = [sys.executable]
+        if importtime:
+            command += ["-X", "importtime"]
+
+        completed = subprocess.run(
+            [*command, "-c", script],
+            cwd=settings.BASE_DIR.parent,
+            env={**os.environ, "DJANGO_SETTINGS_MODULE": settings.SETTINGS_MODULE},
+            capture_output=True,
+            text=True,
+        )
+        if completed.returncode:
+            raise CommandError(completed.stderr.strip().splitlines()[-1])
+
+        return float(completed.stdout), completed.stderr
+
+    def handle(self, *args, **options):
+        script = STARTUP_SCRIPT.format(
+            argv=WEB_ARGV if options["web"] else "",
+            urls=URLS_IMPORT if options["web"] else "",
+        )
+        top = options["top"]
+
+        # -X importtime 자체가 느리므로 시작 시간은 따로 측정
+        elapsed = [self._run(script)[0] for _ in range(max(options["repeat"], 1))]
+        _, stderr = self._run(script, importtime=True)
+        rows = parse_importtime(stderr)
+
+        self.stdout.write(
+            f"startup: median {statistics.median(elapsed) * 1000:.1f}ms, "
+            f"min {min(elapsed) * 1000:.1f}ms ({len(elapsed)} runs), "
+            f"{len(rows)} modules imported"
+        )
+
+        self.stdout.write(f"\ntop {top} packages (self, ms)")
+        totals = sorted(package_totals(rows).items(), key=lambda item: -item[1])
+        for package, total_us in totals[:top]:
+            self.stdout.write(f"{total_us / 1000:10.1f}  {package}")
+
+        self.stdout.write(f"\ntop {top} imports (cumulative, ms)")
+        for name, _, cumulative_us, depth in sorted(rows, key=lambda row: -row[2])[
+            :top
+        ]:
+            self.stdout.write(f"{cumulative_us / 1000:10.1f}  {'  ' * depth}{name}")
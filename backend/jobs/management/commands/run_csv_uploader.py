@@ -0,0 +1,122 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from jobs import upload_csv
+from jobs.formats import FORMAT_COLUMNAR, FORMAT_CSV, FORMAT_GZIP
+from jobs.readers import Shard
+
+INPUT_FORMAT_KINDS = ("asset_group", "asset_info", "asset_basic")
+INPUT_FORMATS = (FORMAT_CSV, FORMAT_GZIP, FORMAT_COLUMNAR)
+
+
+def _summarize(value):
+    """
+    단계 결과를 출력용으로 요약 - set / dict / list 는 개수만
+    :param value:
+    :return:
+    """
+    if isinstance(value, dict):
+        return {
+            key: (
+                item
+                if key == "invalid_rows" or not isinstance(item, (set, dict, list))
+                else len(item)
+            )
+            for key, item in value.items()
+        }
+    if isinstance(value, (set, list, tuple)):
+        return len(value)
+    return value
+
+
+class Command(BaseCommand):
+    help = (
+        "CSV 업로드를 바로 실행합니다. "
+        "--shard-index / --shard-count 로 계좌번호 기준으로 나눠 여러 호스트에서 실행할 수 있고, "
+        "--dry-run 은 DB 에 반영하지 않고 파일만 검증합니다."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--asset-group", default=upload_csv.CSV_ASSET_GROUP, help="자산군 파일"
+        )
+        parser.add_argument(
+            "--asset-info", default=upload_csv.CSV_ACCOUNT_ASSET, help="자산 상세 파일"
+        )
+        parser.add_argument(
+            "--asset-basic", default=upload_csv.CSV_ACCOUNT_BASIC, help="기본 자산 파일"
+        )
+        parser.add_argument(
+            "--input-format",
+            action="append",
+            default=[],
+            metavar="KIND=FORMAT",
+            help=(
+                f"파일별 입력 형식 ({'/'.join(INPUT_FORMAT_KINDS)}="
+                f"{'/'.join(INPUT_FORMATS)}), 지정하지 않으면 내용으로 판별"
+            ),
+        )
+        parser.add_argument("--shard-index", type=int, default=0)
+        parser.add_argument("--shard-count", type=int, default=1)
+        parser.add_argument(
+            "--workers", type=int, default=upload_csv.PIPELINE_MAX_WORKERS
+        )
+        parser.add_argument(
+            "--state-dir",
+            default=upload_csv.STATE_DIR,
+            help="체크포인트 / 에러 파일 / 분할 파일 디렉토리",
+        )
+        parser.add_argument(
+            "--dry-run", action="store_true", help="DB 에 반영하지 않고 파일만 검증"
+        )
+
+    def _input_formats(self, values):
+        input_formats = {}
+        for value in values:
+            kind, _, input_format = value.partition("=")
+            if kind not in INPUT_FORMAT_KINDS or input_format not in INPUT_FORMATS:
+                raise CommandError(f"잘못된 입력 형식입니다. ({value})")
+            input_formats[kind] = input_format
+        return input_formats
+
+    def handle(self, *args, **options):
+        shard_index, shard_count = options["shard_index"], options["shard_count"]
+        if shard_count < 1 or not 0 <= shard_index < shard_count:
+            raise CommandError("shard index 는 0 이상 shard count 미만이어야 합니다.")
+
+        shard = Shard(shard_index, shard_count) if shard_count > 1 else None
+        input_formats = self._input_formats(options["input_format"]) or None
+
+        if options["dry_run"]:
+            results = upload_csv.validate_csv_files(
+                options["asset_group"],
+                options["asset_info"],
+                options["asset_basic"],
+                input_formats=input_formats,
+                shard=shard,
+            )
+        else:
+            results = upload_csv.execute_csv_uploader(
+                max_workers=options["workers"],
+                state_dir=options["state_dir"],
+                csv_asset_group=options["asset_group"],
+                csv_asset_info=options["asset_info"],
+                csv_asset_basic=options["asset_basic"],
+                input_formats=input_formats,
+                shard=shard,
+            )
+
+        self.stdout.write(
+            json.dumps(
+                {name: _summarize(result) for name, result in results.items()},
+                indent=2,
+                ensure_ascii=False,
+                default=str,
+            )
+        )
+
+        if options["dry_run"]:
+            failed_rows = sum(result["failed_rows"] for result in results.values())
+            if failed_rows:
+                raise CommandError(f"검증에 실패한 row 가 {failed_rows}건 있습니다.")
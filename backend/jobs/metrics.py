@@ -0,0 +1,155 @@
+import threading
+import time
+
+from django.db import connections, transaction
+from django.utils import timezone
+
+from backend.databases import write_database
+from jobs.models import CsvUploadRun, CsvUploadStageMetric
+from jobs.pipeline import Stage
+
+
+def peak_rss_kb():
+    """
+    현재 프로세스의 최대 메모리 사용량 (Linux 기준 KB)
+    - resource 모듈이 없는 환경에서는 None
+    :return:
+    """
+    try:
+        import resource
+    except ImportError:
+        return None
+
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+def _growth(before, after):
+    if before is None or after is None:
+        return None
+    return after - before
+
+
+class QueryCounter:
+    """execute_wrapper 로 등록해서 실행된 쿼리 수 / 시간 집계"""
+
+    def __init__(self):
+        self.count = 0
+        self.elapsed = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.count += 1
+            self.elapsed += time.perf_counter() - started
+
+
+class StageMetricsCollector:
+    """
+    파이프라인 단계별 측정값 수집
+    - 소요 시간, 처리 row 수 / 초당 처리 row 수, DB 쿼리 수 / 시간
+    - 메모리는 프로세스 단위 최대값 (ru_maxrss) 이라 단계별로는 단계 중 최대값이 늘어난 양만 기록
+      (동시에 실행한 단계의 증가분이 함께 잡힐 수 있음), 최대값 자체는 실행 이력에 기록
+    - 단계 결과가 업로드 결과 dict 면 row 수를, 정수면 성공 row 수로 기록
+    """
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.metrics = {}
+        self._lock = threading.Lock()
+
+    def instrument(self, stages):
+        """
+        측정 코드로 감싼 Stage 리스트 반환
+        :param stages: Stage 리스트
+        :return:
+        """
+        return [
+            Stage(stage.name, self._wrap(stage), stage.depends_on) for stage in stages
+        ]
+
+    def _wrap(self, stage):
+        def run(results):
+            counter = QueryCounter()
+            started = time.perf_counter()
+            started_rss = peak_rss_kb()
+            metric = {"name": stage.name, "status": CsvUploadRun.STATUS_SUCCESS}
+
+            try:
+                with connections[write_database()].execute_wrapper(counter):
+                    result = stage.func(results)
+            except Exception as e:
+                metric.update(status=CsvUploadRun.STATUS_FAILED, error=str(e))
+                raise
+            else:
+                metric.update(self._row_counts(result))
+                return result
+            finally:
+                elapsed = time.perf_counter() - started
+                metric.update(
+                    elapsed=elapsed,
+                    rows_per_sec=metric.get("total_rows", 0) / elapsed
+                    if elapsed
+                    else 0,
+                    query_count=counter.count,
+                    query_time=counter.elapsed,
+                    peak_rss_growth_kb=_growth(started_rss, peak_rss_kb()),
+                )
+                with self._lock:
+                    self.metrics[stage.name] = metric
+
+        return run
+
+    @staticmethod
+    def _row_counts(result):
+        if isinstance(result, dict) and "success_rows" in result:
+            return {
+                "total_rows": result["success_rows"] + result["failed_rows"],
+                "success_rows": result["success_rows"],
+                "failed_rows": result["failed_rows"],
+            }
+
+        if isinstance(result, int):
+            return {"total_rows": result, "success_rows": result}
+
+        return {}
+
+    def save(self, run, error=None):
+        """
+        실행 이력과 단계별 측정값 저장
+        :param run: CsvUploadRun
+        :param error: 실패한 경우 예외
+        :return:
+        """
+        run.status = (
+            CsvUploadRun.STATUS_FAILED if error else CsvUploadRun.STATUS_SUCCESS
+        )
+        run.error = str(error) if error else ""
+        run.finished_at = timezone.now()
+        run.elapsed = time.perf_counter() - self.started
+        run.peak_rss_kb = peak_rss_kb()
+
+        with transaction.atomic(using=write_database()):
+            run.save()
+            CsvUploadStageMetric.objects.bulk_create(
+                [
+                    CsvUploadStageMetric(run=run, **metric)
+                    for metric in self.metrics.values()
+                ]
+            )
+
+    def summary_lines(self):
+        """
+        로그용 단계별 요약
+        :return:
+        """
+        return [
+            f"[{metric['name']}] {metric['status']} - "
+            f"{metric['elapsed']:.2f}s, "
+            f"rows {metric.get('success_rows', 0)}/{metric.get('total_rows', 0)} "
+            f"({metric['rows_per_sec']:.1f} rows/s), "
+            f"queries {metric['query_count']} ({metric['query_time']:.2f}s), "
+            f"peak rss +{metric['peak_rss_growth_kb']}KB"
+            for metric in self.metrics.values()
+        ]
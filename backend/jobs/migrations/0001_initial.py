@@ -0,0 +1,133 @@
+# Generated by Django 4.1.1 on 2026-10-18 17:18
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = []
+
+    operations = [
+        migrations.CreateModel(
+            name="CsvUploadRun",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[
+                            ("running", "실행중"),
+                            ("success", "성공"),
+                            ("failed", "실패"),
+                        ],
+                        default="running",
+                        max_length=10,
+                        verbose_name="상태",
+                    ),
+                ),
+                (
+                    "started_at",
+                    models.DateTimeField(auto_now_add=True, verbose_name="시작 시각"),
+                ),
+                (
+                    "finished_at",
+                    models.DateTimeField(blank=True, null=True, verbose_name="종료 시각"),
+                ),
+                (
+                    "elapsed",
+                    models.FloatField(blank=True, null=True, verbose_name="소요 시간(초)"),
+                ),
+                (
+                    "peak_rss_kb",
+                    models.BigIntegerField(
+                        blank=True, null=True, verbose_name="최대 메모리 사용량(KB)"
+                    ),
+                ),
+                (
+                    "error",
+                    models.TextField(blank=True, default="", verbose_name="에러 내용"),
+                ),
+            ],
+            options={
+                "db_table": "csv_upload_runs",
+            },
+        ),
+        migrations.CreateModel(
+            name="CsvUploadStageMetric",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("name", models.CharField(max_length=45, verbose_name="단계명")),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[
+                            ("running", "실행중"),
+                            ("success", "성공"),
+                            ("failed", "실패"),
+                        ],
+                        max_length=10,
+                        verbose_name="상태",
+                    ),
+                ),
+                ("elapsed", models.FloatField(verbose_name="소요 시간(초)")),
+                ("total_rows", models.IntegerField(default=0, verbose_name="처리 row 수")),
+                (
+                    "success_rows",
+                    models.IntegerField(default=0, verbose_name="성공 row 수"),
+                ),
+                (
+                    "failed_rows",
+                    models.IntegerField(default=0, verbose_name="실패 row 수"),
+                ),
+                (
+                    "rows_per_sec",
+                    models.FloatField(default=0, verbose_name="초당 처리 row 수"),
+                ),
+                ("query_count", models.IntegerField(default=0, verbose_name="DB 쿼리 수")),
+                (
+                    "query_time",
+                    models.FloatField(default=0, verbose_name="DB 쿼리 시간(초)"),
+                ),
+                (
+                    "peak_rss_kb",
+                    models.BigIntegerField(
+                        blank=True, null=True, verbose_name="최대 메모리 사용량(KB)"
+                    ),
+                ),
+                (
+                    "error",
+                    models.TextField(blank=True, default="", verbose_name="에러 내용"),
+                ),
+                (
+                    "run",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="stages",
+                        to="jobs.csvuploadrun",
+                    ),
+                ),
+            ],
+            options={
+                "db_table": "csv_upload_stage_metrics",
+            },
+        ),
+    ]
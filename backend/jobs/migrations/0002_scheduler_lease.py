@@ -0,0 +1,41 @@
+# Generated by Django 4.1.1 on 2026-10-18 17:33
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("jobs", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="SchedulerLease",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "name",
+                    models.CharField(max_length=100, unique=True, verbose_name="작업명"),
+                ),
+                (
+                    "owner",
+                    models.CharField(
+                        blank=True, default="", max_length=100, verbose_name="실행 프로세스"
+                    ),
+                ),
+                ("expires_at", models.DateTimeField(verbose_name="만료 시각")),
+            ],
+            options={
+                "db_table": "scheduler_leases",
+            },
+        ),
+    ]
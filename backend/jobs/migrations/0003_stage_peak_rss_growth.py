@@ -0,0 +1,24 @@
+# Generated by Django 4.1.1 on 2026-10-18 18:03
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("jobs", "0002_scheduler_lease"),
+    ]
+
+    operations = [
+        migrations.RemoveField(
+            model_name="csvuploadstagemetric",
+            name="peak_rss_kb",
+        ),
+        migrations.AddField(
+            model_name="csvuploadstagemetric",
+            name="peak_rss_growth_kb",
+            field=models.BigIntegerField(
+                blank=True, null=True, verbose_name="단계 중 최대 메모리 사용량 증가(KB)"
+            ),
+        ),
+    ]
@@ -0,0 +1,45 @@
+# Generated by Django 4.1.1 on 2026-10-18 18:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("jobs", "0003_stage_peak_rss_growth"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="AssetFingerprint",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "account_number",
+                    models.CharField(max_length=30, verbose_name="계좌번호"),
+                ),
+                ("isin", models.CharField(max_length=20, verbose_name="ISIN")),
+                (
+                    "fingerprint",
+                    models.CharField(max_length=16, verbose_name="fingerprint"),
+                ),
+            ],
+            options={
+                "db_table": "asset_fingerprints",
+            },
+        ),
+        migrations.AddConstraint(
+            model_name="assetfingerprint",
+            constraint=models.UniqueConstraint(
+                fields=("account_number", "isin"), name="asset_fingerprints_uq"
+            ),
+        ),
+    ]
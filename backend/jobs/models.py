@@ -0,0 +1,77 @@
+from django.db import models
+
+
+class CsvUploadRun(models.Model):
+    """CSV 업로드 실행 이력 모델"""
+
+    STATUS_RUNNING = "running"
+    STATUS_SUCCESS = "success"
+    STATUS_FAILED = "failed"
+    STATUS_CHOICES = [
+        (STATUS_RUNNING, "실행중"),
+        (STATUS_SUCCESS, "성공"),
+        (STATUS_FAILED, "실패"),
+    ]
+
+    status = models.CharField(
+        "상태", max_length=10, choices=STATUS_CHOICES, default=STATUS_RUNNING
+    )
+    started_at = models.DateTimeField("시작 시각", auto_now_add=True)
+    finished_at = models.DateTimeField("종료 시각", null=True, blank=True)
+    elapsed = models.FloatField("소요 시간(초)", null=True, blank=True)
+    peak_rss_kb = models.BigIntegerField("최대 메모리 사용량(KB)", null=True, blank=True)
+    error = models.TextField("에러 내용", blank=True, default="")
+
+    class Meta:
+        db_table = "csv_upload_runs"
+
+
+class CsvUploadStageMetric(models.Model):
+    """CSV 업로드 단계별 측정값 모델"""
+
+    run = models.ForeignKey(
+        CsvUploadRun, on_delete=models.CASCADE, related_name="stages"
+    )
+    name = models.CharField("단계명", max_length=45)
+    status = models.CharField("상태", max_length=10, choices=CsvUploadRun.STATUS_CHOICES)
+    elapsed = models.FloatField("소요 시간(초)")
+    total_rows = models.IntegerField("처리 row 수", default=0)
+    success_rows = models.IntegerField("성공 row 수", default=0)
+    failed_rows = models.IntegerField("실패 row 수", default=0)
+    rows_per_sec = models.FloatField("초당 처리 row 수", default=0)
+    query_count = models.IntegerField("DB 쿼리 수", default=0)
+    query_time = models.FloatField("DB 쿼리 시간(초)", default=0)
+    peak_rss_growth_kb = models.BigIntegerField(
+        "단계 중 최대 메모리 사용량 증가(KB)", null=True, blank=True
+    )
+    error = models.TextField("에러 내용", blank=True, default="")
+
+    class Meta:
+        db_table = "csv_upload_stage_metrics"
+
+
+class SchedulerLease(models.Model):
+    """스케쥴러 작업 lease 모델 - 여러 프로세스 중 lease 를 가진 프로세스만 작업 실행"""
+
+    name = models.CharField("작업명", max_length=100, unique=True)
+    owner = models.CharField("실행 프로세스", max_length=100, blank=True, default="")
+    expires_at = models.DateTimeField("만료 시각")
+
+    class Meta:
+        db_table = "scheduler_leases"
+
+
+class AssetFingerprint(models.Model):
+    """자산 상세 row 별 마지막으로 반영한 fingerprint - 다음 업로드에서 바뀐 row 만 반영"""
+
+    account_number = models.CharField("계좌번호", max_length=30)
+    isin = models.CharField("ISIN", max_length=20)
+    fingerprint = models.CharField("fingerprint", max_length=16)
+
+    class Meta:
+        db_table = "asset_fingerprints"
+        constraints = [
+            models.UniqueConstraint(
+                fields=["account_number", "isin"], name="asset_fingerprints_uq"
+            ),
+        ]
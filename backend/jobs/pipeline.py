@@ -0,0 +1,112 @@
+from collections import namedtuple
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from django.db import connections
+
+# 파이프라인 단계
+# - func : 선행 단계 결과 dict ({단계명: 결과}) 를 받아 실행하는 함수
+# - depends_on : 먼저 끝나야 하는 단계명 목록
+Stage = namedtuple("Stage", ["name", "func", "depends_on"])
+
+
+def _sort_stages(stages):
+    """
+    단계 이름/의존관계 검증 후 위상정렬
+    :param stages: Stage 리스트
+    :return: 실행 가능한 순서로 정렬된 Stage 리스트
+    """
+    stage_map = {}
+    for stage in stages:
+        if stage.name in stage_map:
+            raise ValueError(f"중복된 단계명이 존재합니다. ({stage.name})")
+        stage_map[stage.name] = stage
+
+    for stage in stages:
+        for name in stage.depends_on:
+            if name not in stage_map:
+                raise ValueError(f"존재하지 않는 단계에 의존합니다. ({stage.name} -> {name})")
+
+    sorted_stages, done = [], set()
+    while len(sorted_stages) < len(stages):
+        ready = [
+            stage
+            for stage in stages
+            if stage.name not in done and set(stage.depends_on) <= done
+        ]
+        if not ready:
+            raise ValueError("단계 의존관계에 순환이 존재합니다.")
+
+        sorted_stages.extend(ready)
+        done.update(stage.name for stage in ready)
+
+    return sorted_stages
+
+
+def _run_stage(stage, results):
+    """
+    pool 스레드에서 단계 실행
+    - 스레드마다 열린 DB 커넥션은 끝나면 정리
+    :param stage:
+    :param results: 선행 단계 결과 dict
+    :return:
+    """
+    try:
+        return stage.func(results)
+    finally:
+        connections.close_all()
+
+
+def run_stages(stages, max_workers=1):
+    """
+    단계 DAG 실행
+    - 선행 단계가 모두 끝난 단계부터 thread pool 에서 병렬 실행
+    - max_workers 가 1 이하면 현재 스레드에서 순서대로 실행
+    - 실패한 단계가 있으면 새 단계는 시작하지 않고, 실행중인 단계가 끝난 후 예외를 다시 발생
+    :param stages: Stage 리스트
+    :param max_workers: 동시에 실행할 단계 수
+    :return: {단계명: 결과}
+    """
+    sorted_stages = _sort_stages(stages)
+    results = {}
+
+    if max_workers is None or max_workers <= 1:
+        for stage in sorted_stages:
+            results[stage.name] = stage.func(
+                {name: results[name] for name in stage.depends_on}
+            )
+        return results
+
+    pending = list(sorted_stages)
+    running = {}
+    error = None
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        while pending or running:
+            if error is None:
+                for stage in [
+                    stage for stage in pending if set(stage.depends_on) <= set(results)
+                ]:
+                    pending.remove(stage)
+                    future = executor.submit(
+                        _run_stage,
+                        stage,
+                        {name: results[name] for name in stage.depends_on},
+                    )
+                    running[future] = stage
+
+            if not running:
+                break
+
+            finished, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in finished:
+                stage = running.pop(future)
+                try:
+                    results[stage.name] = future.result()
+                except Exception as e:
+                    if error is None:
+                        error = e
+
+    if error is not None:
+        raise error
+
+    return results
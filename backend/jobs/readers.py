@@ -0,0 +1,345 @@
+import json
+import os
+import zlib
+from collections import namedtuple
+from contextlib import ExitStack
+
+from django.core.exceptions import ValidationError
+
+from jobs.checkpoint import file_identity
+from jobs.formats import (
+    FORMAT_COLUMNAR,
+    FORMAT_CSV,
+    FORMAT_GZIP,
+    STDIN_PATH,
+    detect_format,
+    open_rows,
+    open_writer,
+)
+
+# CSV 스키마별 row 레코드
+AssetGroupRow = namedtuple("AssetGroupRow", ["stock_name", "isin", "asset_group"])
+AssetInfoRow = namedtuple(
+    "AssetInfoRow",
+    [
+        "user_name",
+        "brokerage",
+        "account_number",
+        "account_name",
+        "isin",
+        "current_price",
+        "quantity",
+    ],
+)
+AssetBasicRow = namedtuple("AssetBasicRow", ["account_number", "principal"])
+
+# 자산 상세 / 기본 자산 CSV 의 계좌번호 컬럼 index
+ASSET_INFO_ACCOUNT_INDEX = 2
+ASSET_BASIC_ACCOUNT_INDEX = 0
+
+# partition_csv 로 나눈 파일의 첫 컬럼 (원본 row 번호)
+SOURCE_ROW_COLUMN = "원본 row"
+
+# 나눈 파일 형식이 바뀌면 올려서 이전에 나눈 파일을 재사용하지 않음
+PARTITION_VERSION = 2
+
+# 원본 형식별 나눈 파일 확장자
+PARTITION_SUFFIXES = {
+    FORMAT_CSV: ".csv",
+    FORMAT_GZIP: ".csv.gz",
+    FORMAT_COLUMNAR: ".csv.col",
+}
+
+# 읽어들인 row - 파싱에 실패하면 record 는 None, error 에 사유
+ParsedRow = namedtuple("ParsedRow", ["row_number", "record", "error"])
+
+
+def parse_asset_group_row(row):
+    """
+    자산군 그룹 상세 CSV row 파싱
+    :param row:
+    :return: AssetGroupRow
+    """
+    stock_name, ISIN, asset_group_name = row[0], row[1], row[2]
+
+    if not (stock_name and ISIN and asset_group_name):
+        raise KeyError("row 데이터가 충분치 않습니다.")
+
+    return AssetGroupRow(stock_name, ISIN, asset_group_name)
+
+
+def parse_asset_info_row(row):
+    """
+    자산 상세 CSV row 파싱
+    :param row:
+    :return: AssetInfoRow
+    """
+    (
+        user_name,
+        brokerage,
+        account_number,
+        account_name,
+        ISIN,
+        current_price,
+        holding_quantity,
+    ) = (row[0], row[1], row[2], row[3], row[4], row[5], row[6])
+
+    if not (
+        user_name
+        and brokerage
+        and account_number
+        and account_name
+        and current_price
+        and holding_quantity
+    ):
+        raise ValidationError("row 데이터가 충분치 않습니다.")
+
+    return AssetInfoRow(
+        user_name,
+        brokerage,
+        account_number,
+        account_name,
+        ISIN,
+        float(current_price),
+        int(holding_quantity),
+    )
+
+
+def parse_asset_basic_row(row):
+    """
+    기본 자산 CSV row 파싱
+    :param row:
+    :return: AssetBasicRow
+    """
+    account_number, principal = row[0], row[1]
+
+    if not (account_number and principal):
+        raise ValidationError("row 데이터가 충분치 않습니다.")
+
+    return AssetBasicRow(account_number, principal)
+
+
+def read_rows(
+    csv_path,
+    parse_row,
+    start_row=0,
+    input_format=None,
+    row_filter=None,
+    numbered=False,
+):
+    """
+    입력 파일을 한 줄씩 읽어 ParsedRow 로 반환하는 generator
+    - 헤더는 건너뜀
+    - row 번호는 헤더를 포함해 1부터 시작 (row_filter 로 건너뛴 row 포함)
+    - numbered 면 첫 컬럼의 원본 row 번호를 사용하고 파싱 전 첫 컬럼을 제외
+    :param csv_path: 파일 경로, "-" 이면 표준입력
+    :param parse_row: row 파싱 함수
+    :param start_row: 이 row 번호까지는 건너뜀 (체크포인트 재시작)
+    :param input_format: 입력 형식 (formats.FORMAT_*), None 이면 파일 내용으로 판별
+    :param row_filter: 파싱 전 row 를 받아 False 를 반환하면 건너뜀
+    :param numbered: partition_csv 로 나눈 파일 여부
+    :return:
+    """
+    with open_rows(csv_path, input_format) as rows:
+        for idx, row in enumerate(rows):
+            if idx == 0:
+                continue
+
+            if numbered:
+                row_number, row = int(row[0]), row[1:]
+            else:
+                row_number = idx + 1
+            if row_number <= start_row:
+                continue
+
+            if row_filter is not None and not row_filter(row):
+                continue
+
+            try:
+                yield ParsedRow(row_number, parse_row(row), None)
+            except Exception as e:
+                yield ParsedRow(row_number, None, e)
+
+
+def read_chunks(
+    csv_path,
+    parse_row,
+    chunk_size,
+    start_row=0,
+    input_format=None,
+    row_filter=None,
+    numbered=False,
+):
+    """
+    read_rows 결과를 chunk_size 단위 리스트로 묶어서 반환하는 generator
+    :param csv_path:
+    :param parse_row: row 파싱 함수
+    :param chunk_size: chunk 당 row 수
+    :param start_row: 이 row 번호까지는 건너뜀 (체크포인트 재시작)
+    :param input_format: 입력 형식, None 이면 파일 내용으로 판별
+    :param row_filter: 파싱 전 row 를 받아 False 를 반환하면 건너뜀
+    :param numbered: partition_csv 로 나눈 파일 여부
+    :return:
+    """
+    chunk = []
+    for parsed_row in read_rows(
+        csv_path, parse_row, start_row, input_format, row_filter, numbered
+    ):
+        chunk.append(parsed_row)
+        if len(chunk) >= chunk_size:
+            yield chunk
+            chunk = []
+
+    if chunk:
+        yield chunk
+
+
+def partition_key(value, partition_count):
+    """
+    값을 partition 번호로 변환 - 프로세스가 달라도 같은 결과가 나오도록 crc32 사용
+    :param value:
+    :param partition_count:
+    :return:
+    """
+    return zlib.crc32(value.encode()) % partition_count
+
+
+class Shard(namedtuple("Shard", ["index", "count"])):
+    """
+    여러 호스트에 나눠 업로드할 때 이 프로세스가 맡은 계좌 범위
+    - 계좌번호의 partition_key(계좌번호, count) 가 index 인 계좌만 처리
+    - 계좌번호가 없는 row 는 빈 문자열로 보고 0번 shard 에서 실패로 기록
+    """
+
+    __slots__ = ()
+
+    def contains(self, account_number):
+        return partition_key(account_number, self.count) == self.index
+
+    def row_filter(self, key_index):
+        """
+        read_rows 용 row 필터
+        :param key_index: 계좌번호 컬럼 index
+        :return:
+        """
+
+        def contains_row(row):
+            return self.contains(row[key_index] if len(row) > key_index else "")
+
+        return contains_row
+
+
+def _partition_name(csv_path):
+    """
+    분할 파일 이름 앞부분 - 원본 확장자 (.csv / .gz / .col) 제외
+    :param csv_path:
+    :return:
+    """
+    name = os.path.basename(csv_path)
+    for suffix in (".gz", ".col"):
+        if name.endswith(suffix):
+            name = name[: -len(suffix)]
+    return os.path.splitext(name)[0] if name != STDIN_PATH else "stdin"
+
+
+def partition_csv(
+    csv_path, out_dir, partition_count, key_index, input_format=None, shard=None
+):
+    """
+    입력 파일을 key 컬럼 기준으로 partition_count 개 파일로 나눔
+    - 나눈 파일은 원본과 같은 형식 (gzip 원본을 디스크에 풀어 쓰지 않음)
+    - 같은 key 를 가진 row 는 항상 같은 파일로 감
+    - key 컬럼이 없는 row 는 0번 파일로 보내 업로드 단계에서 실패로 기록
+    - shard 가 있으면 shard 에 속한 key 의 row 만 나눔
+    - 원본이 바뀌지 않았으면 이전에 나눈 파일을 그대로 사용 (체크포인트 재시작)
+      표준입력은 매번 새로 나눔
+    - 각 row 앞에 원본 row 번호 컬럼을 붙임 (read_rows 의 numbered 로 읽음)
+    :param csv_path: 파일 경로, "-" 이면 표준입력
+    :param out_dir: 나눈 파일 저장 디렉토리
+    :param partition_count:
+    :param key_index: key 컬럼 index
+    :param input_format: 입력 형식, None 이면 파일 내용으로 판별
+    :param shard: Shard
+    :return: 나눈 파일 경로 리스트
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    input_format = input_format or detect_format(csv_path)
+    if input_format not in PARTITION_SUFFIXES:
+        raise ValueError(f"지원하지 않는 입력 형식입니다. ({input_format})")
+
+    name = _partition_name(csv_path)
+    suffix = PARTITION_SUFFIXES[input_format]
+    partition_paths = [
+        os.path.join(out_dir, f"{name}.part{idx}{suffix}")
+        for idx in range(partition_count)
+    ]
+    manifest_path = os.path.join(out_dir, f"{name}.partitions.json")
+    manifest = None
+
+    if csv_path != STDIN_PATH:
+        manifest = {
+            **file_identity(csv_path),
+            "version": PARTITION_VERSION,
+            "format": input_format,
+            "partition_count": partition_count,
+            "shard": list(shard) if shard else None,
+        }
+        try:
+            with open(manifest_path) as in_file:
+                if json.load(in_file) == manifest and all(
+                    os.path.exists(path) for path in partition_paths
+                ):
+                    return partition_paths
+        except (OSError, ValueError):
+            pass
+
+    # 나누는 도중 실패해도 이전 manifest 로 잘못 재사용하지 않도록 먼저 삭제
+    if os.path.exists(manifest_path):
+        os.remove(manifest_path)
+
+    # shard 안에서도 partition 이 고르게 나뉘도록 shard 를 정한 나머지를 제외하고 나눔
+    shard_count = shard.count if shard else 1
+    shard_index = shard.index if shard else 0
+
+    with ExitStack() as stack:
+        writers = [
+            stack.enter_context(open_writer(path, input_format))
+            for path in partition_paths
+        ]
+        rows = stack.enter_context(open_rows(csv_path, input_format))
+        for idx, row in enumerate(rows):
+            if idx == 0:
+                for writer in writers:
+                    writer.writerow([SOURCE_ROW_COLUMN, *row])
+                continue
+
+            key = row[key_index] if len(row) > key_index else ""
+            key_hash = zlib.crc32(key.encode())
+            if key_hash % shard_count != shard_index:
+                continue
+
+            writers[key_hash // shard_count % partition_count].writerow(
+                [str(idx + 1), *row]
+            )
+
+    if manifest is not None:
+        with open(manifest_path, "w") as out_file:
+            json.dump(manifest, out_file)
+
+    return partition_paths
+
+
+def remove_partitions(csv_path, out_dir):
+    """
+    partition_csv 로 나눈 파일 삭제
+    :param csv_path: 원본 파일 경로
+    :param out_dir: 나눈 파일 저장 디렉토리
+    :return:
+    """
+    name = _partition_name(csv_path)
+    for file_name in os.listdir(out_dir):
+        if file_name == f"{name}.partitions.json" or (
+            file_name.startswith(f"{name}.part")
+            and file_name.endswith(tuple(PARTITION_SUFFIXES.values()))
+        ):
+            os.remove(os.path.join(out_dir, file_name))
@@ -0,0 +1,80 @@
+import logging
+import os
+import socket
+import threading
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import connection
+from django.db.models import Q
+from django.utils import timezone
+
+from jobs.models import SchedulerLease
+
+logger = logging.getLogger(__name__)
+
+
+def process_id():
+    """
+    lease 소유 프로세스 식별자 (fork 후에도 달라지도록 매번 계산)
+    :return:
+    """
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+def acquire_lease(name, ttl, owner=None):
+    """
+    lease 획득 / 연장
+    - 만료된 lease 이거나 이미 owner 가 가진 lease 만 가져옴
+    - 조건부 UPDATE 한번으로 처리해서 동시에 호출해도 하나만 성공
+    :param name: 작업명
+    :param ttl: lease 유지 시간 (초)
+    :param owner: 기본값 현재 프로세스
+    :return: 획득 여부
+    """
+    owner = owner or process_id()
+    now = timezone.now()
+    SchedulerLease.objects.get_or_create(name=name, defaults={"expires_at": now})
+
+    return bool(
+        SchedulerLease.objects.filter(name=name)
+        .filter(Q(owner=owner) | Q(expires_at__lte=now))
+        .update(owner=owner, expires_at=now + timedelta(seconds=ttl))
+    )
+
+
+def run_exclusive(name, func, ttl=None):
+    """
+    클러스터에서 한 프로세스만 func 실행
+    - lease 를 얻지 못하면 다른 프로세스가 실행 중 / 실행 완료로 보고 건너뜀
+    - 실행하는 동안 ttl / 3 마다 lease 연장
+    - 끝난 후에도 lease 를 ttl 동안 유지해서 늦게 실행된 다른 프로세스가 다시 실행하지 않음
+    :param name: 작업명
+    :param func: 실행 함수
+    :param ttl: lease 유지 시간 (초), 기본값 SCHEDULER_LEASE_TTL
+    :return: func 결과, 건너뛰면 None
+    """
+    ttl = ttl or settings.SCHEDULER_LEASE_TTL
+    owner = process_id()
+    if not acquire_lease(name, ttl, owner):
+        logger.info("%s skipped.. (lease held by another process)", name)
+        return None
+
+    stop = threading.Event()
+
+    def renew():
+        try:
+            while not stop.wait(ttl / 3):
+                acquire_lease(name, ttl, owner)
+        except Exception:
+            logger.exception("%s lease renew failed..", name)
+        finally:
+            connection.close()
+
+    renewer = threading.Thread(target=renew, name=f"{name}-lease", daemon=True)
+    renewer.start()
+    try:
+        return func()
+    finally:
+        stop.set()
+        renewer.join()
@@ -0,0 +1,42 @@
+from rest_framework import serializers
+
+from jobs.models import CsvUploadRun, CsvUploadStageMetric
+
+
+class CsvUploadStageMetricSerializer(serializers.ModelSerializer):
+    """CSV 업로드 단계별 측정값 Serializer"""
+
+    class Meta:
+        model = CsvUploadStageMetric
+        fields = [
+            "name",
+            "status",
+            "elapsed",
+            "total_rows",
+            "success_rows",
+            "failed_rows",
+            "rows_per_sec",
+            "query_count",
+            "query_time",
+            "peak_rss_growth_kb",
+            "error",
+        ]
+
+
+class CsvUploadRunSerializer(serializers.ModelSerializer):
+    """CSV 업로드 실행 이력 Serializer"""
+
+    stages = CsvUploadStageMetricSerializer(many=True, read_only=True)
+
+    class Meta:
+        model = CsvUploadRun
+        fields = [
+            "id",
+            "status",
+            "started_at",
+            "finished_at",
+            "elapsed",
+            "peak_rss_kb",
+            "error",
+            "stages",
+        ]
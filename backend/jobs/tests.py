@@ -0,0 +1,836 @@
+import csv
+import gzip
+import io
+import json
+import logging
+import os
+import shutil
+import tempfile
+import threading
+from datetime import timedelta
+from decimal import Decimal
+from unittest import mock
+
+from django.core.management import CommandError, call_command
+from django.db import transaction
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.reverse import reverse
+
+from api.models import (
+    Account,
+    Holding,
+    Investment,
+    PortfolioSummary,
+    User,
+    UserHolding,
+)
+from backend import databases
+from benchmarks.synthetic import SyntheticDataset, write_csvs, write_fixture
+from backend.databases import JOBS_DATABASE
+from backend.processes import is_web_process, should_start_scheduler
+from jobs import upload_csv
+from jobs.checkpoint import UploadProgress
+from jobs.formats import (
+    FORMAT_COLUMNAR,
+    FORMAT_CSV,
+    FORMAT_GZIP,
+    detect_format,
+    write_columnar,
+)
+from jobs.management.commands.profile_startup import (
+    package_totals,
+    parse_importtime,
+)
+from jobs.metrics import StageMetricsCollector
+from jobs.models import AssetFingerprint, CsvUploadRun, SchedulerLease
+from jobs.pipeline import Stage, run_stages
+from jobs.readers import (
+    ASSET_INFO_ACCOUNT_INDEX,
+    Shard,
+    partition_csv,
+    read_rows,
+    remove_partitions,
+)
+from jobs.scheduler import acquire_lease, run_exclusive
+
+
+class UploadAssetGroupInfoTest(TestCase):
+    def setUp(self):
+        Holding.objects.create(name="삼성", isin="K11111", asset_group="한국주식")
+
+    def write_csv(self, rows):
+        fd, path = tempfile.mkstemp(suffix=".csv")
+        with os.fdopen(fd, "w", newline="") as out_file:
+            csv.writer(out_file).writerows(rows)
+        self.addCleanup(os.remove, path)
+        return path
+
+    def test_upload_asset_group_info(self):
+        """자산군 CSV 업로드 - 신규/중복/누락 row 처리"""
+        path = self.write_csv(
+            [
+                ["종목명", "ISIN", "자산그룹"],
+                ["LG", "K11112", "한국주식"],
+                ["삼성", "K99999", "한국주식"],
+                ["애플", "K11111", "미국주식"],
+                ["애플", "G11112", "미국주식"],
+                ["애플", "G99999", "미국주식"],
+                ["테슬라", "", "미국주식"],
+                ["구글", "G11113", "미국주식"],
+            ]
+        )
+
+        result = upload_csv.upload_asset_group_info(path, batch_size=2)
+
+        self.assertEqual(result["success_rows"], 3)
+        self.assertEqual(result["failed_rows"], 4)
+        self.assertEqual(
+            [row["error row"] for row in result["invalid_rows"]], [3, 4, 6, 7]
+        )
+        self.assertEqual(
+            set(Holding.objects.values_list("isin", flat=True)),
+            {"K11111", "K11112", "G11112", "G11113"},
+        )
+
+    def test_upload_sample_csv_twice(self):
+        """샘플 CSV 재업로드 시 모두 중복 처리"""
+        first = upload_csv.upload_asset_group_info(upload_csv.CSV_ASSET_GROUP)
+        second = upload_csv.upload_asset_group_info(upload_csv.CSV_ASSET_GROUP)
+
+        self.assertEqual(first["success_rows"], 14)
+        self.assertEqual(second["success_rows"], 0)
+        self.assertEqual(second["failed_rows"], 14)
+        self.assertEqual(Holding.objects.count(), 15)
+
+
+class UploadAssetInfoTest(TestCase):
+    def setUp(self):
+        upload_csv.upload_asset_group_info(upload_csv.CSV_ASSET_GROUP)
+
+    def test_upload_sample_csv(self):
+        """자산 상세 CSV 업로드 - 계좌/유저/투자/보유종목 생성"""
+        result = upload_csv.upload_asset_info(
+            upload_csv.CSV_ACCOUNT_ASSET, chunk_size=100
+        )
+
+        self.assertEqual(result["success_rows"], 700)
+        self.assertEqual(result["failed_rows"], 0)
+        self.assertEqual(Account.objects.count(), 50)
+        self.assertEqual(User.objects.count(), 50)
+        self.assertEqual(Investment.objects.count(), 50)
+        self.assertEqual(UserHolding.objects.count(), 700)
+
+        user_holding = UserHolding.objects.get(
+            user__account__account_number="5736692368320",
+            holding__isin="KR7360750004",
+        )
+        self.assertEqual(user_holding.quantity, 21)
+        self.assertEqual(user_holding.current_price, 8585)
+
+    def test_reupload_updates_positions(self):
+        """재업로드 시 기존 보유종목의 수량/현재가만 갱신"""
+        upload_csv.upload_asset_info(upload_csv.CSV_ACCOUNT_ASSET)
+        UserHolding.objects.update(quantity=-1, current_price=-1)
+
+        result = upload_csv.upload_asset_info(upload_csv.CSV_ACCOUNT_ASSET)
+
+        self.assertEqual(result["success_rows"], 700)
+        self.assertEqual(UserHolding.objects.count(), 700)
+        self.assertFalse(UserHolding.objects.filter(quantity=-1).exists())
+
+    def test_upload_compressed_and_columnar(self):
+        """gzip / columnar 파일 업로드 - 형식을 지정하지 않아도 CSV 와 같은 결과"""
+        tmp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, tmp_dir)
+
+        gzip_path = os.path.join(tmp_dir, "asset_info.csv.gz")
+        with open(upload_csv.CSV_ACCOUNT_ASSET, "rb") as in_file, gzip.open(
+            gzip_path, "wb"
+        ) as out_file:
+            shutil.copyfileobj(in_file, out_file)
+
+        columnar_path = os.path.join(tmp_dir, "asset_info.col")
+        self.assertEqual(
+            write_columnar(gzip_path, columnar_path, row_group_size=128), 700
+        )
+
+        for path in (gzip_path, columnar_path):
+            UserHolding.objects.update(quantity=-1, current_price=-1)
+            result = upload_csv.upload_asset_info(path, chunk_size=100)
+
+            self.assertEqual(result["success_rows"], 700)
+            self.assertEqual(result["failed_rows"], 0)
+            self.assertFalse(UserHolding.objects.filter(quantity=-1).exists())
+
+        self.assertEqual(UserHolding.objects.count(), 700)
+
+
+class InputFormatTest(TestCase):
+    def test_formats_yield_same_rows(self):
+        """csv / gzip / columnar 형식별 같은 row 반환 (파싱 실패 row 포함)"""
+        tmp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, tmp_dir)
+
+        rows = [
+            ["종목명", "ISIN", "자산그룹"],
+            ["삼성", "K11111", "한국주식"],
+            ["LG", "", "한국주식"],
+            ["애플, Inc", "G11112", "미국주식"],
+            ["구글", "G11113"],
+        ]
+        csv_path = os.path.join(tmp_dir, "asset_group.csv")
+        with open(csv_path, "w", newline="") as out_file:
+            csv.writer(out_file).writerows(rows)
+
+        gzip_path = os.path.join(tmp_dir, "asset_group.csv.gz")
+        with gzip.open(gzip_path, "wt", newline="") as out_file:
+            csv.writer(out_file).writerows(rows)
+
+        columnar_path = os.path.join(tmp_dir, "asset_group.col")
+        write_columnar(csv_path, columnar_path, row_group_size=2)
+
+        def read(path, input_format=None):
+            return [
+                (row_number, record, str(error))
+                for row_number, record, error in read_rows(
+                    path, upload_csv.parse_asset_group_row, input_format=input_format
+                )
+            ]
+
+        expected = read(csv_path, FORMAT_CSV)
+        self.assertEqual(len(expected), 4)
+        self.assertEqual(expected[2][1].stock_name, "애플, Inc")
+        self.assertEqual(read(csv_path), expected)
+        self.assertEqual(read(gzip_path), expected)
+        self.assertEqual(read(gzip_path, FORMAT_GZIP), expected)
+        # columnar 는 컬럼이 모자란 row 를 빈 값으로 채우므로 마지막 row 만 다름
+        self.assertEqual(read(columnar_path, FORMAT_COLUMNAR)[:3], expected[:3])
+        self.assertIsNone(read(columnar_path)[3][1])
+
+    def test_partitions_keep_input_format(self):
+        """나눈 파일은 원본과 같은 형식이고, 합치면 원본과 같은 row (원본 row 번호)"""
+        tmp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, tmp_dir)
+
+        gzip_path = os.path.join(tmp_dir, "asset_info.csv.gz")
+        with open(upload_csv.CSV_ACCOUNT_ASSET, "rb") as in_file, gzip.open(
+            gzip_path, "wb"
+        ) as out_file:
+            shutil.copyfileobj(in_file, out_file)
+        columnar_path = os.path.join(tmp_dir, "asset_info.col")
+        write_columnar(upload_csv.CSV_ACCOUNT_ASSET, columnar_path)
+
+        def read(path, numbered=False):
+            return [
+                (row_number, record)
+                for row_number, record, _ in read_rows(
+                    path, upload_csv.parse_asset_info_row, numbered=numbered
+                )
+            ]
+
+        expected = read(upload_csv.CSV_ACCOUNT_ASSET)
+        for path, input_format in (
+            (upload_csv.CSV_ACCOUNT_ASSET, FORMAT_CSV),
+            (gzip_path, FORMAT_GZIP),
+            (columnar_path, FORMAT_COLUMNAR),
+        ):
+            out_dir = os.path.join(tmp_dir, input_format)
+            partition_paths = partition_csv(path, out_dir, 2, ASSET_INFO_ACCOUNT_INDEX)
+
+            self.assertEqual(
+                [detect_format(partition) for partition in partition_paths],
+                [input_format] * 2,
+            )
+            self.assertEqual(
+                sorted(
+                    row
+                    for partition in partition_paths
+                    for row in read(partition, True)
+                ),
+                expected,
+            )
+
+            remove_partitions(path, out_dir)
+            self.assertEqual(os.listdir(out_dir), [])
+
+
+class CalculateAccountTotalAssetTest(TestCase):
+    def setUp(self):
+        upload_csv.upload_asset_group_info(upload_csv.CSV_ASSET_GROUP)
+        self.result = upload_csv.upload_asset_info(upload_csv.CSV_ACCOUNT_ASSET)
+
+    def expected_total_assets(self, account):
+        return sum(
+            Decimal(str(user_holding.current_price)) * user_holding.quantity
+            for user_holding in account.user.user_holdings.all()
+        )
+
+    def test_calculate_all_accounts(self):
+        """전체 계좌 총 자산 계산 - 계좌 묶음 단위로 집계"""
+        # 묶음(20개씩 3묶음)마다 계좌 id / 집계 / UPDATE 와 savepoint + 마지막 빈 계좌 id 조회
+        with self.assertNumQueries(3 * 5 + 1):
+            updated_count = upload_csv.calculate_account_total_asset(batch_size=20)
+
+        self.assertEqual(updated_count, 50)
+        for account in Account.objects.all():
+            self.assertEqual(account.total_assets, self.expected_total_assets(account))
+
+    def test_calculate_changed_accounts(self):
+        """증분 모드 - 지정한 계좌만 다시 계산"""
+        changed_account = Account.objects.get(account_number="5736692368320")
+
+        updated_count = upload_csv.calculate_account_total_asset([changed_account.id])
+
+        self.assertEqual(updated_count, 1)
+        self.assertEqual(
+            Account.objects.get(id=changed_account.id).total_assets,
+            self.expected_total_assets(changed_account),
+        )
+        self.assertEqual(Account.objects.filter(total_assets=0).count(), 49)
+        self.assertEqual(len(self.result["changed_account_ids"]), 50)
+
+
+class UploadCheckpointTest(TestCase):
+    def setUp(self):
+        self.state_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.state_dir)
+
+        fd, self.path = tempfile.mkstemp(suffix=".csv")
+        with os.fdopen(fd, "w", newline="") as out_file:
+            csv.writer(out_file).writerows(
+                [
+                    ["종목명", "ISIN", "자산그룹"],
+                    ["삼성", "K11111", "한국주식"],
+                    ["LG", "", "한국주식"],
+                    ["애플", "G11112", "미국주식"],
+                    ["구글", "G11113", "미국주식"],
+                    ["테슬라", "G11114", "미국주식"],
+                    ["", "G11115", "미국주식"],
+                ]
+            )
+        self.addCleanup(os.remove, self.path)
+
+    def test_resume_from_checkpoint(self):
+        """중간에 실패한 업로드는 마지막 커밋된 chunk 이후부터 재시작"""
+        commit = UploadProgress.commit
+        calls = []
+
+        def crash_on_second_commit(progress, row_number):
+            commit(progress, row_number)
+            calls.append(row_number)
+            if len(calls) == 2:
+                raise RuntimeError("crash")
+
+        with mock.patch.object(UploadProgress, "commit", crash_on_second_commit):
+            with self.assertRaises(RuntimeError):
+                upload_csv.upload_asset_group_info(
+                    self.path, batch_size=2, state_dir=self.state_dir
+                )
+
+        self.assertEqual(Holding.objects.count(), 3)
+
+        result = upload_csv.upload_asset_group_info(
+            self.path, batch_size=2, state_dir=self.state_dir
+        )
+
+        self.assertEqual(result["resumed_from_row"], 5)
+        self.assertEqual(result["success_rows"], 1)
+        self.assertEqual(result["failed_rows"], 1)
+        self.assertEqual(Holding.objects.count(), 4)
+
+        with open(result["error_file"]) as in_file:
+            error_rows = [json.loads(line)["error row"] for line in in_file]
+        self.assertEqual(error_rows, [3, 7])
+        self.assertEqual(
+            [name for name in os.listdir(self.state_dir) if "checkpoint" in name], []
+        )
+
+
+class CsvPipelineTest(TestCase):
+    def setUp(self):
+        self.state_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.state_dir)
+
+    def test_run_stages_in_dependency_order(self):
+        """선행 단계가 끝난 후에만 다음 단계 실행, 독립 단계는 병렬 실행"""
+        finished = []
+        barrier = threading.Barrier(2, timeout=5)
+
+        def independent(name):
+            def run(results):
+                barrier.wait()
+                finished.append(name)
+                return name
+
+            return run
+
+        def merge(results):
+            finished.append("merge")
+            return sorted(results.values())
+
+        results = run_stages(
+            [
+                Stage("merge", merge, ("a", "b")),
+                Stage("a", independent("a"), ()),
+                Stage("b", independent("b"), ()),
+            ],
+            max_workers=2,
+        )
+
+        self.assertEqual(results["merge"], ["a", "b"])
+        self.assertEqual(finished[-1], "merge")
+
+        with self.assertRaises(ValueError):
+            run_stages([Stage("a", merge, ("b",)), Stage("b", merge, ("a",))])
+
+    def test_partitioned_csv_pipeline(self):
+        """자산 상세 파일을 계좌 기준으로 나눠 업로드해도 전체 결과는 동일"""
+        stages = upload_csv.build_csv_pipeline(
+            upload_csv.CSV_ASSET_GROUP,
+            upload_csv.CSV_ACCOUNT_ASSET,
+            upload_csv.CSV_ACCOUNT_BASIC,
+            self.state_dir,
+            partition_count=3,
+        )
+        results = run_stages(stages)
+
+        self.assertEqual(
+            sum(results[f"asset_info_{idx}"]["success_rows"] for idx in range(3)), 700
+        )
+        self.assertEqual(results["total_asset"], 50)
+        self.assertEqual(results["portfolio_summary"], 50)
+        self.assertEqual(PortfolioSummary.objects.count(), 50)
+        self.assertEqual(results["snapshot"]["positions"], 700)
+        self.assertEqual(results["snapshot"]["accounts"], 50)
+        self.assertEqual(UserHolding.objects.count(), 700)
+        self.assertFalse(Account.objects.filter(total_assets=0).exists())
+        self.assertFalse(Investment.objects.filter(principal=None).exists())
+
+    def test_partition_reports_source_row_numbers(self):
+        """나눈 파일에서 실패한 row 는 원본 파일의 row 번호로 기록"""
+        csv_path = os.path.join(self.state_dir, "asset_info.csv")
+        with open(csv_path, "w", newline="") as out_file:
+            writer = csv.writer(out_file)
+            writer.writerow(["고객이름", "증권사", "계좌번호", "계좌명", "ISIN", "현재가", "보유수량"])
+            for idx in range(10):
+                writer.writerow(["홍길동", "디셈버증권", f"{idx:013d}", "계좌", "X", 1, 1])
+
+        partition_dir = os.path.join(self.state_dir, "partitions")
+        error_rows = []
+        for partition_path in partition_csv(
+            csv_path, partition_dir, 3, ASSET_INFO_ACCOUNT_INDEX
+        ):
+            result = upload_csv.upload_asset_info(
+                partition_path, state_dir=self.state_dir, numbered=True
+            )
+            self.assertEqual(
+                [row["error row"] for row in result["invalid_rows"]],
+                sorted(row["error row"] for row in result["invalid_rows"]),
+            )
+            with open(result["error_file"]) as in_file:
+                file_rows = [json.loads(line)["error row"] for line in in_file]
+            self.assertEqual(
+                file_rows, [row["error row"] for row in result["invalid_rows"]]
+            )
+            error_rows.extend(file_rows)
+
+        self.assertEqual(sorted(error_rows), list(range(2, 12)))
+
+    def test_sharded_csv_pipeline(self):
+        """계좌번호 기준 shard 별로 나눠 실행해도 계좌가 겹치지 않고 전체 결과는 동일"""
+        shard_accounts = []
+        for shard_index in range(2):
+            shard = Shard(shard_index, 2)
+            before = set(Account.objects.values_list("account_number", flat=True))
+            results = run_stages(
+                upload_csv.build_csv_pipeline(
+                    upload_csv.CSV_ASSET_GROUP,
+                    upload_csv.CSV_ACCOUNT_ASSET,
+                    upload_csv.CSV_ACCOUNT_BASIC,
+                    os.path.join(self.state_dir, f"shard{shard_index}"),
+                    partition_count=2,
+                    shard=shard,
+                )
+            )
+            accounts = (
+                set(Account.objects.values_list("account_number", flat=True)) - before
+            )
+            self.assertTrue(accounts)
+            self.assertTrue(all(shard.contains(number) for number in accounts))
+            self.assertEqual(results["snapshot"]["accounts"], len(accounts))
+            shard_accounts.append(accounts)
+
+        self.assertFalse(shard_accounts[0] & shard_accounts[1])
+        self.assertEqual(Account.objects.count(), 50)
+        self.assertEqual(UserHolding.objects.count(), 700)
+        self.assertFalse(Investment.objects.filter(principal=None).exists())
+
+    def test_dry_run_command(self):
+        """dry-run 은 DB 에 반영하지 않고 파일만 검증"""
+        stdout = io.StringIO()
+        call_command("run_csv_uploader", "--dry-run", stdout=stdout)
+
+        results = json.loads(stdout.getvalue())
+        self.assertEqual(results["asset_group"]["success_rows"], 14)
+        self.assertEqual(results["asset_info"]["success_rows"], 700)
+        self.assertEqual(results["asset_basic"]["failed_rows"], 0)
+        self.assertFalse(Holding.objects.exists())
+        self.assertFalse(Account.objects.exists())
+
+        fd, path = tempfile.mkstemp(suffix=".csv")
+        with os.fdopen(fd, "w", newline="") as out_file:
+            csv.writer(out_file).writerows(
+                [["계좌번호", "투자원금"], ["0000000000000", "1000"]]
+            )
+        self.addCleanup(os.remove, path)
+
+        with self.assertRaises(CommandError):
+            call_command(
+                "run_csv_uploader", "--dry-run", "--asset-basic", path, stdout=stdout
+            )
+
+    def test_delta_ingestion(self):
+        """이전 실행과 같은 row 는 건너뛰고, 바뀐 row 만 반영 / 빠진 row 는 삭제"""
+        csv_asset_info = os.path.join(
+            self.state_dir, os.path.basename(upload_csv.CSV_ACCOUNT_ASSET)
+        )
+        shutil.copy(upload_csv.CSV_ACCOUNT_ASSET, csv_asset_info)
+
+        def run_pipeline():
+            return run_stages(
+                upload_csv.build_csv_pipeline(
+                    upload_csv.CSV_ASSET_GROUP,
+                    csv_asset_info,
+                    upload_csv.CSV_ACCOUNT_BASIC,
+                    self.state_dir,
+                    partition_count=2,
+                )
+            )
+
+        run_pipeline()
+        results = run_pipeline()
+
+        self.assertEqual(
+            sum(results[f"asset_info_{idx}"]["unchanged_rows"] for idx in range(2)),
+            700,
+        )
+        self.assertEqual(results["total_asset"], 0)
+
+        # 첫 row 는 수량 변경, 두번째 row 는 삭제
+        with open(csv_asset_info) as in_file:
+            rows = list(csv.reader(in_file))
+        rows[1][6] = "22"
+        del rows[2]
+        with open(csv_asset_info, "w", newline="") as out_file:
+            csv.writer(out_file).writerows(rows)
+
+        results = run_pipeline()
+
+        self.assertEqual(
+            sum(results[f"asset_info_{idx}"]["unchanged_rows"] for idx in range(2)),
+            698,
+        )
+        self.assertEqual(results["asset_info_delta"]["deleted_rows"], 1)
+        self.assertEqual(results["total_asset"], 1)
+        self.assertEqual(UserHolding.objects.count(), 699)
+        self.assertEqual(
+            UserHolding.objects.get(
+                user__account__account_number="5736692368320",
+                holding__isin="KR7360750004",
+            ).quantity,
+            22,
+        )
+
+    def test_delta_ingestion_across_hosts(self):
+        """fingerprint 는 DB 에 저장 - 다른 호스트가 바꾼 row 도 다음 실행에서 비교됨"""
+        csv_asset_info = os.path.join(
+            self.state_dir, os.path.basename(upload_csv.CSV_ACCOUNT_ASSET)
+        )
+        with open(upload_csv.CSV_ACCOUNT_ASSET) as in_file:
+            rows = list(csv.reader(in_file))
+        original_quantity = int(rows[1][6])
+
+        def run_pipeline(host, quantity):
+            rows[1][6] = str(quantity)
+            with open(csv_asset_info, "w", newline="") as out_file:
+                csv.writer(out_file).writerows(rows)
+            run_stages(
+                upload_csv.build_csv_pipeline(
+                    upload_csv.CSV_ASSET_GROUP,
+                    csv_asset_info,
+                    upload_csv.CSV_ACCOUNT_BASIC,
+                    os.path.join(self.state_dir, host),
+                    partition_count=1,
+                )
+            )
+            return UserHolding.objects.get(
+                user__account__account_number=rows[1][2], holding__isin=rows[1][4]
+            ).quantity
+
+        # 호스트 A -> B -> A 순서로 수량이 원래값 -> 변경 -> 원래값
+        self.assertEqual(run_pipeline("host-a", original_quantity), original_quantity)
+        self.assertEqual(
+            run_pipeline("host-b", original_quantity + 5), original_quantity + 5
+        )
+        self.assertEqual(run_pipeline("host-a", original_quantity), original_quantity)
+        self.assertEqual(AssetFingerprint.objects.count(), 700)
+
+    @staticmethod
+    def positions():
+        return {
+            "holdings": set(
+                UserHolding.objects.values_list(
+                    "user__account__account_number",
+                    "user__user_name",
+                    "user__investment__brokerage",
+                    "holding__isin",
+                    "quantity",
+                    "current_price",
+                )
+            ),
+            "accounts": set(
+                Account.objects.values_list(
+                    "account_number", "total_assets", "user__investment__principal"
+                )
+            ),
+        }
+
+    def test_synthetic_dataset(self):
+        """seed 고정 합성 데이터 - 같은 파일이 만들어지고, 업로드 결과는 fixture 와 같음"""
+        dataset = SyntheticDataset(300, holdings_per_account=7, stocks=20, seed=3)
+        paths = write_csvs(dataset, os.path.join(self.state_dir, "csv"))
+        again = write_csvs(
+            SyntheticDataset(300, holdings_per_account=7, stocks=20, seed=3),
+            os.path.join(self.state_dir, "again"),
+            FORMAT_GZIP,
+        )
+        for kind, path in paths.items():
+            with open(path, "rb") as in_file, gzip.open(again[kind]) as gz_file:
+                self.assertEqual(in_file.read(), gz_file.read())
+
+        fixture = os.path.join(self.state_dir, "fixture.json")
+        self.assertEqual(write_fixture(dataset, fixture), 20 + 43 * 3 + 300)
+        with transaction.atomic():
+            call_command("loaddata", fixture, verbosity=0)
+            expected = self.positions()
+            transaction.set_rollback(True)
+        self.assertEqual(len(expected["holdings"]), 300)
+
+        results = run_stages(
+            upload_csv.build_csv_pipeline(
+                paths["asset_group"],
+                paths["asset_info"],
+                paths["asset_basic"],
+                os.path.join(self.state_dir, "state"),
+                partition_count=2,
+            )
+        )
+
+        self.assertEqual(
+            sum(results[f"asset_info_{idx}"]["failed_rows"] for idx in range(2)), 0
+        )
+        self.assertEqual(results["asset_basic"]["failed_rows"], 0)
+        self.assertEqual(Account.objects.count(), 43)
+        self.assertEqual(self.positions(), expected)
+
+    def run_uploader(self, stage_funcs, max_workers):
+        requested = {}
+        os.makedirs(os.path.join(self.state_dir, "partitions"), exist_ok=True)
+
+        def build_csv_pipeline(*args, partition_count, **kwargs):
+            requested["partition_count"] = partition_count
+            return [Stage(name, func, ()) for name, func in stage_funcs.items()]
+
+        with mock.patch.object(
+            upload_csv, "build_csv_pipeline", build_csv_pipeline
+        ), mock.patch.object(
+            upload_csv.logging, "FileHandler", return_value=logging.NullHandler()
+        ):
+            upload_csv.execute_csv_uploader(
+                max_workers=max_workers, state_dir=self.state_dir
+            )
+
+        return requested
+
+    @override_settings(JOBS_DATABASE_POOL_SIZE=3)
+    def test_uploader_uses_jobs_database(self):
+        """
+        업로드 단계는 pool 스레드에서도 jobs alias 사용, 스레드 수는 커넥션 수 안으로
+        - 동시 쓰기가 되는 DB 엔진이면 여러 단계를 동시에 실행
+        """
+        requested = {}
+        barrier = threading.Barrier(2, timeout=5)
+
+        def stage(name):
+            def run(results):
+                # a / b 는 동시에 실행되어야 통과
+                if name != "c":
+                    barrier.wait()
+                requested[name] = databases._database.get()
+                return 0
+
+            return run
+
+        # 동시 쓰기가 되는 DB 엔진처럼 실행 (단계는 DB 에 쓰지 않음)
+        with mock.patch.object(upload_csv, "SERIAL_WRITE_ENGINES", ()):
+            self.assertEqual(upload_csv.stage_workers(8), 2)
+            requested.update(
+                self.run_uploader({name: stage(name) for name in "abc"}, 8)
+            )
+
+        self.assertEqual(
+            requested,
+            {
+                "partition_count": 2,
+                "a": JOBS_DATABASE,
+                "b": JOBS_DATABASE,
+                "c": JOBS_DATABASE,
+            },
+        )
+        self.assertEqual(CsvUploadRun.objects.get().status, CsvUploadRun.STATUS_SUCCESS)
+
+    @override_settings(JOBS_DATABASE_POOL_SIZE=8)
+    def test_uploader_runs_serially_on_sqlite(self):
+        """sqlite 는 쓰기 트랜잭션을 동시에 열 수 없어 단계를 하나씩 실행"""
+        threads = set()
+
+        def run(results):
+            threads.add(threading.get_ident())
+            return 0
+
+        requested = self.run_uploader({"a": run, "b": run, "c": run}, 4)
+
+        self.assertEqual(upload_csv.stage_workers(4), 1)
+        self.assertEqual(requested, {"partition_count": 1})
+        self.assertEqual(len(threads), 1)
+
+    def test_stage_metrics_run_history(self):
+        """단계별 측정값이 실행 이력에 저장되고 API 로 조회됨"""
+        stages = upload_csv.build_csv_pipeline(
+            upload_csv.CSV_ASSET_GROUP,
+            upload_csv.CSV_ACCOUNT_ASSET,
+            upload_csv.CSV_ACCOUNT_BASIC,
+            self.state_dir,
+            partition_count=1,
+        )
+        run = CsvUploadRun.objects.create()
+        collector = StageMetricsCollector()
+        run_stages(collector.instrument(stages))
+        collector.save(run)
+
+        response = self.client.get(reverse("csv-upload-runs"))
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json()[0]["status"], CsvUploadRun.STATUS_SUCCESS)
+
+        stages = {stage["name"]: stage for stage in response.json()[0]["stages"]}
+        self.assertEqual(stages["asset_info_0"]["success_rows"], 700)
+        self.assertGreater(stages["asset_info_0"]["query_count"], 0)
+        self.assertEqual(stages["total_asset"]["total_rows"], 50)
+        self.assertGreaterEqual(stages["asset_info_0"]["peak_rss_growth_kb"], 0)
+
+        response = self.client.get(reverse("csv-upload-run", args=[run.id]))
+        self.assertEqual(response.json()["peak_rss_kb"], run.peak_rss_kb)
+
+        response = self.client.get(reverse("csv-upload-run", args=[run.id + 1]))
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+
+class ProfileStartupTest(SimpleTestCase):
+    # python -X importtime 출력 형식 (하위 import 는 2칸씩 들여씀)
+    IMPORTTIME_SAMPLE = "\n".join(
+        [
+            "import time: self [us] | cumulative | imported package",
+            "import time:       120 |        120 | _io",
+            "import time:        80 |         80 |   django.utils.version",
+            "import time:       200 |        280 | django",
+            "import time:        50 |         50 |     rest_framework.compat",
+            "import time:        40 |         90 |   rest_framework.settings",
+            "import time:        25 |        115 | rest_framework",
+            "Traceback (most recent call last):",
+        ]
+    )
+
+    def test_parse_importtime(self):
+        """-X importtime 출력을 모듈별 / 최상위 패키지별로 집계"""
+        rows = parse_importtime(self.IMPORTTIME_SAMPLE)
+
+        self.assertEqual(
+            rows,
+            [
+                ("_io", 120, 120, 0),
+                ("django.utils.version", 80, 80, 1),
+                ("django", 200, 280, 0),
+                ("rest_framework.compat", 50, 50, 2),
+                ("rest_framework.settings", 40, 90, 1),
+                ("rest_framework", 25, 115, 0),
+            ],
+        )
+        self.assertEqual(
+            package_totals(rows), {"_io": 120, "django": 280, "rest_framework": 115}
+        )
+        self.assertEqual(parse_importtime(""), [])
+
+
+class SchedulerLeaseTest(TestCase):
+    def test_is_web_process(self):
+        """웹 서버 / runserver 서버 프로세스만 스케쥴러 시작"""
+        self.assertTrue(is_web_process(["/venv/bin/gunicorn", "backend.wsgi"], {}))
+        self.assertTrue(
+            is_web_process(["manage.py", "runserver"], {"RUN_MAIN": "true"})
+        )
+        self.assertTrue(is_web_process(["manage.py", "runserver", "--noreload"], {}))
+        self.assertFalse(is_web_process(["manage.py", "runserver"], {}))
+        self.assertFalse(is_web_process(["manage.py", "test"], {}))
+        self.assertFalse(is_web_process(["manage.py", "run_csv_uploader"], {}))
+
+    def test_is_web_process_module_launch(self):
+        """python -m gunicorn / uvicorn 으로 실행해도 웹 프로세스"""
+        for module in ("gunicorn", "uvicorn"):
+            with self.subTest(module=module):
+                orig_argv = ["python", "-m", module, "backend.asgi:application"]
+                self.assertTrue(
+                    is_web_process(
+                        [f"/venv/lib/{module}/__main__.py", "backend.asgi:application"],
+                        {},
+                        orig_argv,
+                    )
+                )
+                self.assertTrue(
+                    is_web_process(["-m", "backend.asgi:application"], {}, orig_argv)
+                )
+
+        self.assertFalse(
+            is_web_process(["/venv/lib/pip/__main__.py", "list"], {}, ["python"])
+        )
+        self.assertFalse(is_web_process(["-m"], {}, ["python", "-m", "pytest"]))
+
+    def test_should_start_scheduler(self):
+        """RUN_SCHEDULER 가 있으면 웹 프로세스 여부와 관계없이 그 값을 따름"""
+        gunicorn = ["/venv/bin/gunicorn", "backend.wsgi"]
+        launcher = ["/srv/bin/launch", "--port", "8000"]
+
+        self.assertTrue(should_start_scheduler(gunicorn, {}, []))
+        self.assertFalse(should_start_scheduler(launcher, {}, []))
+        self.assertTrue(should_start_scheduler(launcher, {"RUN_SCHEDULER": "1"}, []))
+        self.assertTrue(should_start_scheduler(launcher, {"RUN_SCHEDULER": "true"}, []))
+        self.assertFalse(should_start_scheduler(gunicorn, {"RUN_SCHEDULER": "0"}, []))
+
+    def test_only_one_owner_runs(self):
+        """lease 를 가진 프로세스만 실행, 만료 후에는 다른 프로세스가 가져감"""
+        self.assertTrue(acquire_lease("job", 60, owner="host-a:1"))
+        self.assertTrue(acquire_lease("job", 60, owner="host-a:1"))
+        self.assertFalse(acquire_lease("job", 60, owner="host-b:2"))
+
+        calls = []
+        self.assertIsNone(run_exclusive("job", lambda: calls.append(1), ttl=60))
+        self.assertEqual(calls, [])
+
+        SchedulerLease.objects.filter(name="job").update(
+            expires_at=timezone.now() - timedelta(seconds=1)
+        )
+        self.assertEqual(run_exclusive("job", lambda: "done", ttl=60), "done")
+        # 실행이 끝난 후에도 ttl 동안은 다른 프로세스가 실행하지 않음
+        self.assertFalse(acquire_lease("job", 60, owner="host-a:1"))
@@ -1,20 +1,36 @@
 import logging
 import os
 
-from apscheduler.schedulers.background import BackgroundScheduler
-from apscheduler.triggers.cron import CronTrigger
-
+from django.conf import settings
 from django.core.exceptions import ValidationError
 
-import csv
-
-from django.db import transaction
+from django.db import connections, transaction
 
 # os.environ.setdefault("DJANGO_SETTINGS_MODULE", "backend.settings.local")
 # django.setup()
 
+from api.cache import invalidate_account_screens
 from api.models import Holding, User, Account, Investment, UserHolding
-from backend.settings.base import TIME_ZONE
+from api.snapshots import write_snapshots
+from api.summary import refresh_portfolio_summaries
+from api.valuation import PositionColumns, from_minor_units
+from backend.databases import JOBS_DATABASE, use_database, write_database
+from jobs.checkpoint import UploadProgress
+from jobs.fingerprints import FingerprintStore, row_fingerprint, row_key
+from jobs.metrics import StageMetricsCollector
+from jobs.models import CsvUploadRun
+from jobs.pipeline import Stage, run_stages
+from jobs.readers import (
+    ASSET_BASIC_ACCOUNT_INDEX,
+    ASSET_INFO_ACCOUNT_INDEX,
+    parse_asset_basic_row,
+    parse_asset_group_row,
+    parse_asset_info_row,
+    partition_csv,
+    read_chunks,
+    remove_partitions,
+)
+from jobs.scheduler import run_exclusive
 
 dir_path = os.path.dirname(os.path.realpath(__file__))
 
@@ -23,200 +39,798 @@ CSV_ACCOUNT_BASIC = os.path.join(dir_path, "csv/account_basic_info_set.csv")
 CSV_ASSET_GROUP = os.path.join(dir_path, "csv/asset_group_info_set.csv")
 
 
-def upload_asset_group_info(csv_asset_group):
+# bulk_create / bulk_update 한번에 처리할 row 수
+BULK_BATCH_SIZE = 1000
+
+# 체크포인트 / 에러 파일 저장 디렉토리
+STATE_DIR = os.path.join(dir_path, "../csv_uploader_state")
+
+# 파이프라인 동시 실행 단계 수 - 단계마다 DB 커넥션을 하나씩 사용
+PIPELINE_MAX_WORKERS = min(os.cpu_count() or 1, 4)
+
+# 쓰기 트랜잭션을 동시에 열 수 없는 DB 엔진 - 단계를 하나씩 실행
+SERIAL_WRITE_ENGINES = ("django.db.backends.sqlite3",)
+
+
+def upload_asset_group_info(
+    csv_asset_group, batch_size=BULK_BATCH_SIZE, state_dir=None, input_format=None
+):
     """
     자산군 그룹 상세 CSV File Upload
+    - 기존 종목명/ISIN 을 한번에 조회해 메모리에서 중복 검사
+    - 신규 종목은 batch_size 단위로 모아 bulk_create
     :param csv_asset_group:
+    :param batch_size: bulk_create 단위 row 수
+    :param state_dir: 체크포인트 / 에러 파일 디렉토리
+    :param input_format: 입력 형식 (formats.FORMAT_*), None 이면 파일 내용으로 판별
     :return:
     """
-    with open(csv_asset_group) as in_file:
-        data_reader = csv.reader(in_file)
-        result = {
-            "total_csv_rows": 0,
-            "success_rows": 0,
-            "failed_rows": 0,
-            "invalid_rows": [],
-        }
-        for idx, row in enumerate(data_reader):
-            # 헤더는 건너뜀
-            if idx == 0:
-                continue
+    # 중복 검사용 기존 종목명 / ISIN
+    holding_names = set(Holding.objects.values_list("name", flat=True))
+    holding_isins = set(Holding.objects.values_list("isin", flat=True))
+
+    with UploadProgress(csv_asset_group, state_dir) as progress:
+        for chunk in read_chunks(
+            csv_asset_group,
+            parse_asset_group_row,
+            batch_size,
+            progress.start_row,
+            input_format,
+        ):
+            pending_holdings = []
+            for row_number, record, error in chunk:
+                try:
+                    if error:
+                        raise error
+
+                    # 중복되지 않은 자산군인 데이터만 생성
+                    if record.stock_name in holding_names:
+                        raise ValidationError("중복된 종목명이 존재합니다.")
+
+                    if record.isin in holding_isins:
+                        raise ValidationError("중복된 ISIN이 존재합니다.")
+
+                except Exception as e:
+                    progress.add_invalid_row(row_number, e)
+                    continue
+
+                # 같은 파일 안의 중복도 걸러지도록 바로 반영
+                holding_names.add(record.stock_name)
+                holding_isins.add(record.isin)
+                pending_holdings.append(
+                    (
+                        row_number,
+                        Holding(
+                            name=record.stock_name,
+                            isin=record.isin,
+                            asset_group=record.asset_group,
+                        ),
+                    )
+                )
 
             try:
-                stock_name, ISIN, asset_group_name = row[0], row[1], row[2]
+                with transaction.atomic(using=write_database()):
+                    Holding.objects.bulk_create(
+                        [holding for _, holding in pending_holdings],
+                        batch_size=batch_size,
+                    )
+            except Exception as e:
+                # 저장에 실패하면 해당 묶음의 row 를 모두 실패로 기록
+                for row_number, holding in pending_holdings:
+                    holding_names.discard(holding.name)
+                    holding_isins.discard(holding.isin)
+                    progress.add_invalid_row(row_number, e)
+            else:
+                progress.add_success_rows(len(pending_holdings))
 
-                # 중복되지 않은 자산군인 데이터만 생성
-                if not (stock_name and ISIN and asset_group_name):
-                    raise KeyError("row 데이터가 충분치 않습니다.")
+            progress.commit(chunk[-1].row_number)
 
-                if Holding.objects.filter(name=stock_name):
-                    raise ValidationError("중복된 종목명이 존재합니다.")
+    return progress.result
 
-                if Holding.objects.filter(isin=ISIN):
-                    raise ValidationError("중복된 ISIN이 존재합니다.")
 
-                Holding.objects.create(
-                    name=stock_name, isin=ISIN, asset_group=asset_group_name
-                )
-                result["success_rows"] += 1
+def _apply_asset_info_chunk(records, batch_size):
+    """
+    파싱된 자산 상세 row 묶음을 DB 에 반영
+    - 모델별로 __in 쿼리 한번씩 조회해서 lookup dict 구성
+    - 없는 row 는 bulk_create, 수량/현재가는 bulk_update
+    - MySQL 은 bulk_create 후 pk 를 돌려주지 않으므로 생성 후 다시 조회
+    :param records: (AssetInfoRow, Holding) 리스트
+    :param batch_size: bulk_create / bulk_update 단위 row 수
+    :return: 보유종목이 반영된 계좌 id set
+    """
+    # 계좌
+    account_numbers = {record.account_number for record, _ in records}
+    accounts = Account.objects.in_bulk(account_numbers, field_name="account_number")
+    new_accounts = {}
+    for record, _ in records:
+        if record.account_number not in accounts:
+            new_accounts.setdefault(
+                record.account_number,
+                Account(
+                    account_number=record.account_number,
+                    account_name=record.account_name,
+                ),
+            )
+    if new_accounts:
+        Account.objects.bulk_create(new_accounts.values(), batch_size=batch_size)
+        accounts = Account.objects.in_bulk(account_numbers, field_name="account_number")
+
+    # 유저 (계좌당 한명)
+    account_ids = {account.id for account in accounts.values()}
+    users = {
+        user.account_id: user for user in User.objects.filter(account__in=account_ids)
+    }
+    new_users = {}
+    for record, _ in records:
+        account = accounts[record.account_number]
+        if account.id not in users:
+            new_users.setdefault(
+                account.id, User(account=account, user_name=record.user_name)
+            )
+    if new_users:
+        User.objects.bulk_create(new_users.values(), batch_size=batch_size)
+        users = {
+            user.account_id: user
+            for user in User.objects.filter(account__in=account_ids)
+        }
 
-            except Exception as e:
-                # raise ValidationError(str(e))
-                result["failed_rows"] += 1
-                result["invalid_rows"].append(
-                    {"error row": idx + 1, "error detail": str(e)}
+    # 투자 (유저당 하나)
+    user_ids = {user.id for user in users.values()}
+    investment_user_ids = set(
+        Investment.objects.filter(user__in=user_ids).values_list("user_id", flat=True)
+    )
+    new_investments = {}
+    for record, _ in records:
+        user = users[accounts[record.account_number].id]
+        if user.id not in investment_user_ids:
+            new_investments.setdefault(
+                user.id, Investment(user=user, brokerage=record.brokerage)
+            )
+    if new_investments:
+        Investment.objects.bulk_create(new_investments.values(), batch_size=batch_size)
+
+    # 보유종목 - 같은 (유저, 종목) 이 여러번 나오면 마지막 row 기준
+    positions = {}
+    for record, holding in records:
+        user = users[accounts[record.account_number].id]
+        positions[(user.id, holding.id)] = record
+
+    user_holdings = {
+        (user_holding.user_id, user_holding.holding_id): user_holding
+        for user_holding in UserHolding.objects.filter(
+            user__in=user_ids,
+            holding__in={holding_id for _, holding_id in positions},
+        )
+    }
+    created_user_holdings, updated_user_holdings = [], []
+    for (user_id, holding_id), record in positions.items():
+        user_holding = user_holdings.get((user_id, holding_id))
+        if user_holding is None:
+            created_user_holdings.append(
+                UserHolding(
+                    user_id=user_id,
+                    holding_id=holding_id,
+                    quantity=record.quantity,
+                    current_price=record.current_price,
                 )
-                continue
+            )
+            continue
+
+        user_holding.quantity = record.quantity
+        user_holding.current_price = record.current_price
+        updated_user_holdings.append(user_holding)
 
-            result["total_csv_rows"] += 1
+    UserHolding.objects.bulk_create(created_user_holdings, batch_size=batch_size)
+    UserHolding.objects.bulk_update(
+        updated_user_holdings, ["quantity", "current_price"], batch_size=batch_size
+    )
 
-        return result
+    return account_ids
 
 
-def upload_asset_info(csv_asset_info):
+def upload_asset_info(
+    csv_asset_info,
+    chunk_size=BULK_BATCH_SIZE,
+    state_dir=None,
+    previous_fingerprints=None,
+    input_format=None,
+    numbered=False,
+):
     """
     자산 상세 CSV File Upload
+    - chunk_size 단위로 파싱 -> 조회 -> 생성/수정 단계로 처리
+    - 종목은 chunk 에 등장하는 ISIN 을 한번만 조회하고, 현재가는 보유종목에 반영
+    - previous_fingerprints 가 있으면 이전 실행과 fingerprint 가 같은 row 는 DB 에 반영하지 않음
     :param csv_asset_info:
-    :param csv_asset_basic_info:
-    :return:
+    :param chunk_size: 한번에 처리할 row 수
+    :param state_dir: 체크포인트 / 에러 파일 디렉토리
+    :param previous_fingerprints: {(계좌번호, ISIN): fingerprint} 이전 실행 결과
+    :param input_format: 입력 형식, None 이면 파일 내용으로 판별
+    :param numbered: partition_csv 로 나눈 파일 여부 (실패 row 는 원본 row 번호로 기록)
+    :return: 결과 dict
+        - changed_account_ids : 보유종목이 반영된 계좌 id set
+        - fingerprints : 반영됐거나 바뀌지 않은 row 의 fingerprint (delta 모드)
+        - seen_keys : 파일에 있는 (계좌번호, ISIN) set (delta 모드)
+        - unkeyed_rows : 파싱에 실패해서 key 를 알 수 없는 row 수 (delta 모드)
     """
-    with open(csv_asset_info) as in_file:
-        data_reader = csv.reader(in_file)
-        result = {
-            "total_csv_rows": 0,
-            "success_rows": 0,
-            "failed_rows": 0,
-            "invalid_rows": [],
-        }
-        for idx, row in enumerate(data_reader):
-            # 헤더는 건너뜀
-            if idx == 0:
-                continue
-
+    changed_account_ids = set()
+    delta = previous_fingerprints is not None
+
+    with UploadProgress(csv_asset_info, state_dir) as progress:
+        progress.result["changed_account_ids"] = changed_account_ids
+        if delta:
+            fingerprints, seen_keys = {}, set()
+            progress.result.update(
+                {
+                    "unchanged_rows": 0,
+                    "unkeyed_rows": 0,
+                    "fingerprints": fingerprints,
+                    "seen_keys": seen_keys,
+                }
+            )
+
+        for chunk in read_chunks(
+            csv_asset_info,
+            parse_asset_info_row,
+            chunk_size,
+            progress.start_row,
+            input_format,
+            numbered=numbered,
+        ):
+            # 0. 이전 실행과 같은 row 는 건너뜀
+            if delta:
+                changed_chunk, unchanged_rows = [], 0
+                for parsed_row in chunk:
+                    if parsed_row.error is None:
+                        key = row_key(parsed_row.record)
+                        fingerprint = row_fingerprint(parsed_row.record)
+                        seen_keys.add(key)
+                        if previous_fingerprints.get(key) == fingerprint:
+                            fingerprints[key] = fingerprint
+                            unchanged_rows += 1
+                            continue
+                    else:
+                        progress.result["unkeyed_rows"] += 1
+                    changed_chunk.append(parsed_row)
+
+                progress.add_success_rows(unchanged_rows)
+                progress.result["unchanged_rows"] += unchanged_rows
+            else:
+                changed_chunk = chunk
+
+            # 1. 종목 조회 - chunk 에 등장하는 ISIN 을 한번에 조회
+            holdings = Holding.objects.in_bulk(
+                {record.isin for _, record, error in changed_chunk if error is None},
+                field_name="isin",
+            )
+
+            valid_rows, valid_records = [], []
+            for row_number, record, error in changed_chunk:
+                if error is None and record.isin not in holdings:
+                    error = "Holding matching query does not exist."
+
+                if error:
+                    progress.add_invalid_row(row_number, error)
+                    continue
+
+                valid_rows.append(row_number)
+                valid_records.append((record, holdings[record.isin]))
+
+            # 2. 계좌/유저/투자/보유종목 반영
             try:
-                (
-                    user_name,
-                    brokerage,
-                    account_number,
-                    account_name,
-                    ISIN,
-                    current_price,
-                    holding_quantity,
-                ) = (row[0], row[1], row[2], row[3], row[4], row[5], row[6])
-
-                if not (
-                    user_name
-                    and brokerage
-                    and account_number
-                    and account_name
-                    and current_price
-                    and holding_quantity
-                ):
-                    raise ValidationError("row 데이터가 충분치 않습니다.")
-
-                holding = Holding.objects.get(isin=ISIN)
-                holding.current_price = current_price
-                holding.save()
-
-                account = Account.objects.get_or_create(
-                    account_name=account_name,
-                    account_number=account_number,
-                )[0]
-
-                user = User.objects.get_or_create(account=account, name=user_name)[0]
-                investment = Investment.objects.get_or_create(
-                    user=user, brokerage=brokerage
-                )[0]
-
-                user_holding = UserHolding.objects.get_or_create(
-                    holding=holding, user=user
-                )[0]
-                user_holding.quantity = holding_quantity
-                user_holding.current_price = current_price
-                user_holding.save()
-
-                result["success_rows"] += 1
-
+                if valid_records:
+                    with transaction.atomic(using=write_database()):
+                        changed_account_ids.update(
+                            _apply_asset_info_chunk(valid_records, chunk_size)
+                        )
             except Exception as e:
-                result["failed_rows"] += 1
-                result["invalid_rows"].append(
-                    {"error row": idx + 1, "error detail": str(e)}
-                )
-                continue
+                for row_number in valid_rows:
+                    progress.add_invalid_row(row_number, e)
+            else:
+                progress.add_success_rows(len(valid_records))
+                if delta:
+                    for record, _ in valid_records:
+                        fingerprints[row_key(record)] = row_fingerprint(record)
 
-            result["total_csv_rows"] += 1
+            progress.commit(chunk[-1].row_number)
 
-        return result
+    return progress.result
 
 
-def upload_asset_basic(csv_asset_basic):
+def delete_missing_positions(keys, batch_size=BULK_BATCH_SIZE):
+    """
+    CSV 에서 빠진 보유종목 삭제
+    :param keys: 삭제할 (계좌번호, ISIN) 목록
+    :param batch_size: 한번에 조회할 계좌 수
+    :return: (삭제된 보유종목 수, 보유종목이 삭제된 계좌 id set)
+    """
+    isins_by_account = {}
+    for account_number, isin in keys:
+        isins_by_account.setdefault(account_number, set()).add(isin)
+
+    account_numbers = sorted(isins_by_account)
+    deleted_count, changed_account_ids = 0, set()
+    for idx in range(0, len(account_numbers), batch_size):
+        user_holding_ids = []
+        for (
+            user_holding_id,
+            account_id,
+            account_number,
+            isin,
+        ) in UserHolding.objects.filter(
+            user__account__account_number__in=account_numbers[idx : idx + batch_size]
+        ).values_list(
+            "id", "user__account_id", "user__account__account_number", "holding__isin"
+        ):
+            if isin in isins_by_account[account_number]:
+                user_holding_ids.append(user_holding_id)
+                changed_account_ids.add(account_id)
+
+        if user_holding_ids:
+            with transaction.atomic(using=write_database()):
+                deleted_count += UserHolding.objects.filter(
+                    id__in=user_holding_ids
+                ).delete()[0]
+
+    return deleted_count, changed_account_ids
+
+
+def upload_asset_basic(
+    csv_asset_basic,
+    chunk_size=BULK_BATCH_SIZE,
+    state_dir=None,
+    input_format=None,
+    shard=None,
+):
     """
     기본 자산 CSV File Upload
     :param csv_asset_basic:
-    :return:
+    :param chunk_size: 체크포인트 저장 단위 row 수
+    :param state_dir: 체크포인트 / 에러 파일 디렉토리
+    :param input_format: 입력 형식, None 이면 파일 내용으로 판별
+    :param shard: Shard, 있으면 shard 에 속한 계좌 row 만 반영
+    :return: 결과 dict, changed_account_ids 에 투자원금이 반영된 계좌 id set
     """
-    with open(csv_asset_basic) as in_file:
-        data_reader = csv.reader(in_file)
-        result = {
-            "total_csv_rows": 0,
-            "success_rows": 0,
-            "failed_rows": 0,
-            "invalid_rows": [],
-        }
+    changed_account_ids = set()
 
-        for idx, row in enumerate(data_reader):
-            # 헤더는 건너뜀
-            if idx == 0:
-                continue
+    with UploadProgress(csv_asset_basic, state_dir) as progress:
+        progress.result["changed_account_ids"] = changed_account_ids
+        for chunk in read_chunks(
+            csv_asset_basic,
+            parse_asset_basic_row,
+            chunk_size,
+            progress.start_row,
+            input_format,
+            shard.row_filter(ASSET_BASIC_ACCOUNT_INDEX) if shard else None,
+        ):
+            for row_number, record, error in chunk:
+                try:
+                    if error:
+                        raise error
 
-            try:
-                account_number, principal = row[0], row[1]
-                if not (account_number and principal):
-                    raise ValidationError("row 데이터가 충분치 않습니다.")
+                    account = Account.objects.get(account_number=record.account_number)
+                    investment = account.user.investment
+                    investment.principal = record.principal
+                    investment.save()
+                    changed_account_ids.add(account.id)
 
-                account = Account.objects.get(account_number=account_number)
-                investment = account.user.investment
-                investment.principal = principal
-                investment.save()
+                except Exception as e:
+                    progress.add_invalid_row(row_number, e)
+                    continue
 
-                result["success_rows"] += 1
+                progress.add_success_rows(1)
 
-            except Exception as e:
-                result["failed_rows"] += 1
-                result["invalid_rows"].append(
-                    {"error row": idx + 1, "error detail": str(e)}
-                )
-                continue
+            progress.commit(chunk[-1].row_number)
 
-            result["total_csv_rows"] += 1
-        return result
+    return progress.result
 
 
-@transaction.atomic
-def calculate_account_total_asset():
-    try:
-        users = User.objects.all()
-        for user in users:
-            user_account = user.account
-            user_account.total_assets = 0
-
-            for user_holding in user.user_holdings.all():
-                user_account.total_assets += (
-                    user_holding.current_price * user_holding.quantity
-                )
+def _account_total_assets(accounts):
+    """
+    계좌별 보유종목 평가금액 합계 (현재가 * 수량)
+    - 계좌 / 보유종목 가격 / 수량만 조회해서 valuation 모듈로 최소 단위 정수 합산 (float 오차 없음)
+    - 보유종목이 없는 계좌는 0
+    :param accounts: Account queryset
+    :return: [(계좌 id, 합계 Decimal)] 계좌 id 순서
+    """
+    rows = (
+        accounts.order_by("id")
+        .values_list(
+            "id", "user__user_holdings__current_price", "user__user_holdings__quantity"
+        )
+        .iterator(chunk_size=BULK_BATCH_SIZE)
+    )
+    return [
+        (account_id, from_minor_units(total))
+        for account_id, total in PositionColumns.from_rows(rows).totals().items()
+    ]
 
-            user_account.save()
+
+def _account_id_batches(accounts, batch_size):
+    """
+    계좌 id 를 batch_size 개씩 id 순서로 조회 (keyset 페이지네이션)
+    :param accounts: Account queryset
+    :param batch_size:
+    :return: 계좌 id 목록 generator
+    """
+    last_id = 0
+    while True:
+        account_ids = list(
+            accounts.filter(id__gt=last_id)
+            .order_by("id")
+            .values_list("id", flat=True)[:batch_size]
+        )
+        if not account_ids:
+            return
+
+        yield account_ids
+        last_id = account_ids[-1]
+
+
+def calculate_account_total_asset(account_ids=None, batch_size=BULK_BATCH_SIZE):
+    """
+    계좌 총 자산 계산
+    - batch_size 개 계좌씩 보유종목 컬럼을 조회해서 고정소수점으로 계산
+      (전체 재계산도 묶음 단위로 집계해서 메모리에 올리는 보유종목 수를 제한)
+    - 묶음마다 bulk_update, 트랜잭션을 나눠 락 점유 시간을 줄임
+    :param account_ids: 다시 계산할 계좌 id 목록, None 이면 유저가 있는 전체 계좌
+    :param batch_size: bulk_update 단위 계좌 수
+    :return: 갱신된 계좌 수
+    """
+    accounts = Account.objects.filter(user__isnull=False)
+
+    try:
+        if account_ids is None:
+            id_batches = _account_id_batches(accounts, batch_size)
+        else:
+            # 증분 모드 - IN 절이 너무 길어지지 않도록 batch_size 단위로 집계
+            account_ids = sorted(set(account_ids))
+            id_batches = (
+                account_ids[idx : idx + batch_size]
+                for idx in range(0, len(account_ids), batch_size)
+            )
+
+        batches = (
+            _account_total_assets(accounts.filter(id__in=batch_ids))
+            for batch_ids in id_batches
+        )
+
+        updated_count = 0
+        for batch in batches:
+            updated_accounts = [
+                Account(id=account_id, total_assets=total)
+                for account_id, total in batch
+            ]
+            with transaction.atomic(using=write_database()):
+                Account.objects.bulk_update(updated_accounts, ["total_assets"])
+            updated_count += len(updated_accounts)
+
+        return updated_count
 
     except Exception as e:
-        transaction.set_rollback(rollback=True)
         raise ValidationError(str(e))
 
 
-def execute_csv_uploader():
+def _changed_account_ids(results):
     """
-    Execute all csv uploader function
+    선행 업로드 단계 결과에서 바뀐 계좌 id 모음
+    - 체크포인트에서 이어서 처리한 단계가 있으면 이전 실행에서 바뀐 계좌를 알 수 없으므로 None (전체)
+    :param results: {단계명: 결과}
+    :return: 계좌 id set or None
+    """
+    upload_results = [
+        result
+        for result in results.values()
+        if isinstance(result, dict) and "changed_account_ids" in result
+    ]
+    if any(result.get("resumed_from_row") for result in upload_results):
+        return None
+
+    changed_account_ids = set()
+    for result in upload_results:
+        changed_account_ids.update(result["changed_account_ids"])
+
+    return changed_account_ids
+
+
+def _merge_asset_info_delta(asset_info_results, previous_fingerprints):
+    """
+    자산 상세 업로드 결과를 합쳐서 다음 실행에 쓸 fingerprint 와 삭제할 key 계산
+    - 체크포인트에서 이어서 처리했거나 key 를 알 수 없는 row 가 있으면 파일 전체 key 를
+      알 수 없으므로 삭제는 다음 실행으로 미룸 (이전 fingerprint 유지)
+    :param asset_info_results: 자산 상세 업로드 단계 결과 목록
+    :param previous_fingerprints: 이전 실행 fingerprint
+    :return: (fingerprints, 삭제할 key set)
+    """
+    fingerprints, seen_keys = {}, set()
+    for result in asset_info_results:
+        fingerprints.update(result["fingerprints"])
+        seen_keys.update(result["seen_keys"])
+
+    missing_keys = previous_fingerprints.keys() - seen_keys
+    if any(
+        result.get("resumed_from_row") or result["unkeyed_rows"]
+        for result in asset_info_results
+    ):
+        fingerprints.update({key: previous_fingerprints[key] for key in missing_keys})
+        return fingerprints, set()
+
+    return fingerprints, missing_keys
+
+
+def build_csv_pipeline(
+    csv_asset_group,
+    csv_asset_info,
+    csv_asset_basic,
+    state_dir,
+    partition_count,
+    delta=True,
+    input_formats=None,
+    shard=None,
+):
+    """
+    CSV 업로드 단계 DAG 구성
+    - 자산군 업로드 / 자산 상세 파일 분할 / 이전 fingerprint 조회 : 서로 독립
+    - 자산 상세 업로드 : 계좌번호 기준으로 나눈 파일별로 병렬 실행 (계좌가 겹치지 않음)
+      이전 실행과 같은 row 는 건너뜀
+    - 자산 상세 delta : 파일에서 빠진 보유종목 삭제
+    - 기본 자산 업로드 / 총 자산 계산 : 자산 상세 반영이 모두 끝난 후 서로 독립
+    - 포트폴리오 요약 갱신 / 화면 캐시 삭제 : 모든 DB 반영이 끝난 후 바뀐 계좌만
+    - 일자별 스냅샷 저장 : 모든 DB 반영이 끝난 후 전체 계좌
+    - fingerprint 저장 : 모든 단계가 성공한 후 (실패하면 다음 실행에서 다시 반영)
+    :param csv_asset_group:
+    :param csv_asset_info:
+    :param csv_asset_basic:
+    :param state_dir: 체크포인트 / 에러 파일 / 분할 파일 디렉토리
+    :param partition_count: 자산 상세 파일 분할 개수
+    :param delta: False 면 이전 fingerprint 를 무시하고 전체 반영 (fingerprint 는 새로 저장)
+    :param input_formats: {"asset_group" | "asset_info" | "asset_basic": 입력 형식}
+        지정하지 않은 파일은 내용으로 판별
+    :param shard: Shard, 있으면 shard 에 속한 계좌만 반영 (자산군은 전체 반영)
+    :return: Stage 리스트
+    """
+    input_formats = input_formats or {}
+    partition_dir = os.path.join(state_dir, "partitions")
+    fingerprint_store = FingerprintStore(shard)
+
+    def load_fingerprints_stage(results):
+        return fingerprint_store.load() if delta else {}
+
+    def asset_group_stage(results):
+        return upload_asset_group_info(
+            csv_asset_group,
+            state_dir=state_dir,
+            input_format=input_formats.get("asset_group"),
+        )
+
+    def partition_stage(results):
+        return partition_csv(
+            csv_asset_info,
+            partition_dir,
+            partition_count,
+            ASSET_INFO_ACCOUNT_INDEX,
+            input_formats.get("asset_info"),
+            shard,
+        )
+
+    def asset_info_stage(partition_idx):
+        def run(results):
+            return upload_asset_info(
+                results["partition_asset_info"][partition_idx],
+                state_dir=state_dir,
+                previous_fingerprints=results["load_fingerprints"],
+                numbered=True,
+            )
+
+        return run
+
+    def asset_info_delta_stage(results):
+        fingerprints, missing_keys = _merge_asset_info_delta(
+            [results[name] for name in asset_info_stage_names],
+            results["load_fingerprints"],
+        )
+        deleted_rows, changed_account_ids = delete_missing_positions(missing_keys)
+        return {
+            "deleted_rows": deleted_rows,
+            "changed_account_ids": changed_account_ids,
+            "fingerprints": fingerprints,
+        }
+
+    def asset_basic_stage(results):
+        return upload_asset_basic(
+            csv_asset_basic,
+            state_dir=state_dir,
+            input_format=input_formats.get("asset_basic"),
+            shard=shard,
+        )
+
+    def total_asset_stage(results):
+        return calculate_account_total_asset(_changed_account_ids(results))
+
+    def portfolio_summary_stage(results):
+        return refresh_portfolio_summaries(_changed_account_ids(results))
+
+    def invalidate_cache_stage(results):
+        return invalidate_account_screens(_changed_account_ids(results))
+
+    def snapshot_stage(results):
+        return write_snapshots(account_filter=shard.contains if shard else None)
+
+    def save_fingerprints_stage(results):
+        fingerprints = results["asset_info_delta"]["fingerprints"]
+        fingerprint_store.save(fingerprints)
+        return len(fingerprints)
+
+    asset_info_stage_names = [f"asset_info_{idx}" for idx in range(partition_count)]
+    asset_info_done = (*asset_info_stage_names, "asset_info_delta")
+
+    stages = [
+        Stage("asset_group", asset_group_stage, ()),
+        Stage("partition_asset_info", partition_stage, ()),
+        Stage("load_fingerprints", load_fingerprints_stage, ()),
+        *[
+            Stage(
+                name,
+                asset_info_stage(idx),
+                ("asset_group", "partition_asset_info", "load_fingerprints"),
+            )
+            for idx, name in enumerate(asset_info_stage_names)
+        ],
+        Stage(
+            "asset_info_delta",
+            asset_info_delta_stage,
+            (*asset_info_stage_names, "load_fingerprints"),
+        ),
+        Stage("asset_basic", asset_basic_stage, asset_info_done),
+        Stage("total_asset", total_asset_stage, asset_info_done),
+        Stage(
+            "portfolio_summary",
+            portfolio_summary_stage,
+            (*asset_info_done, "asset_basic", "total_asset"),
+        ),
+        Stage(
+            "invalidate_cache",
+            invalidate_cache_stage,
+            (*asset_info_done, "asset_basic", "portfolio_summary"),
+        ),
+        Stage(
+            "snapshot",
+            snapshot_stage,
+            (*asset_info_done, "asset_basic", "total_asset"),
+        ),
+    ]
+
+    return [
+        *stages,
+        Stage(
+            "save_fingerprints",
+            save_fingerprints_stage,
+            tuple(stage.name for stage in stages),
+        ),
+    ]
+
+
+def validate_csv_files(
+    csv_asset_group,
+    csv_asset_info,
+    csv_asset_basic,
+    input_formats=None,
+    shard=None,
+    chunk_size=BULK_BATCH_SIZE,
+):
+    """
+    DB 에 반영하지 않고 CSV 파일만 검증 (dry-run)
+    - 각 파일의 row 파싱
+    - 자산 상세 : ISIN 이 DB 또는 자산군 파일에 있는지
+    - 기본 자산 : 계좌번호가 DB 또는 자산 상세 파일에 있는지
+    - 이미 DB 에 있는 종목 / 계좌는 실패로 보지 않음
+    :param csv_asset_group:
+    :param csv_asset_info:
+    :param csv_asset_basic:
+    :param input_formats: {"asset_group" | "asset_info" | "asset_basic": 입력 형식}
+    :param shard: Shard, 있으면 shard 에 속한 계좌 row 만 검증
+    :param chunk_size:
+    :return: {"asset_group" | "asset_info" | "asset_basic": 결과 dict}
+    """
+    input_formats = input_formats or {}
+    isins = set(Holding.objects.values_list("isin", flat=True))
+    account_numbers = set(Account.objects.values_list("account_number", flat=True))
+    results = {}
+
+    def check_asset_group(record):
+        isins.add(record.isin)
+
+    def check_asset_info(record):
+        if record.isin not in isins:
+            return "Holding matching query does not exist."
+        account_numbers.add(record.account_number)
+
+    def check_asset_basic(record):
+        if record.account_number not in account_numbers:
+            return "Account matching query does not exist."
+
+    files = [
+        ("asset_group", csv_asset_group, parse_asset_group_row, check_asset_group),
+        ("asset_info", csv_asset_info, parse_asset_info_row, check_asset_info),
+        ("asset_basic", csv_asset_basic, parse_asset_basic_row, check_asset_basic),
+    ]
+    key_indexes = {
+        "asset_info": ASSET_INFO_ACCOUNT_INDEX,
+        "asset_basic": ASSET_BASIC_ACCOUNT_INDEX,
+    }
+
+    for name, csv_path, parse_row, check in files:
+        row_filter = None
+        if shard and name in key_indexes:
+            row_filter = shard.row_filter(key_indexes[name])
+
+        with UploadProgress(csv_path) as progress:
+            for chunk in read_chunks(
+                csv_path,
+                parse_row,
+                chunk_size,
+                input_format=input_formats.get(name),
+                row_filter=row_filter,
+            ):
+                for row_number, record, error in chunk:
+                    error = error or check(record)
+                    if error:
+                        progress.add_invalid_row(row_number, error)
+                    else:
+                        progress.add_success_rows(1)
+
+        results[name] = progress.result
+
+    return results
+
+
+def stage_workers(max_workers):
+    """
+    업로드 단계를 동시에 실행할 스레드 수
+    - 메인 스레드 커넥션 하나를 빼고 나머지를 pool 스레드에 배분 (JOBS_DATABASE_POOL_SIZE)
+    - jobs alias 가 sqlite 면 쓰기 트랜잭션을 동시에 열 수 없어 1
+      (병렬 단계가 database is locked 로 실패)
+    :param max_workers: 요청한 스레드 수
     :return:
     """
+    with use_database(JOBS_DATABASE):
+        alias = write_database()
+    if connections.settings[alias]["ENGINE"] in SERIAL_WRITE_ENGINES:
+        return 1
+
+    return min(max_workers, max(settings.JOBS_DATABASE_POOL_SIZE - 1, 1))
+
+
+def execute_csv_uploader(
+    max_workers=PIPELINE_MAX_WORKERS,
+    state_dir=STATE_DIR,
+    csv_asset_group=CSV_ASSET_GROUP,
+    csv_asset_info=CSV_ACCOUNT_ASSET,
+    csv_asset_basic=CSV_ACCOUNT_BASIC,
+    input_formats=None,
+    shard=None,
+):
+    """
+    Execute all csv uploader function
+    - build_csv_pipeline 의 단계들을 max_workers 개 스레드로 실행
+    - 단계별 측정값을 CsvUploadRun / CsvUploadStageMetric 에 저장
+    - shard 별 체크포인트 / fingerprint 는 state_dir 아래 shard 디렉토리에 따로 저장
+    - DB 는 jobs alias 로 접속하고, 스레드 수는 stage_workers 로 제한
+    :param max_workers: 동시에 실행할 단계 수 (자산 상세 파일 분할 개수)
+    :param state_dir: 체크포인트 / 에러 파일 / 분할 파일 디렉토리
+    :param csv_asset_group: 자산군 파일
+    :param csv_asset_info: 자산 상세 파일
+    :param csv_asset_basic: 기본 자산 파일
+    :param input_formats: 파일별 입력 형식, None 이면 CSV_UPLOADER_INPUT_FORMATS 설정
+    :param shard: Shard, 있으면 shard 에 속한 계좌만 반영
+    :return: {단계명: 결과}
+    """
+    if input_formats is None:
+        input_formats = settings.CSV_UPLOADER_INPUT_FORMATS
+    max_workers = stage_workers(max_workers)
+    if shard:
+        state_dir = os.path.join(state_dir, f"shard{shard.index}-of-{shard.count}")
+
     filename = os.path.join(dir_path, "../csv_uploader_log.log")
 
     # Logger
@@ -231,24 +845,64 @@ def execute_csv_uploader():
     logger.addHandler(file_handler)
     logger.info("csv upload start..")
 
-    upload_asset_group_info(CSV_ASSET_GROUP)
-    upload_asset_info(CSV_ACCOUNT_ASSET)
-    upload_asset_basic(CSV_ACCOUNT_BASIC)
-    calculate_account_total_asset()
+    stages = build_csv_pipeline(
+        csv_asset_group,
+        csv_asset_info,
+        csv_asset_basic,
+        state_dir,
+        partition_count=max(max_workers, 1),
+        input_formats=input_formats,
+        shard=shard,
+    )
 
+    # 단계별 측정값은 실행 이력 테이블에 저장
+    # - 실행 이력 / 단계 모두 jobs 커넥션 사용 (pool 스레드에서도 다시 지정)
+    collector = StageMetricsCollector()
+    stages = [
+        Stage(stage.name, use_database(JOBS_DATABASE)(stage.func), stage.depends_on)
+        for stage in collector.instrument(stages)
+    ]
+    with use_database(JOBS_DATABASE):
+        run = CsvUploadRun.objects.create()
+        try:
+            results = run_stages(stages, max_workers=max_workers)
+            remove_partitions(csv_asset_info, os.path.join(state_dir, "partitions"))
+        except Exception as e:
+            collector.save(run, error=e)
+            for line in collector.summary_lines():
+                logger.info(line)
+            logger.exception("csv upload failed..")
+            raise
+        else:
+            collector.save(run)
+        finally:
+            # 스케쥴러 스레드에 하루동안 유휴 커넥션을 남기지 않음
+            if JOBS_DATABASE in connections.settings:
+                connections[JOBS_DATABASE].close()
+
+    for line in collector.summary_lines():
+        logger.info(line)
     logger.info("csv upload end..")
 
+    return results
+
 
 def start():
     """
     스케쥴러 실행
     - 실행 함수 : execute_csv_uploader
     - 주기 : 매일 06시 실행
+    - 웹 프로세스마다 스케쥴러가 뜨므로 lease 를 얻은 프로세스 하나만 실행
     :return:
     """
-    scheduler = BackgroundScheduler(timezone=TIME_ZONE)
+    # 스케쥴러를 띄우는 웹 프로세스에서만 import
+    from apscheduler.schedulers.background import BackgroundScheduler
+    from apscheduler.triggers.cron import CronTrigger
+
+    scheduler = BackgroundScheduler(timezone=settings.TIME_ZONE)
     scheduler.add_job(
-        execute_csv_uploader,
+        run_exclusive,
+        args=("execute_csv_uploader", execute_csv_uploader),
         id="execute_csv_uploader",
         trigger=CronTrigger(hour="6"),
         # trigger=CronTrigger(second="*/20"),
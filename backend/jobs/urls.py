@@ -0,0 +1,16 @@
+from django.urls import path
+
+from jobs import views
+
+urlpatterns = [
+    path(
+        "jobs/csv-upload-runs",
+        views.CsvUploadRunListView.as_view(),
+        name="csv-upload-runs",
+    ),
+    path(
+        "jobs/csv-upload-runs/<int:pk>",
+        views.CsvUploadRunDetailView.as_view(),
+        name="csv-upload-run",
+    ),
+]
@@ -0,0 +1,39 @@
+from django.shortcuts import get_object_or_404
+from rest_framework import status
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from jobs.models import CsvUploadRun
+from jobs.serializers import CsvUploadRunSerializer
+
+# 실행 이력 목록 기본 / 최대 조회 개수
+RUN_HISTORY_DEFAULT_LIMIT = 30
+RUN_HISTORY_MAX_LIMIT = 365
+
+
+class CsvUploadRunListView(APIView):
+    """CSV 업로드 실행 이력 목록 API (최신순)"""
+
+    def get(self, request):
+        try:
+            limit = int(request.query_params.get("limit", RUN_HISTORY_DEFAULT_LIMIT))
+        except ValueError:
+            limit = RUN_HISTORY_DEFAULT_LIMIT
+        limit = min(max(limit, 1), RUN_HISTORY_MAX_LIMIT)
+
+        queryset = CsvUploadRun.objects.prefetch_related("stages").order_by("-id")[
+            :limit
+        ]
+        serializer = CsvUploadRunSerializer(queryset, many=True)
+
+        return Response(data=serializer.data, status=status.HTTP_200_OK)
+
+
+class CsvUploadRunDetailView(APIView):
+    """CSV 업로드 실행 이력 상세 API"""
+
+    def get(self, request, pk):
+        run = get_object_or_404(CsvUploadRun.objects.prefetch_related("stages"), id=pk)
+        serializer = CsvUploadRunSerializer(run)
+
+        return Response(data=serializer.data, status=status.HTTP_200_OK)